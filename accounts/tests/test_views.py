@@ -7,6 +7,7 @@ from django.urls import reverse
 
 from accounts.tests.utils import AccountsMixin
 from accounts.models import ActivationLink
+from language_tests.models import LanguageTestType, UserTestStats
 from test_your_language.settings import LOGIN_REDIRECT_URL
 
 
@@ -547,6 +548,25 @@ class UserProfileViewTest(AuthViewsTestCase):
             f'/accounts/login/?next=/accounts/profile/{user.username}/'
         )
 
+    def test_user_stats(self):
+        user, login = self.login(self.active_user)
+        test_type = LanguageTestType.objects.create(name='test_type_1')
+        UserTestStats.objects.create(
+            user=user,
+            test_type=test_type,
+            number_attempts=2,
+            number_answers=4,
+            number_right_answers=3
+        )
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse(self.path_name, kwargs={'user': user.username})
+            )
+        self.assertTrue(login)
+        self.assertEqual(len(response.context_data['user_stats']), 1)
+        self.assertContains(response, 'test_type_1')
+        self.assertContains(response, '3 (75%)')
+
     def test_redirect_if_user_uses_invalid_username(self):
         user, login = self.login(self.active_user)
         response = self.client.get(
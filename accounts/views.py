@@ -26,6 +26,7 @@ from accounts.tasks import (
     deactivate_user as _deactivate_user,
     send_activation_email
 )
+from language_tests.models import UserTestStats
 
 
 class LogoutRequiredMixin:
@@ -172,6 +173,15 @@ class UserProfileView(LoginRequiredMixin, TemplateView):
             return redirect('profile', user=request.user.username)
         return super().get(request, *args, **kwargs)
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['user_stats'] = UserTestStats.objects.select_related(
+            'test_type'
+        ).filter(
+            user_id=self.request.user.id
+        )
+        return context
+
 
 activate_user = ActivateUserView.as_view()
 deactivate_user = DeactivateUserView.as_view()
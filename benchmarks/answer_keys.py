@@ -0,0 +1,51 @@
+from typing import Dict, List
+
+from django.db import transaction
+
+from benchmarks.utils import create_answers, create_questions, measure
+from language_tests.models import LanguageTestType, QuestionAnswer
+from language_tests.services import get_right_answers
+
+
+NUMBERS_ANSWERS = (10, 100, 1_000)
+
+
+def orm_right_answers(answers: Dict[int, int]) -> Dict[int, int]:
+    questions = QuestionAnswer.objects.values(
+        'question_id',
+        'answer_id',
+        'is_right_answer'
+    ).filter(
+        question_id__in=[i for i in answers.keys()]
+    )
+    return {
+        item['question_id']: item['answer_id']
+        for item in questions
+        if item['is_right_answer']
+    }
+
+
+def create_user_answers(question_ids: List[int]) -> Dict[str, str]:
+    return {str(i): '' for i in question_ids}
+
+
+def main() -> None:
+    print(f'{"answers":>8} {"ORM, ms":>10} {"index, ms":>10}')
+    with transaction.atomic():
+        test_type = LanguageTestType.objects.create(name='benchmark_answer_keys')
+        answers = create_answers(test_type.name)
+        questions = create_questions(test_type, answers, 0, max(NUMBERS_ANSWERS))
+        question_ids = [question.pk for question in questions]
+        get_right_answers({}, None)
+        for number_answers in NUMBERS_ANSWERS:
+            user_answers = create_user_answers(question_ids[:number_answers])
+            orm = measure(
+                lambda: orm_right_answers({int(i): 0 for i in user_answers})
+            )
+            index = measure(lambda: get_right_answers(user_answers, None))
+            print(f'{number_answers:>8} {orm:>10.3f} {index:>10.3f}')
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,537 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+# the harness only talks HTTP, so it runs without Django and its settings
+TESTS_PATH = '/tests/'
+TEST_RESULT_PATH = '/tests/result/'
+LOGIN_PATH = '/accounts/login/'
+SIGNUP_PATH = '/accounts/signup/'
+PROFILE_PATH = '/accounts/profile/{}/'
+SIGNUP_PASSWORD = 'Load-test-password-1'
+
+TEST_TYPE_PATTERN = re.compile(r'href="/tests/(\d+)/"')
+TEST_SESSION_PATTERN = re.compile(r'data-session="([^"]*)"')
+QUESTION_PATTERN = re.compile(r'data-question="(\d+)"|data-answer="(\d+)"')
+
+DEFAULT_FLOWS = {
+    'browse': 40,
+    'test': 40,
+    'profile': 10,
+    'login': 7,
+    'signup': 3,
+}
+
+
+class Config(NamedTuple):
+    url: str
+    concurrency: int = 10
+    duration: float = 60
+    warmup: float = 5
+    think_time: float = 0
+    flows: Dict[str, int] = DEFAULT_FLOWS
+    username_format: str = 'load_user_{}'
+    number_users: int = 10000
+    password: str = 'load'
+    seed: int = 0
+    timeout: float = 30
+
+
+class Response(NamedTuple):
+    status: int
+    text: str
+
+
+class FlowError(Exception):
+    pass
+
+
+class Stats:
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, latency: float, ok: bool) -> None:
+        self.latencies.setdefault(endpoint, []).append(latency)
+        self.errors.setdefault(endpoint, 0)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def merge(self, other: 'Stats') -> None:
+        for endpoint, latencies in other.latencies.items():
+            self.latencies.setdefault(endpoint, []).extend(latencies)
+            self.errors[endpoint] = (
+                self.errors.get(endpoint, 0) + other.errors[endpoint]
+            )
+
+    def summary(self, duration: float) -> Dict:
+        endpoints = {
+            endpoint: _summarize(
+                self.latencies[endpoint],
+                self.errors[endpoint],
+                duration
+            )
+            for endpoint in sorted(self.latencies)
+        }
+        total = _summarize(
+            [i for latencies in self.latencies.values() for i in latencies],
+            sum(self.errors.values()),
+            duration
+        )
+        return {'endpoints': endpoints, 'total': total}
+
+
+class Session:
+    # one keep-alive connection and the cookies of a browser
+
+    def __init__(self, url: str, timeout: float):
+        parts = urlsplit(url)
+        connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == 'https' else http.client.HTTPConnection
+        )
+        self.connection = connection_class(parts.netloc, timeout=timeout)
+        self.host = parts.netloc
+        self.cookies: Dict[str, str] = {}
+
+    def request(
+            self,
+            method: str,
+            path: str,
+            body: Optional[bytes] = None,
+            headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        headers = {
+            'Host': self.host,
+            'User-Agent': 'test-your-language-load-test',
+            **(headers or {}),
+        }
+        if self.cookies:
+            headers['Cookie'] = '; '.join(
+                f'{name}={value}' for name, value in self.cookies.items()
+            )
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            text = response.read().decode('utf-8', 'replace')
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            raise
+        for header in response.headers.get_all('Set-Cookie') or ():
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value and morsel['max-age'] != '0':
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+        return Response(response.status, text)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class VirtualUser:
+
+    def __init__(
+            self,
+            config: Config,
+            test_type_ids: List[int],
+            rng: random.Random,
+            stats: Stats,
+            measure_from: float
+    ):
+        self.config = config
+        self.test_type_ids = test_type_ids
+        self.rng = rng
+        self.stats = stats
+        self.measure_from = measure_from
+        self.session = self.new_session()
+        self.username: Optional[str] = None
+
+    def new_session(self) -> Session:
+        return Session(self.config.url, self.config.timeout)
+
+    def request(
+            self,
+            session: Session,
+            endpoint: str,
+            method: str,
+            path: str,
+            expected: Tuple[int, ...] = (200,),
+            **kwargs
+    ) -> Response:
+        start = time.monotonic()
+        try:
+            response = session.request(method, path, **kwargs)
+        except (http.client.HTTPException, OSError):
+            response = None
+        ok = response is not None and response.status in expected
+        if start >= self.measure_from:
+            self.stats.record(endpoint, time.monotonic() - start, ok)
+        if not ok:
+            raise FlowError(endpoint)
+        return response
+
+    def post_form(
+            self,
+            session: Session,
+            endpoint: str,
+            path: str,
+            data: Dict[str, str]
+    ) -> Response:
+        return self.request(
+            session,
+            endpoint,
+            'POST',
+            path,
+            expected=(302,),
+            body=urlencode(
+                {
+                    'csrfmiddlewaretoken': session.cookies.get('csrftoken', ''),
+                    **data,
+                }
+            ).encode(),
+            headers={
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'Referer': f'{self.config.url}{path}',
+            }
+        )
+
+    def browse(self) -> None:
+        session = self.new_session()
+        try:
+            self.request(session, 'language_tests', 'GET', TESTS_PATH)
+            self.request(
+                session,
+                'language_test_preview',
+                'GET',
+                f'{TESTS_PATH}{self.rng.choice(self.test_type_ids)}/'
+            )
+        finally:
+            session.close()
+
+    def login(self, session: Optional[Session] = None) -> None:
+        username = self.config.username_format.format(
+            self.rng.randrange(self.config.number_users)
+        )
+        own_session = session is None
+        session = session or self.new_session()
+        try:
+            self.request(session, 'login_form', 'GET', LOGIN_PATH)
+            self.post_form(
+                session,
+                'login',
+                LOGIN_PATH,
+                {'username': username, 'password': self.config.password}
+            )
+        finally:
+            if own_session:
+                session.close()
+        if not own_session:
+            self.username = username
+
+    def ensure_login(self) -> None:
+        if self.username is None:
+            self.session.close()
+            self.session = self.new_session()
+            self.login(self.session)
+
+    def test(self) -> None:
+        self.ensure_login()
+        test_type_id = self.rng.choice(self.test_type_ids)
+        response = self.request(
+            self.session,
+            'language_test',
+            'GET',
+            f'{TESTS_PATH}{test_type_id}/test/'
+        )
+        token = TEST_SESSION_PATTERN.search(response.text)
+        questions = {}
+        question_id = None
+        for question, answer in QUESTION_PATTERN.findall(response.text):
+            if question:
+                question_id = question
+                questions[question_id] = []
+            elif question_id is not None:
+                questions[question_id].append(answer)
+        answers = {
+            question_id: self.rng.choice(answer_ids) if answer_ids else ''
+            for question_id, answer_ids in questions.items()
+        }
+        response = self.request(
+            self.session,
+            'test_result',
+            'POST',
+            TEST_RESULT_PATH,
+            body=json.dumps(answers).encode(),
+            headers={
+                'Content-Type': 'application/json;charset=utf-8',
+                'X-CSRFToken': self.session.cookies.get('csrftoken', ''),
+                'X-Test-Session': token.group(1) if token else '',
+                'Referer': f'{self.config.url}{TESTS_PATH}',
+            }
+        )
+        if 'data' not in json.loads(response.text):
+            raise FlowError('test_result')
+
+    def profile(self) -> None:
+        self.ensure_login()
+        self.request(
+            self.session,
+            'profile',
+            'GET',
+            PROFILE_PATH.format(self.username)
+        )
+
+    def signup(self) -> None:
+        # the activation emails go to the locmem backend of the server
+        username = f'load_signup_{uuid.uuid4().hex[:12]}'
+        session = self.new_session()
+        try:
+            self.request(session, 'signup_form', 'GET', SIGNUP_PATH)
+            self.post_form(
+                session,
+                'signup',
+                SIGNUP_PATH,
+                {
+                    'username': username,
+                    'email': f'{username}@example.com',
+                    'password1': SIGNUP_PASSWORD,
+                    'password2': SIGNUP_PASSWORD,
+                }
+            )
+        finally:
+            session.close()
+
+
+def run(config: Config, log: Callable[[str], None] = print) -> Dict:
+    test_type_ids = get_test_type_ids(config)
+    start = time.monotonic()
+    measure_from = start + config.warmup
+    deadline = measure_from + config.duration
+    flows = list(config.flows)
+    weights = [config.flows[flow] for flow in flows]
+    results = [Stats() for _ in range(config.concurrency)]
+
+    def run_user(number: int) -> None:
+        rng = random.Random(config.seed + number)
+        user = VirtualUser(config, test_type_ids, rng, results[number], measure_from)
+        try:
+            while time.monotonic() < deadline:
+                flow = rng.choices(flows, weights)[0]
+                try:
+                    getattr(user, flow)()
+                except FlowError:
+                    pass
+                if config.think_time:
+                    time.sleep(rng.expovariate(1 / config.think_time))
+        finally:
+            user.session.close()
+
+    log(
+        f'Running {config.concurrency} users for {config.duration} s '
+        f'after {config.warmup} s of warm-up'
+    )
+    threads = [
+        threading.Thread(target=run_user, args=(i,), daemon=True)
+        for i in range(config.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = Stats()
+    for item in results:
+        stats.merge(item)
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'url': config.url,
+            'concurrency': config.concurrency,
+            'duration': config.duration,
+            'warmup': config.warmup,
+            'think_time': config.think_time,
+            'flows': config.flows,
+            'seed': config.seed,
+        },
+        **stats.summary(config.duration),
+    }
+
+
+def get_test_type_ids(config: Config) -> List[int]:
+    session = Session(config.url, config.timeout)
+    try:
+        response = session.request('GET', TESTS_PATH)
+    finally:
+        session.close()
+    test_type_ids = sorted({int(i) for i in TEST_TYPE_PATTERN.findall(response.text)})
+    if response.status != 200:
+        raise RuntimeError(
+            f'Unexpected status {response.status} at {config.url}{TESTS_PATH}'
+        )
+    if not test_type_ids:
+        raise RuntimeError(f'No published tests at {config.url}{TESTS_PATH}')
+    return test_type_ids
+
+
+def format_summary(summary: Dict) -> str:
+    lines = [
+        f'{"endpoint":<22} {"requests":>9} {"req/s":>8} {"errors":>7} '
+        f'{"p50, ms":>8} {"p95, ms":>8} {"p99, ms":>8}'
+    ]
+    rows = list(summary['endpoints'].items()) + [('total', summary['total'])]
+    for endpoint, item in rows:
+        lines.append(
+            f'{endpoint:<22} {item["requests"]:>9} {item["throughput"]:>8.1f} '
+            f'{item["error_rate"]:>7.2%} {item["p50_ms"]:>8.1f} '
+            f'{item["p95_ms"]:>8.1f} {item["p99_ms"]:>8.1f}'
+        )
+    return '\n'.join(lines)
+
+
+def start_server(url: str, workers: int) -> subprocess.Popen:
+    parts = urlsplit(url)
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'test_your_language.settings',
+        'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'gunicorn',
+            'test_your_language.wsgi:application',
+            '--bind',
+            parts.netloc,
+            '--workers',
+            str(workers),
+        ],
+        env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(
+                (parts.hostname, parts.port or 80),
+                timeout=1
+            ).close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            'Replays the sessions of anonymous and logged in users against '
+            'a running site and reports the latency per endpoint.'
+        )
+    )
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument(
+        '--think-time',
+        type=float,
+        default=0,
+        help='Mean pause of a user between the flows, in seconds.'
+    )
+    parser.add_argument(
+        '--flows',
+        default=','.join(f'{k}={v}' for k, v in DEFAULT_FLOWS.items()),
+        help='Weights of the flows: browse, test, profile, login, signup.'
+    )
+    parser.add_argument(
+        '--username-format',
+        default='load_user_{}',
+        help='Usernames of the generate_load_data command by default.'
+    )
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--password', default='load')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file for the summary.')
+    parser.add_argument(
+        '--start-server',
+        action='store_true',
+        help='Starts gunicorn at --url with the locmem email backend.'
+    )
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    flows = {}
+    for item in args.flows.split(','):
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_FLOWS:
+            parser.error(f'Unknown flow {name}')
+        flows[name] = int(weight or 1)
+    config = Config(
+        url=args.url.rstrip('/'),
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        think_time=args.think_time,
+        flows=flows,
+        username_format=args.username_format,
+        number_users=args.users,
+        password=args.password,
+        seed=args.seed
+    )
+
+    server = start_server(config.url, args.workers) if args.start_server else None
+    try:
+        summary = run(config)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(format_summary(summary))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(summary, file, indent=2, sort_keys=True)
+
+
+def _summarize(latencies: List[float], errors: int, duration: float) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'error_rate': errors / len(latencies) if latencies else 0,
+        'throughput': len(latencies) / duration if duration else 0,
+        'p50_ms': _get_percentile(latencies, 50),
+        'p95_ms': _get_percentile(latencies, 95),
+        'p99_ms': _get_percentile(latencies, 99),
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else 0,
+    }
+
+
+def _get_percentile(latencies: List[float], percentile: int) -> float:
+    # the nearest rank of the sorted latencies
+    if not latencies:
+        return 0
+    index = max(0, -(-len(latencies) * percentile // 100) - 1)
+    return latencies[index] * 1000
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import json
+import time
+from io import StringIO
+
+from django.db import transaction
+
+from benchmarks.utils import measure
+from language_tests.imports import import_questions, read_jsonl
+from language_tests.models import LanguageTestType
+from language_tests.validators import validate_question
+
+
+NUMBERS_QUESTIONS = (1_000, 10_000, 100_000)
+NUMBER_ANSWERS = 500
+
+
+def create_file(test_type: str, number_questions: int) -> StringIO:
+    file = StringIO()
+    for i in range(number_questions):
+        answers = [f'answer {(i + j) % NUMBER_ANSWERS}' for j in range(4)]
+        row = {
+            'question': f'question {i} ___ benchmark',
+            'test_type': test_type,
+            'answers': answers,
+            'right_answer': answers[0],
+        }
+        file.write(json.dumps(row) + '\n')
+    file.seek(0)
+    return file
+
+
+def main() -> None:
+    validation = measure(lambda: validate_question('benchmark 0 ___ question'))
+    print(f'validate_question: {validation * 1000:.3f} us')
+    print(f'{"questions":>10} {"import, s":>10} {"questions/s":>12}')
+    for number_questions in NUMBERS_QUESTIONS:
+        with transaction.atomic():
+            test_type = LanguageTestType.objects.create(
+                name='benchmark_question_import'
+            )
+            file = create_file(test_type.name, number_questions)
+            errors = []
+            start = time.perf_counter()
+            import_questions(read_jsonl(file), errors.append)
+            duration = time.perf_counter() - start
+            assert not errors, errors[0]
+            print(
+                f'{number_questions:>10} {duration:>10.2f} '
+                f'{number_questions / duration:>12,.0f}'
+            )
+            transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
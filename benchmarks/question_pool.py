@@ -0,0 +1,46 @@
+from typing import List
+
+from django.db import transaction
+
+from benchmarks.utils import create_answers, create_questions, measure
+from language_tests.models import LanguageTestType, Question
+from language_tests.services import generate_questions_list
+
+
+BANK_SIZES = (20, 1_000, 10_000, 100_000)
+NUMBER_QUESTIONS = 10
+
+
+def order_by_random(test_type_id: int) -> List:
+    questions = Question.objects.prefetch_related(
+        'answers'
+    ).filter(
+        test_type_id=test_type_id,
+        is_published=True
+    ).only(
+        'id',
+        'question'
+    ).order_by('?')[:NUMBER_QUESTIONS]
+    return list(questions)
+
+
+def main() -> None:
+    print(f'{"questions":>10} {"order_by(?), ms":>16} {"id pool, ms":>12}')
+    with transaction.atomic():
+        test_type = LanguageTestType.objects.create(name='benchmark_question_pool')
+        answers = create_answers(test_type.name)
+        size = 0
+        for bank_size in BANK_SIZES:
+            create_questions(test_type, answers, size, bank_size)
+            size = bank_size
+            generate_questions_list(test_type.pk, None, NUMBER_QUESTIONS)
+            legacy = measure(lambda: order_by_random(test_type.pk))
+            pool = measure(
+                lambda: generate_questions_list(test_type.pk, None, NUMBER_QUESTIONS)
+            )
+            print(f'{bank_size:>10} {legacy:>16.2f} {pool:>12.2f}')
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from typing import List
+
+from django.contrib import admin
+from django.db import connection, transaction
+from django.test import RequestFactory
+
+from benchmarks.utils import create_answers, create_questions, measure
+from language_tests.admin import QuestionAdmin, QuestionAnswerAdmin
+from language_tests.indexes import INDEXES, ConcurrentIndex
+from language_tests.models import LanguageTestType, Question, QuestionAnswer
+
+
+NUMBERS_QUESTIONS = (10_000, 100_000, 1_000_000)
+SEARCH_TERM = '12345 ___'
+
+
+def search(model_admin: admin.ModelAdmin, default: bool = False) -> int:
+    request = RequestFactory().get('/')
+    queryset = model_admin.get_queryset(request)
+    if default:
+        queryset, _ = admin.ModelAdmin.get_search_results(
+            model_admin,
+            request,
+            queryset,
+            SEARCH_TERM
+        )
+    else:
+        queryset, _ = model_admin.get_search_results(
+            request,
+            queryset,
+            SEARCH_TERM
+        )
+    return len(queryset[:100])
+
+
+def get_trigram_indexes() -> List[ConcurrentIndex]:
+    return [index for index in INDEXES if index.extension is not None]
+
+
+def drop_trigram_indexes() -> None:
+    # the indexes of the database are measured in the baseline otherwise, the
+    # drop is rolled back with the rest of the transaction
+    with connection.cursor() as cursor:
+        for index in get_trigram_indexes():
+            cursor.execute(f'DROP INDEX IF EXISTS {index.name}')
+        cursor.execute('ANALYZE')
+
+
+def create_trigram_indexes() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside the rolled back transaction
+    with connection.cursor() as cursor:
+        for index in get_trigram_indexes():
+            cursor.execute(
+                f'CREATE EXTENSION IF NOT EXISTS {index.extension}'
+            )
+            cursor.execute(
+                f'CREATE INDEX {index.name} ON {index.table} '
+                f'{index.definition}'
+            )
+        cursor.execute('ANALYZE')
+
+
+def main() -> None:
+    question_admin = QuestionAdmin(Question, admin.site)
+    question_answer_admin = QuestionAnswerAdmin(QuestionAnswer, admin.site)
+    print(
+        f'{"questions":>10} {"index":>6} '
+        f'{"question, ms":>13} {"subquery, ms":>13} '
+        f'{"answer, ms":>11} {"subquery, ms":>13}'
+    )
+    for number_questions in NUMBERS_QUESTIONS:
+        with transaction.atomic():
+            test_type = LanguageTestType.objects.create(
+                name='benchmark_question_search'
+            )
+            answers = create_answers(test_type.name)
+            create_questions(test_type, answers, 0, number_questions)
+            drop_trigram_indexes()
+            for indexed in (False, True):
+                if indexed:
+                    create_trigram_indexes()
+                timings = [
+                    measure(lambda: search(model_admin, default), repeats=5)
+                    for model_admin in (question_admin, question_answer_admin)
+                    for default in (True, False)
+                ]
+                print(
+                    f'{number_questions:>10} {str(indexed):>6} '
+                    f'{timings[0]:>13.3f} {timings[1]:>13.3f} '
+                    f'{timings[2]:>11.3f} {timings[3]:>13.3f}'
+                )
+            transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
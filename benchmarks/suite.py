@@ -0,0 +1,253 @@
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import django
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from benchmarks.utils import measure
+from language_tests.load_data import generate_load_data
+from language_tests.models import (
+    LanguageTestType,
+    QuestionAnswer,
+    UserTestStats
+)
+from language_tests.services import (
+    _get_questions,
+    generate_questions_list,
+    get_right_answers
+)
+
+
+METRICS = ('time_ms', 'queries', 'rows_read', 'peak_memory_kb')
+# the number of queries is exact, so any growth is a regression
+EXACT_METRICS = ('queries',)
+NUMBER_QUESTIONS = 10
+
+
+class Scenario(NamedTuple):
+    # questions of a test type, users and attempts of a user
+    bank_size: int
+    number_users: int
+    history: int
+
+    @property
+    def name(self) -> str:
+        return (
+            f'bank={self.bank_size},users={self.number_users},'
+            f'history={self.history}'
+        )
+
+
+class Regression(NamedTuple):
+    scenario: str
+    case: str
+    metric: str
+    old: float
+    new: float
+
+
+BASELINE = Scenario(bank_size=1_000, number_users=100, history=10)
+# each dimension is swept with the others at the baseline
+SWEEPS = {
+    'bank_size': (100, 1_000, 10_000, 100_000),
+    'number_users': (10, 100, 1_000, 10_000),
+    'history': (0, 10, 100, 1_000),
+}
+QUICK_SWEEPS = {
+    'bank_size': (100, 1_000),
+    'number_users': (10, 100),
+    'history': (0, 10),
+}
+
+
+def get_scenarios(sweeps: Dict[str, Iterable[int]]) -> List[Scenario]:
+    result = []
+    for field, values in sweeps.items():
+        for value in values:
+            scenario = BASELINE._replace(**{field: value})
+            if scenario not in result:
+                result.append(scenario)
+    return result
+
+
+def run_suite(
+        scenarios: Iterable[Scenario],
+        repeats: int = 20,
+        log: Callable[[str], None] = print
+) -> Dict:
+    results = []
+    for scenario in scenarios:
+        log(f'Running {scenario.name}')
+        with transaction.atomic():
+            results.extend(_run_scenario(scenario, repeats))
+            transaction.set_rollback(True)
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+def compare(old: Dict, new: Dict, threshold: float) -> List[Regression]:
+    old_results = {
+        (item['scenario'], item['case']): item for item in old['results']
+    }
+    result = []
+    for item in new['results']:
+        old_item = old_results.get((item['scenario'], item['case']))
+        if old_item is None:
+            continue
+        for metric in METRICS:
+            old_value, new_value = old_item.get(metric), item.get(metric)
+            if old_value is None or new_value is None:
+                continue
+            limit = old_value if metric in EXACT_METRICS else (
+                old_value * (1 + threshold)
+            )
+            if new_value > limit:
+                result.append(
+                    Regression(
+                        item['scenario'],
+                        item['case'],
+                        metric,
+                        old_value,
+                        new_value
+                    )
+                )
+    return result
+
+
+def load_results(path: str) -> Dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_results(results: Dict, path: str) -> None:
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def _run_scenario(scenario: Scenario, repeats: int) -> List[Dict]:
+    generate_load_data(
+        seed=0,
+        prefix='benchmark',
+        number_test_types=2,
+        number_questions=scenario.bank_size,
+        number_answers=max(scenario.bank_size, 100),
+        number_users=scenario.number_users,
+        number_attempts=scenario.number_users * scenario.history
+    )
+    # the planner would scan the new rows without their statistics
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    test_type = LanguageTestType.objects.filter(
+        name__startswith='benchmark '
+    ).order_by('id').first()
+    # the most active user of the test type has the longest history
+    user_id = UserTestStats.objects.filter(
+        test_type=test_type
+    ).order_by('-number_attempts').values_list('user_id', flat=True).first()
+    if user_id is None:
+        user_id = User.objects.filter(
+            username__startswith='benchmark_user_'
+        ).values_list('id', flat=True).first()
+    question_ids = [
+        question.question_id
+        for question in generate_questions_list(
+            test_type.pk,
+            user_id,
+            NUMBER_QUESTIONS
+        )
+    ]
+    answers = {
+        str(question_id): str(answer_id)
+        for question_id, answer_id in QuestionAnswer.objects.filter(
+            question_id__in=question_ids,
+            is_right_answer=True
+        ).values_list('question_id', 'answer_id')
+    }
+    client = Client()
+    client.force_login(User.objects.get(pk=user_id))
+    test_url = reverse('language_test', kwargs={'pk': test_type.pk})
+    result_url = reverse('test_result')
+
+    cases = {
+        'generate_questions_list': lambda: generate_questions_list(
+            test_type.pk,
+            user_id,
+            NUMBER_QUESTIONS
+        ),
+        'get_right_answers': lambda: get_right_answers(answers, user_id),
+        '_get_questions': lambda: _get_questions(test_type.pk, question_ids),
+        'language_test_view': lambda: _check_response(client.get(test_url)),
+        'test_result_view': lambda: _check_response(
+            client.post(
+                result_url,
+                json.dumps(answers),
+                content_type='application/json'
+            )
+        ),
+    }
+    return [
+        {
+            'scenario': scenario.name,
+            'case': name,
+            **_run_case(func, repeats),
+        }
+        for name, func in cases.items()
+    ]
+
+
+def _run_case(func: Callable, repeats: int) -> Dict:
+    # the caches are warmed by the first call, the next calls are measured
+    func()
+    queries = []
+    rows_read = _get_rows_read()
+    # the queries log is reset by every request of the test client
+    with connection.execute_wrapper(
+            lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+    ):
+        func()
+    if rows_read is not None:
+        rows_read = _get_rows_read() - rows_read
+
+    tracemalloc.start()
+    func()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'time_ms': round(measure(func, repeats), 3),
+        'queries': len(queries),
+        'rows_read': rows_read,
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+    }
+
+
+def _check_response(response) -> None:
+    if response.status_code != 200:
+        raise RuntimeError(f'Unexpected status {response.status_code}')
+
+
+def _get_rows_read() -> Optional[int]:
+    if connection.vendor != 'postgresql':
+        return None
+    # the counters of the current transaction are visible immediately
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT COALESCE(SUM(COALESCE(seq_tup_read, 0) '
+            '+ COALESCE(idx_tup_fetch, 0)), 0) '
+            'FROM pg_stat_xact_user_tables'
+        )
+        return int(cursor.fetchone()[0])
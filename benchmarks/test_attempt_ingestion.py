@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from benchmarks.utils import create_answers, create_questions
+from language_tests.ingestion import _create_test_attempts, insert_test_attempts
+from language_tests.models import LanguageTestType
+
+
+NUMBERS_ROWS = (1_000, 10_000, 100_000)
+NUMBER_TEST_QUESTIONS = 10
+
+
+def measure_rows_per_second(func, rows) -> float:
+    with transaction.atomic():
+        start = time.perf_counter()
+        func(rows)
+        duration = time.perf_counter() - start
+        transaction.set_rollback(True)
+    return len(rows) / duration
+
+
+def bulk_create(rows) -> None:
+    for i in range(0, len(rows), 10000):
+        _create_test_attempts(rows[i:i + 10000])
+
+
+def main() -> None:
+    print(f'{"attempts":>10} {"bulk_create, rows/s":>20} {"COPY, rows/s":>14}')
+    with transaction.atomic():
+        test_type = LanguageTestType.objects.create(name='benchmark_ingestion')
+        answers = create_answers(test_type.name)
+        questions = create_questions(test_type, answers, 0, 1000)
+        user = get_user_model().objects.create_user('benchmark_ingestion')
+        now = timezone.now()
+        for number_rows in NUMBERS_ROWS:
+            rows = [
+                (
+                    user.pk,
+                    test_type.pk,
+                    now,
+                    [
+                        questions[(i + j) % len(questions)].pk
+                        for j in range(NUMBER_TEST_QUESTIONS)
+                    ],
+                    [answers[0].pk] * NUMBER_TEST_QUESTIONS,
+                    b'\xff\x03'
+                )
+                for i in range(number_rows)
+            ]
+            orm = measure_rows_per_second(bulk_create, rows)
+            copy = measure_rows_per_second(insert_test_attempts, rows)
+            print(f'{number_rows:>10} {orm:>20,.0f} {copy:>14,.0f}')
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import statistics
+import time
+from typing import Callable, List
+
+import django
+
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_your_language.settings')
+django.setup()
+
+from language_tests.caches import (  # noqa: E402
+    bump_bank_version,
+    reset_answer_keys
+)
+from language_tests.models import (  # noqa: E402
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer
+)
+
+
+def measure(func: Callable, repeats: int = 50) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def create_answers(prefix: str, number_answers: int = 4) -> List[Answer]:
+    return Answer.objects.bulk_create(
+        [Answer(answer=f'{prefix}_answer_{i}') for i in range(number_answers)]
+    )
+
+
+def create_questions(
+        test_type: LanguageTestType,
+        answers: List[Answer],
+        start: int,
+        stop: int
+) -> List[Question]:
+    questions = Question.objects.bulk_create(
+        [
+            Question(
+                question=f'{test_type.name} {i} ___ question',
+                test_type=test_type
+            )
+            for i in range(start, stop)
+        ],
+        batch_size=10_000
+    )
+    QuestionAnswer.objects.bulk_create(
+        [
+            QuestionAnswer(
+                question=question,
+                answer=answer,
+                is_right_answer=(number == 0)
+            )
+            for question in questions
+            for number, answer in enumerate(answers)
+        ],
+        batch_size=10_000
+    )
+    # bulk_create doesn't send the signals which invalidate the caches
+    bump_bank_version()
+    reset_answer_keys()
+    return questions
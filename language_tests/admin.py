@@ -1,36 +1,170 @@
+from datetime import timedelta
+
 from django.contrib import admin
+from django.db.models import Sum
+from django.template.response import TemplateResponse
+from django.utils import timezone
 
-from language_tests.forms import QuestionAnswersInlineFormSet
+from language_tests.exports import get_export_response
+from language_tests.filters import (
+    UserAutocompleteFilter,
+    UserAutocompleteFilterAdminMixin
+)
+from language_tests.forms import (
+    AnswerAutocompleteSelect,
+    AnswerChoiceField,
+    QuestionAnswerInlineForm,
+    QuestionAnswersInlineFormSet
+)
 from language_tests.models import (
     Answer,
+    DailyStats,
     LanguageTestType,
     Question,
     QuestionAnswer,
+    TestAttempt,
     TestResult
 )
+from language_tests.paginators import EstimatedCountAdminMixin
+from language_tests.search import RelatedSearchAdminMixin
 
 
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'answer',)
     list_display_links = ('id', 'answer',)
     search_fields = ('answer',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # the autocomplete of the question editor matches the whole term as a
+        # prefix, so an answer of several words is found by the pattern index
+        if not request.path.endswith('/autocomplete/'):
+            return super().get_search_results(request, queryset, search_term)
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(answer__istartswith=search_term), False
+
+
+class DailyStatsAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/language_tests/dailystats/change_list.html'
+    dashboard_days = 90
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        test_types = LanguageTestType.objects.only('id', 'name')
+        test_type_id = request.GET.get('test_type')
+        first_day = timezone.now().date() - timedelta(days=self.dashboard_days)
+
+        stats = DailyStats.objects.filter(date__gte=first_day)
+        # a user may take tests of several types a day, so the users are
+        # counted for a single test type only
+        show_users = bool(test_type_id and test_type_id.isdigit())
+        if show_users:
+            stats = stats.filter(test_type_id=test_type_id)
+        stats = {
+            item['date']: item
+            for item in stats.order_by().values('date').annotate(
+                number_attempts=Sum('number_attempts'),
+                number_users=Sum('number_users'),
+                number_answers=Sum('number_answers'),
+                number_right_answers=Sum('number_right_answers')
+            )
+        }
+        days = [
+            stats.get(
+                first_day + timedelta(days=i),
+                {
+                    'date': first_day + timedelta(days=i),
+                    'number_attempts': 0,
+                    'number_users': 0,
+                    'number_answers': 0,
+                    'number_right_answers': 0,
+                }
+            )
+            for i in range(self.dashboard_days)
+        ]
+        max_attempts = max(item['number_attempts'] for item in days) or 1
+        for i, item in enumerate(days):
+            item['height'] = round(item['number_attempts'] / max_attempts * 100)
+            item['x'] = i * 10
+            item['y'] = 100 - item['height']
+
+        context = {
+            **self.admin_site.each_context(request),
+            'days': days,
+            'opts': self.model._meta,
+            'show_users': show_users,
+            'test_type_id': test_type_id,
+            'test_types': test_types,
+            'title': self.model._meta.verbose_name_plural,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, self.change_list_template, context)
 
-class LanguageTestTypeAdmin(admin.ModelAdmin):
+
+class LanguageTestTypeAdmin(RelatedSearchAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'name', 'is_published',)
     list_display_links = ('id', 'name',)
     list_editable = ('is_published',)
     search_fields = ('name',)
 
 
-class TestResultAdmin(admin.ModelAdmin):
+class TestAttemptAdmin(
+        EstimatedCountAdminMixin,
+        RelatedSearchAdminMixin,
+        UserAutocompleteFilterAdminMixin,
+        admin.ModelAdmin
+):
+    list_display = (
+        'user',
+        'test_type',
+        'solution_date',
+        'number_answers',
+        'number_right_answers',
+    )
+    list_display_links = ('user',)
+    list_filter = ('test_type', UserAutocompleteFilter,)
+    list_select_related = ('user', 'test_type',)
+    readonly_fields = ('questions', 'answers',)
+    search_fields = ('user__username',)
+    exclude = ('right_answers',)
+    actions = ('export_csv', 'export_jsonl',)
+
+    def export_csv(self, request, queryset):
+        return get_export_response(queryset, 'csv')
+    export_csv.short_description = 'Экспортировать в CSV'
+
+    def export_jsonl(self, request, queryset):
+        return get_export_response(queryset, 'jsonl')
+    export_jsonl.short_description = 'Экспортировать в JSONL'
+
+
+class TestResultAdmin(
+        EstimatedCountAdminMixin,
+        RelatedSearchAdminMixin,
+        UserAutocompleteFilterAdminMixin,
+        admin.ModelAdmin
+):
     list_display = ('user', 'question', 'answer', 'solution_date',)
     list_display_links = ('user', 'question',)
-    list_filter = ('user',)
+    list_filter = (UserAutocompleteFilter,)
+    list_select_related = ('user', 'question', 'answer',)
     search_fields = ('user__username', 'question__question',)
 
 
-class QuestionAnswerAdmin(admin.ModelAdmin):
+class QuestionAnswerAdmin(
+        EstimatedCountAdminMixin,
+        RelatedSearchAdminMixin,
+        admin.ModelAdmin
+):
     list_display = ('question', 'answer', 'is_right_answer',)
     list_display_links = ('question',)
     list_editable = ('is_right_answer',)
@@ -39,23 +173,81 @@ class QuestionAnswerAdmin(admin.ModelAdmin):
 
 class QuestionAnswerInline(admin.StackedInline):
     can_delete = False
+    form = QuestionAnswerInlineForm
     formset = QuestionAnswersInlineFormSet
     max_num = 4
     min_num = 4
     model = QuestionAnswer
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # only the selected answers are rendered, the others are loaded by
+        # the autocomplete view of the answer admin
+        if db_field.name == 'answer':
+            kwargs['form_class'] = AnswerChoiceField
+            kwargs['widget'] = AnswerAutocompleteSelect(
+                db_field.remote_field,
+                self.admin_site,
+                using=kwargs.get('using')
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
-class QuestionAdmin(admin.ModelAdmin):
+
+class QuestionAdmin(
+        EstimatedCountAdminMixin,
+        RelatedSearchAdminMixin,
+        admin.ModelAdmin
+):
     inlines = (QuestionAnswerInline,)
-    list_display = ('id', 'question', 'test_type', 'is_published',)
+    list_display = (
+        'id',
+        'question',
+        'test_type',
+        'is_published',
+        'number_answers',
+        'right_answers_percentage',
+        'answers_percentage',
+    )
     list_display_links = ('id', 'question',)
     list_editable = ('is_published',)
     list_filter = ('is_published', 'test_type',)
     search_fields = ('question', 'test_type__name',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'stats',
+            'test_type'
+        ).prefetch_related(
+            'answer_stats__answer'
+        )
+
+    def number_answers(self, obj):
+        stats = getattr(obj, 'stats', None)
+        return stats.number_answers if stats else 0
+    number_answers.short_description = 'Ответы'
+
+    def right_answers_percentage(self, obj):
+        stats = getattr(obj, 'stats', None)
+        return f'{stats.right_answers_percentage if stats else 0}%'
+    right_answers_percentage.short_description = 'Правильные ответы'
+
+    def answers_percentage(self, obj):
+        answer_stats = sorted(
+            obj.answer_stats.all(),
+            key=lambda item: item.number_answers,
+            reverse=True
+        )
+        number_answers = sum(item.number_answers for item in answer_stats)
+        return ', '.join(
+            f'{item.answer} - {round(item.number_answers / number_answers * 100)}%'
+            for item in answer_stats
+        )
+    answers_percentage.short_description = 'Выбор ответов'
+
 
 admin.site.register(Answer, AnswerAdmin)
+admin.site.register(DailyStats, DailyStatsAdmin)
 admin.site.register(LanguageTestType, LanguageTestTypeAdmin)
+admin.site.register(TestAttempt, TestAttemptAdmin)
 admin.site.register(TestResult, TestResultAdmin)
 admin.site.register(QuestionAnswer, QuestionAnswerAdmin)
 admin.site.register(Question, QuestionAdmin)
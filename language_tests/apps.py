@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LanguageTestsConfig(AppConfig):
     name = 'language_tests'
     verbose_name = 'Языковые тесты'
+
+    def ready(self):
+        import language_tests.metrics  # noqa: F401
+        import language_tests.signals  # noqa: F401
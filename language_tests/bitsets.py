@@ -0,0 +1,50 @@
+from typing import Iterable, Tuple
+
+
+def add_to_bitset(bitset: bytes, values: Iterable[int]) -> bytes:
+    values = list(values)
+    if not values:
+        return bytes(bitset)
+
+    result = bytearray(bitset)
+    size = (max(values) >> 3) + 1
+    if len(result) < size:
+        result.extend(bytes(size - len(result)))
+    for value in values:
+        result[value >> 3] |= 1 << (value & 7)
+    return bytes(result)
+
+
+def add_to_offset_bitset(
+        bitset: bytes,
+        offset: int,
+        values: Iterable[int]
+) -> Tuple[bytes, int]:
+    # the bits are counted from the offset, a multiple of 8, so a set of large
+    # but close values is as small as a set of small values
+    values = list(values)
+    if not values:
+        return bytes(bitset), offset
+
+    start = min(values) & ~7
+    if not bitset:
+        offset = start
+    elif start < offset:
+        bitset = bytes((offset - start) >> 3) + bytes(bitset)
+        offset = start
+    result = add_to_bitset(bitset, (value - offset for value in values))
+    skip = len(result) - len(result.lstrip(b'\0'))
+    return result[skip:], offset + (skip << 3)
+
+
+def in_bitset(bitset: bytes, value: int) -> bool:
+    index = value >> 3
+    return index < len(bitset) and bool(bitset[index] & (1 << (value & 7)))
+
+
+def in_offset_bitset(bitset: bytes, offset: int, value: int) -> bool:
+    return value >= offset and in_bitset(bitset, value - offset)
+
+
+def count_bitset(bitset: bytes) -> int:
+    return bin(int.from_bytes(bitset, 'little')).count('1')
@@ -0,0 +1,140 @@
+import json
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import redis
+from django.utils import timezone
+
+from test_your_language.settings import (
+    TEST_RESULTS_BUFFER_URL,
+    TEST_RESULTS_SPOOL_DIR
+)
+
+
+BATCH_KEY = 'language_tests:test_results:batch'
+BUFFER_KEY = 'language_tests:test_results'
+PROCESSING_KEY = 'language_tests:test_results:processing'
+
+# moves up to ARGV[1] rows to the processing list, which is kept until the
+# batch is acknowledged, so a failed flush is replayed with the same batch id
+MOVE_BATCH_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items == 0 then
+    return items
+end
+redis.call('LTRIM', KEYS[1], #items, -1)
+for _, item in ipairs(items) do
+    redis.call('RPUSH', KEYS[2], item)
+end
+redis.call('SET', KEYS[3], ARGV[2])
+return items
+"""
+
+# an overlapping flush may ack a batch that is already replaced by the next
+# one, so the processing list is deleted only while it holds the same batch
+ACK_BATCH_SCRIPT = """
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+end
+"""
+
+_client: Optional[redis.Redis] = None
+
+
+class Batch(NamedTuple):
+    id: str
+    answers: List[Dict]
+    path: Optional[Path] = None
+
+
+def buffer_user_answers(answers: List[Dict]) -> None:
+    solution_date = timezone.now().isoformat()
+    lines = [
+        json.dumps({**answer, 'solution_date': solution_date})
+        for answer in answers
+    ]
+    if not lines:
+        return
+
+    try:
+        _get_client().rpush(BUFFER_KEY, *lines)
+    except redis.RedisError:
+        _spool(lines)
+
+
+def get_spooled_batches() -> Iterator[Batch]:
+    if not TEST_RESULTS_SPOOL_DIR.exists():
+        return
+
+    current_minute = _get_minute()
+    # files of the current minute may still be written
+    for path in sorted(TEST_RESULTS_SPOOL_DIR.glob('*.jsonl')):
+        if int(path.name.split('-')[0]) >= current_minute:
+            continue
+        answers = []
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    answers.append(json.loads(line))
+                except ValueError:
+                    continue
+        yield Batch(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, path.name).hex,
+            answers=answers,
+            path=path
+        )
+
+
+def get_buffered_batch(size: int) -> Optional[Batch]:
+    client = _get_client()
+    batch_id = client.get(BATCH_KEY)
+    if batch_id is None:
+        batch_id = uuid.uuid4().hex
+        move_batch = client.register_script(MOVE_BATCH_SCRIPT)
+        items = move_batch(
+            keys=[BUFFER_KEY, PROCESSING_KEY, BATCH_KEY],
+            args=[size, batch_id]
+        )
+    else:
+        batch_id = batch_id.decode()
+        items = client.lrange(PROCESSING_KEY, 0, -1)
+
+    if not items:
+        return None
+    return Batch(id=batch_id, answers=[json.loads(i) for i in items])
+
+
+def ack_batch(batch: Batch) -> None:
+    if batch.path is not None:
+        # the file may be already removed by an overlapping flush
+        batch.path.unlink(missing_ok=True)
+    else:
+        client = _get_client()
+        ack = client.register_script(ACK_BATCH_SCRIPT)
+        ack(keys=[PROCESSING_KEY, BATCH_KEY], args=[batch.id])
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(TEST_RESULTS_BUFFER_URL)
+    return _client
+
+
+def _get_minute() -> int:
+    return int(time.time() // 60)
+
+
+def _get_spool_file() -> Path:
+    name = f'{_get_minute()}-{socket.gethostname()}-{os.getpid()}.jsonl'
+    return TEST_RESULTS_SPOOL_DIR / name
+
+
+def _spool(lines: List[str]) -> None:
+    TEST_RESULTS_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_get_spool_file(), 'a', encoding='utf-8') as file:
+        file.write(''.join(f'{line}\n' for line in lines))
@@ -0,0 +1,251 @@
+import random
+import threading
+import time
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+from django.core.cache import cache
+
+from language_tests.metrics import observe_cache
+from language_tests.models import Question, QuestionAnswer
+
+
+ANSWER_KEYS_VERSION_KEY = 'language_tests:answer_keys_version'
+ANSWER_KEYS_CHANGE_KEY = 'language_tests:answer_keys_change'
+ANSWER_KEYS_CHANGE_LIFETIME = 60 * 60 * 24  # 24 h.
+BANK_VERSION_KEY = 'language_tests:bank_version'
+MAX_ANSWER_KEYS_CHANGES = 1000
+
+
+class AnswerKey(NamedTuple):
+    right_answer_id: Optional[int]
+    answer_ids: FrozenSet[int]
+
+
+class LanguageQuestion(NamedTuple):
+    question_id: int
+    question: List[str]
+    answers: Dict[int, str]
+    right_answer_id: Optional[int] = None
+
+
+def get_bank_version() -> int:
+    return _get_version(BANK_VERSION_KEY)
+
+
+def bump_bank_version() -> None:
+    _bump_version(BANK_VERSION_KEY)
+
+
+def record_answer_key_change(question_id: int) -> None:
+    version = _bump_version(ANSWER_KEYS_VERSION_KEY)
+    cache.set(
+        f'{ANSWER_KEYS_CHANGE_KEY}:{version}',
+        question_id,
+        timeout=ANSWER_KEYS_CHANGE_LIFETIME
+    )
+
+
+def reset_answer_keys() -> None:
+    # a version without a change record makes every worker reload the index
+    _bump_version(ANSWER_KEYS_VERSION_KEY)
+
+
+def _get_version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        # the key may be evicted, so a new version must never repeat an old one
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key: str) -> int:
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+class BankCache:
+    name: str
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[int, Any] = {}
+        self._version: Optional[int] = None
+
+    def get(self, test_type_id: int) -> Any:
+        version = get_bank_version()
+        with self._lock:
+            if version != self._version:
+                self._items = {}
+                self._version = version
+            item = self._items.get(test_type_id)
+        observe_cache(self.name, item is not None)
+        if item is not None:
+            return item
+
+        item = self.load(test_type_id)
+        with self._lock:
+            if version == self._version:
+                self._items[test_type_id] = item
+        return item
+
+    def load(self, test_type_id: int) -> Any:
+        raise NotImplementedError
+
+
+class QuestionPool(BankCache):
+    name = 'question_pool'
+
+    def load(self, test_type_id: int) -> array:
+        return array(
+            'q',
+            # keeps the default ordering, unused questions are served in it
+            Question.objects.filter(
+                test_type_id=test_type_id,
+                is_published=True
+            ).values_list('id', flat=True)
+        )
+
+    def sample(self, test_type_id: int, number_questions: int) -> List[int]:
+        pool = self.get(test_type_id)
+        # the positions are sampled, an array isn't a sequence for
+        # random.sample before Python 3.10, and a range isn't copied, so the
+        # sample costs O(number_questions)
+        return [
+            pool[i]
+            for i in random.sample(
+                range(len(pool)),
+                min(number_questions, len(pool))
+            )
+        ]
+
+
+class QuestionBank(BankCache):
+    name = 'question_bank'
+
+    def load(self, test_type_id: int) -> Dict[int, LanguageQuestion]:
+        answers = defaultdict(dict)
+        right_answers = {}
+        question_answers = QuestionAnswer.objects.filter(
+            question__test_type_id=test_type_id,
+            question__is_published=True
+        ).order_by(
+            'answer__answer'
+        ).values_list(
+            'question_id',
+            'answer_id',
+            'answer__answer',
+            'is_right_answer'
+        )
+        for question_id, answer_id, answer, is_right_answer in question_answers:
+            answers[question_id][answer_id] = answer
+            if is_right_answer:
+                right_answers[question_id] = answer_id
+
+        questions = Question.objects.filter(
+            test_type_id=test_type_id,
+            is_published=True
+        ).order_by().values_list('id', 'question')
+        return {
+            question_id: LanguageQuestion(
+                question_id=question_id,
+                question=[i for i in question.strip().split()],
+                answers=answers.get(question_id, {}),
+                right_answer_id=right_answers.get(question_id)
+            )
+            for question_id, question in questions
+        }
+
+    def get_questions(
+            self,
+            test_type_id: int,
+            question_ids: List[int]
+    ) -> List[LanguageQuestion]:
+        questions = self.get(test_type_id)
+        return [questions[i] for i in question_ids if i in questions]
+
+
+class AnswerKeyIndex:
+    name = 'answer_key_index'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._answer_keys: Dict[int, AnswerKey] = {}
+        self._version: Optional[int] = None
+
+    def get(self, question_ids: Iterable[int]) -> Dict[int, AnswerKey]:
+        self._refresh()
+        answer_keys = self._answer_keys
+        return {i: answer_keys[i] for i in question_ids if i in answer_keys}
+
+    def _refresh(self) -> None:
+        version = _get_version(ANSWER_KEYS_VERSION_KEY)
+        observe_cache(self.name, version == self._version)
+        if version == self._version:
+            return
+
+        with self._lock:
+            if version == self._version:
+                return
+            question_ids = self._get_changed_questions(version)
+            if question_ids is None:
+                self._answer_keys = self._load()
+            else:
+                answer_keys = self._load(question_ids)
+                for question_id in question_ids - answer_keys.keys():
+                    self._answer_keys.pop(question_id, None)
+                self._answer_keys.update(answer_keys)
+            self._version = version
+
+    def _get_changed_questions(self, version: int) -> Optional[set]:
+        if self._version is None:
+            return None
+        if not 0 < version - self._version <= MAX_ANSWER_KEYS_CHANGES:
+            return None
+
+        keys = [
+            f'{ANSWER_KEYS_CHANGE_KEY}:{i}'
+            for i in range(self._version + 1, version + 1)
+        ]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return None
+        return set(changes.values())
+
+    @staticmethod
+    def _load(question_ids: Optional[set] = None) -> Dict[int, AnswerKey]:
+        question_answers = QuestionAnswer.objects.order_by().values_list(
+            'question_id',
+            'answer_id',
+            'is_right_answer'
+        )
+        if question_ids is not None:
+            question_answers = question_answers.filter(
+                question_id__in=question_ids
+            )
+
+        answers = defaultdict(set)
+        right_answers = {}
+        for question_id, answer_id, is_right_answer in question_answers:
+            answers[question_id].add(answer_id)
+            if is_right_answer:
+                right_answers[question_id] = answer_id
+
+        return {
+            question_id: AnswerKey(
+                right_answer_id=right_answers.get(question_id),
+                answer_ids=frozenset(answer_ids)
+            )
+            for question_id, answer_ids in answers.items()
+        }
+
+
+answer_key_index = AnswerKeyIndex()
+question_pool = QuestionPool()
+question_bank = QuestionBank()
@@ -0,0 +1,153 @@
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from language_tests.bitsets import in_bitset
+from language_tests.models import Answer, Question, TestAttempt
+
+
+EXPORT_FIELDS = (
+    'attempt_id',
+    'username',
+    'test_type',
+    'solution_date',
+    'question',
+    'answer',
+    'is_right_answer',
+)
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class _Echo:
+
+    @staticmethod
+    def write(value: str) -> str:
+        return value
+
+
+def get_test_attempts(
+        test_type_id: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+) -> QuerySet:
+    test_attempts = TestAttempt.objects.all()
+    if test_type_id is not None:
+        test_attempts = test_attempts.filter(test_type_id=test_type_id)
+    if start is not None:
+        test_attempts = test_attempts.filter(
+            solution_date__gte=datetime.combine(start, time(), timezone.utc)
+        )
+    if end is not None:
+        test_attempts = test_attempts.filter(
+            solution_date__lt=datetime.combine(
+                end + timedelta(days=1),
+                time(),
+                timezone.utc
+            )
+        )
+    return test_attempts
+
+
+def export_test_attempts(
+        test_attempts: QuerySet,
+        file_format: str,
+        chunk_size: int = 2000
+) -> Iterator[str]:
+    # a chunk of rows is sent at once instead of writing every row
+    if file_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for rows in _get_rows(test_attempts, chunk_size):
+            yield ''.join(writer.writerow(row) for row in rows)
+    else:
+        for rows in _get_rows(test_attempts, chunk_size):
+            yield ''.join(
+                json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False)
+                + '\n'
+                for row in rows
+            )
+
+
+def get_export_response(
+        test_attempts: QuerySet,
+        file_format: str
+) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(
+        export_test_attempts(test_attempts, file_format),
+        content_type=CONTENT_TYPES[file_format]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="test_attempts.{file_format}"'
+    )
+    # nginx would buffer the whole export otherwise
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _get_rows(
+        test_attempts: QuerySet,
+        chunk_size: int
+) -> Iterator[List[tuple]]:
+    # iterator() reads the attempts by a server-side cursor on PostgreSQL, and
+    # the texts of the questions and answers are fetched for each chunk, so
+    # the memory doesn't depend on the number of exported rows
+    test_attempts = iter(
+        test_attempts.order_by('id').values_list(
+            'id',
+            'user__username',
+            'test_type__name',
+            'solution_date',
+            'questions',
+            'answers',
+            'right_answers'
+        ).iterator(chunk_size)
+    )
+    while True:
+        chunk = list(islice(test_attempts, chunk_size))
+        if not chunk:
+            break
+        questions = dict(
+            Question.objects.filter(
+                id__in={i for item in chunk for i in item[4]}
+            ).values_list('id', 'question')
+        )
+        answers = dict(
+            Answer.objects.filter(
+                id__in={i for item in chunk for i in item[5]}
+            ).values_list('id', 'answer')
+        )
+        rows = []
+        for (
+                attempt_id,
+                username,
+                test_type,
+                solution_date,
+                question_ids,
+                answer_ids,
+                right_answers
+        ) in chunk:
+            right_answers = bytes(right_answers)
+            for index, (question_id, answer_id) in enumerate(
+                    zip(question_ids, answer_ids)
+            ):
+                rows.append(
+                    (
+                        attempt_id,
+                        username,
+                        test_type,
+                        solution_date.isoformat(),
+                        questions.get(question_id),
+                        answers.get(answer_id),
+                        in_bitset(right_answers, index),
+                    )
+                )
+        yield rows
@@ -0,0 +1,55 @@
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from language_tests.paginators import KEYSET_AFTER_VAR, KEYSET_BEFORE_VAR
+
+
+class UserAutocompleteFilter(admin.ListFilter):
+    parameter_name = 'user'
+    template = 'admin/language_tests/autocomplete_filter.html'
+    title = 'пользователю'
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        value = params.pop(self.parameter_name, None)
+        # only the selected user is rendered, the others are searched by the
+        # autocomplete view of the user admin
+        self.user = None
+        if value and value.isdigit():
+            self.user = User.objects.filter(pk=value).only('id', 'username').first()
+        self.url = reverse('admin:auth_user_autocomplete')
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.user is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.parameter_name, KEYSET_AFTER_VAR, KEYSET_BEFORE_VAR]
+            ),
+            'display': 'Все',
+        }
+
+    def expected_parameters(self):
+        return [self.parameter_name, ]
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.user is None:
+            return queryset
+        return queryset.filter(user_id=self.user.pk)
+
+
+class UserAutocompleteFilterAdminMixin:
+
+    @property
+    def media(self):
+        # the media of the widget doesn't depend on its relation
+        return (
+            super().media
+            + AutocompleteSelect(None, self.admin_site).media
+            + forms.Media(js=('js/admin_autocomplete_filter.js',))
+        )
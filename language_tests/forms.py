@@ -1,4 +1,74 @@
 from django import forms
+from django.contrib.admin.widgets import AutocompleteSelect
+
+from language_tests.exports import CONTENT_TYPES
+from language_tests.models import Answer, LanguageTestType
+
+
+NEW_ANSWER_PREFIX = 'new:'
+
+
+class AnswerAutocompleteSelect(AutocompleteSelect):
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs=extra_attrs)
+        # a missing answer can be typed in and is created with the question
+        attrs.update({
+            'data-tags': 'true',
+            'data-new-option-prefix': NEW_ANSWER_PREFIX,
+        })
+        return attrs
+
+    def optgroups(self, name, value, attr=None):
+        # a typed answer is rendered again when the form has errors
+        new_answers = [i for i in value if str(i).startswith(NEW_ANSWER_PREFIX)]
+        groups = super().optgroups(
+            name,
+            [i for i in value if i not in new_answers],
+            attr
+        )
+        options = groups[0][1]
+        for new_answer in new_answers:
+            options.append(
+                self.create_option(
+                    name,
+                    new_answer,
+                    new_answer[len(NEW_ANSWER_PREFIX):],
+                    True,
+                    len(options)
+                )
+            )
+        return groups
+
+    @property
+    def media(self):
+        return super().media + forms.Media(
+            js=('js/admin_answer_autocomplete.js',)
+        )
+
+
+class AnswerChoiceField(forms.ModelChoiceField):
+
+    def to_python(self, value):
+        if not isinstance(value, str) or not value.startswith(NEW_ANSWER_PREFIX):
+            return super().to_python(value)
+        answer = value[len(NEW_ANSWER_PREFIX):].strip()
+        if answer in self.empty_values:
+            return None
+        answer = Answer._meta.get_field('answer').clean(answer, None)
+        # a missing answer is saved by the formset when the whole form is valid
+        return Answer.objects.filter(answer=answer).first() or Answer(answer=answer)
+
+
+class QuestionAnswerInlineForm(forms.ModelForm):
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        # a typed answer has no id until the formset saves it
+        answer = self.cleaned_data.get('answer')
+        if answer is not None and answer.pk is None:
+            exclude.append('answer')
+        return exclude
 
 
 class QuestionAnswersInlineFormSet(forms.BaseInlineFormSet):
@@ -8,6 +78,17 @@ class QuestionAnswersInlineFormSet(forms.BaseInlineFormSet):
         if self.total_error_count() > 0:
             raise forms.ValidationError(self.errors)
 
+        new_answers = [
+            answer['answer'].answer
+            for answer in self.cleaned_data
+            if answer.get('answer') is not None and answer['answer'].pk is None
+        ]
+        if len(new_answers) != len(set(new_answers)):
+            raise forms.ValidationError(
+                'Ответы вопроса не должны повторяться.',
+                code='duplicate_answers'
+            )
+
         number_right_answers = 0
         for answer in self.cleaned_data:
             if answer['is_right_answer']:
@@ -21,3 +102,43 @@ class QuestionAnswersInlineFormSet(forms.BaseInlineFormSet):
                 message,
                 code='invalid_number_right_answers'
             )
+
+    def save_new(self, form, commit=True):
+        self._save_new_answer(form)
+        return super().save_new(form, commit=commit)
+
+    def save_existing(self, form, instance, commit=True):
+        self._save_new_answer(form)
+        return super().save_existing(form, instance, commit=commit)
+
+    @staticmethod
+    def _save_new_answer(form) -> None:
+        answer = form.cleaned_data.get('answer')
+        if answer is not None and answer.pk is None:
+            form.instance.answer, _ = Answer.objects.get_or_create(
+                answer=answer.answer
+            )
+
+
+class ExportTestAttemptsForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[(i, i) for i in CONTENT_TYPES],
+        required=False
+    )
+    test_type = forms.ModelChoiceField(
+        queryset=LanguageTestType.objects.all(),
+        required=False
+    )
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+        if start and end and start > end:
+            raise forms.ValidationError(
+                'Начальная дата должна быть не позже конечной.',
+                code='invalid_date_range'
+            )
+        return cleaned_data
@@ -0,0 +1,243 @@
+import csv
+import json
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Set,
+    TextIO,
+    Union
+)
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from language_tests.caches import bump_bank_version, reset_answer_keys
+from language_tests.models import (
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer
+)
+from language_tests.validators import validate_question
+
+
+ANSWER_MAX_LENGTH = Answer._meta.get_field('answer').max_length
+QUESTION_MAX_LENGTH = Question._meta.get_field('question').max_length
+NUMBER_ANSWERS = 4
+CSV_ANSWER_FIELDS = tuple(f'answer_{i}' for i in range(1, NUMBER_ANSWERS + 1))
+FALSE_VALUES = {'0', 'false', 'no', ''}
+
+
+class QuestionRow(NamedTuple):
+    line: int
+    question: str
+    test_type: str
+    answers: List[str]
+    right_answer: str
+    is_published: bool = True
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+Row = Union[QuestionRow, RowError]
+
+
+def read_csv(file: TextIO) -> Iterator[Row]:
+    # question,test_type,answer_1,...,answer_4,right_answer[,is_published]
+    reader = csv.DictReader(file)
+    for item in reader:
+        yield _get_row(
+            reader.line_num,
+            {
+                **item,
+                'answers': [
+                    item[field]
+                    for field in CSV_ANSWER_FIELDS
+                    if item.get(field) is not None
+                ],
+            }
+        )
+
+
+def read_jsonl(file: TextIO) -> Iterator[Row]:
+    # {"question": ..., "test_type": ..., "answers": [...], "right_answer": ...}
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            item = json.loads(text)
+        except ValueError:
+            yield RowError(line, 'Некорректный JSON.')
+            continue
+        if not isinstance(item, dict):
+            yield RowError(line, 'Строка должна быть объектом JSON.')
+            continue
+        yield _get_row(line, item)
+
+
+def import_questions(
+        rows: Iterable[Row],
+        report: Callable[[RowError], None],
+        chunk_size: int = 1000
+) -> int:
+    rows = iter(rows)
+    test_types = dict(LanguageTestType.objects.values_list('name', 'id'))
+    answer_ids = {}
+    questions = set()
+    number_questions = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        valid_rows = []
+        for row in chunk:
+            if isinstance(row, QuestionRow):
+                errors = _validate_row(row, test_types, questions)
+                row = RowError(row.line, ' '.join(errors)) if errors else row
+            if isinstance(row, RowError):
+                report(row)
+            else:
+                questions.add(row.question)
+                valid_rows.append(row)
+
+        existing = set(
+            Question.objects.filter(
+                question__in=[row.question for row in valid_rows]
+            ).values_list('question', flat=True)
+        )
+        for row in valid_rows:
+            if row.question in existing:
+                report(RowError(row.line, 'Такой вопрос уже существует.'))
+        valid_rows = [row for row in valid_rows if row.question not in existing]
+        if not valid_rows:
+            continue
+
+        with transaction.atomic():
+            new_answer_ids = _create_answers(
+                {answer for row in valid_rows for answer in row.answers},
+                answer_ids
+            )
+            _create_questions(
+                valid_rows,
+                test_types,
+                {**answer_ids, **new_answer_ids}
+            )
+        answer_ids.update(new_answer_ids)
+        number_questions += len(valid_rows)
+
+    if number_questions:
+        # bulk_create doesn't send the signals which invalidate the caches
+        bump_bank_version()
+        reset_answer_keys()
+    return number_questions
+
+
+def _create_answers(
+        answers: Set[str],
+        answer_ids: Dict[str, int]
+) -> Dict[str, int]:
+    answers = answers - answer_ids.keys()
+    if not answers:
+        return {}
+    # the answers are shared by the questions, so the existing ones are reused
+    Answer.objects.bulk_create(
+        [Answer(answer=answer) for answer in answers],
+        ignore_conflicts=True
+    )
+    return dict(
+        Answer.objects.filter(answer__in=answers).values_list('answer', 'id')
+    )
+
+
+def _create_questions(
+        rows: List[QuestionRow],
+        test_types: Dict[str, int],
+        answer_ids: Dict[str, int]
+) -> None:
+    questions = Question.objects.bulk_create(
+        [
+            Question(
+                question=row.question,
+                is_published=row.is_published,
+                test_type_id=test_types[row.test_type]
+            )
+            for row in rows
+        ]
+    )
+    QuestionAnswer.objects.bulk_create(
+        [
+            QuestionAnswer(
+                question=question,
+                answer_id=answer_ids[answer],
+                is_right_answer=(answer == row.right_answer)
+            )
+            for row, question in zip(rows, questions)
+            for answer in row.answers
+        ]
+    )
+
+
+def _get_row(line: int, item: Dict) -> Row:
+    values = {}
+    for field in ('question', 'test_type', 'right_answer'):
+        value = item.get(field)
+        if not isinstance(value, str):
+            return RowError(line, f'Отсутствует поле «{field}».')
+        values[field] = value.strip()
+    answers = item.get('answers')
+    if not isinstance(answers, list) or not all(
+            isinstance(answer, str) for answer in answers
+    ):
+        return RowError(line, 'Ответы должны быть списком строк.')
+    is_published = item.get('is_published', True)
+    if isinstance(is_published, str):
+        is_published = is_published.strip().lower() not in FALSE_VALUES
+    return QuestionRow(
+        line=line,
+        answers=[answer.strip() for answer in answers],
+        is_published=bool(is_published),
+        **values
+    )
+
+
+def _validate_row(
+        row: QuestionRow,
+        test_types: Dict[str, int],
+        questions: Set[str]
+) -> List[str]:
+    errors = []
+    if len(row.question) > QUESTION_MAX_LENGTH:
+        errors.append(
+            f'Длина вопроса должна быть не больше {QUESTION_MAX_LENGTH} символов.'
+        )
+    else:
+        try:
+            validate_question(row.question)
+        except ValidationError as e:
+            errors.extend(e.messages)
+    if row.question in questions:
+        errors.append('Вопрос повторяется в файле.')
+    if row.test_type not in test_types:
+        errors.append(f'Тип теста «{row.test_type}» не найден.')
+    if len(row.answers) != NUMBER_ANSWERS:
+        errors.append(f'У вопроса должно быть {NUMBER_ANSWERS} ответа.')
+    elif len(set(row.answers)) != NUMBER_ANSWERS:
+        errors.append('Ответы не должны повторяться.')
+    if any(not answer for answer in row.answers):
+        errors.append('Ответ не может быть пустым.')
+    if any(len(answer) > ANSWER_MAX_LENGTH for answer in row.answers):
+        errors.append(
+            f'Длина ответа должна быть не больше {ANSWER_MAX_LENGTH} символов.'
+        )
+    if row.right_answer not in row.answers:
+        errors.append('Правильный ответ должен быть одним из ответов.')
+    return errors
+
@@ -0,0 +1,142 @@
+from typing import List, NamedTuple, Optional, Type
+
+from django.db import connection, models
+
+from language_tests.models import (
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer,
+    TestResult
+)
+
+
+class ConcurrentIndex(NamedTuple):
+    model: Type[models.Model]
+    suffix: str
+    definition: str
+    extension: Optional[str] = None
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def name(self) -> str:
+        return f'{self.table}_{self.suffix}'
+
+
+# Django 3.1 can't declare INCLUDE columns and migrations of this project are
+# generated on deploy, so these indexes are created by a command instead
+INDEXES = (
+    ConcurrentIndex(
+        model=TestResult,
+        suffix='user_question_idx',
+        definition='(user_id, question_id)'
+    ),
+    ConcurrentIndex(
+        model=QuestionAnswer,
+        suffix='question_covering_idx',
+        definition='(question_id) INCLUDE (answer_id, is_right_answer)'
+    ),
+    # the answers are searched by a prefix in the autocomplete of the
+    # question editor, which is a range scan of a pattern index
+    ConcurrentIndex(
+        model=Answer,
+        suffix='answer_prefix_idx',
+        definition='((UPPER(answer::text)) text_pattern_ops)'
+    ),
+    # icontains is compiled to UPPER(column::text) LIKE UPPER(%s) on
+    # PostgreSQL, so the trigram indexes are built on the same expression
+    ConcurrentIndex(
+        model=Question,
+        suffix='question_trgm_idx',
+        definition='USING gin ((UPPER(question::text)) gin_trgm_ops)',
+        extension='pg_trgm'
+    ),
+    ConcurrentIndex(
+        model=Answer,
+        suffix='answer_trgm_idx',
+        definition='USING gin ((UPPER(answer::text)) gin_trgm_ops)',
+        extension='pg_trgm'
+    ),
+    ConcurrentIndex(
+        model=LanguageTestType,
+        suffix='name_trgm_idx',
+        definition='USING gin ((UPPER(name::text)) gin_trgm_ops)',
+        extension='pg_trgm'
+    ),
+)
+
+
+def create_indexes() -> List[str]:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    result = []
+    for index in INDEXES:
+        if index.extension is not None and not _create_extension(index.extension):
+            continue
+        partitions = _get_partitions(index.table)
+        if partitions:
+            _execute(
+                f'CREATE INDEX IF NOT EXISTS {_quote(index.name)} '
+                f'ON ONLY {_quote(index.table)} {index.definition}'
+            )
+            for partition in partitions:
+                name = f'{partition}_{index.suffix}'
+                _create_index_concurrently(name, partition, index.definition)
+                _execute(
+                    f'ALTER INDEX {_quote(index.name)} '
+                    f'ATTACH PARTITION {_quote(name)}'
+                )
+        else:
+            _create_index_concurrently(index.name, index.table, index.definition)
+        result.append(index.name)
+    return result
+
+
+def _create_index_concurrently(name: str, table: str, definition: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)',
+            [name]
+        )
+        row = cursor.fetchone()
+    # an interrupted CREATE INDEX CONCURRENTLY leaves an invalid index
+    if row is not None and not row[0]:
+        _execute(f'DROP INDEX CONCURRENTLY {_quote(name)}')
+    _execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {_quote(name)} '
+        f'ON {_quote(table)} {definition}'
+    )
+
+
+def _create_extension(name: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_available_extensions WHERE name = %s',
+            [name]
+        )
+        if cursor.fetchone() is None:
+            return False
+    _execute(f'CREATE EXTENSION IF NOT EXISTS {_quote(name)}')
+    return True
+
+
+def _execute(sql: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+
+
+def _get_partitions(table: str) -> List[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [table]
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def _quote(name: str) -> str:
+    return connection.ops.quote_name(name)
@@ -0,0 +1,91 @@
+import io
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import connection
+
+from language_tests.models import TestAttempt
+
+
+# (user_id, test_type_id, solution_date, question_ids, answer_ids, right_answers)
+TestAttemptRow = Tuple[int, Optional[int], datetime, List[int], List[int], bytes]
+
+
+def insert_test_attempts(
+        rows: Iterable[TestAttemptRow],
+        chunk_size: int = 10000
+) -> int:
+    rows = iter(rows)
+    number_rows = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        if connection.vendor == 'postgresql':
+            _copy_test_attempts(chunk)
+        else:
+            _create_test_attempts(chunk)
+        number_rows += len(chunk)
+    return number_rows
+
+
+def _copy_test_attempts(rows: Iterable[TestAttemptRow]) -> None:
+    buffer = io.StringIO()
+    for row in rows:
+        user_id, test_type_id, solution_date, questions, answers, right_answers = row
+        # a backslash of the bytea hex format is escaped for the text format
+        buffer.write(
+            f'{user_id}\t{_to_copy_value(test_type_id)}\t'
+            f'{solution_date.isoformat()}\t'
+            f'{_to_copy_array(questions)}\t{_to_copy_array(answers)}\t'
+            f'\\\\x{bytes(right_answers).hex()}\n'
+        )
+    buffer.seek(0)
+    _copy(
+        TestAttempt,
+        (
+            'user',
+            'test_type',
+            'solution_date',
+            'questions',
+            'answers',
+            'right_answers'
+        ),
+        buffer
+    )
+
+
+def _create_test_attempts(rows: Iterable[TestAttemptRow]) -> None:
+    TestAttempt.objects.bulk_create(
+        TestAttempt(
+            user_id=user_id,
+            test_type_id=test_type_id,
+            solution_date=solution_date,
+            questions=questions,
+            answers=answers,
+            right_answers=bytes(right_answers)
+        )
+        for user_id, test_type_id, solution_date, questions, answers, right_answers
+        in rows
+    )
+
+
+def _copy(model, fields: Iterable[str], buffer: io.StringIO) -> None:
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(
+        quote_name(model._meta.get_field(field).column) for field in fields
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN',
+            buffer
+        )
+
+
+def _to_copy_array(values: Iterable[int]) -> str:
+    return '{' + ','.join(str(value) for value in values) + '}'
+
+
+def _to_copy_value(value: Optional[int]) -> str:
+    return '\\N' if value is None else str(value)
@@ -0,0 +1,203 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+import redis
+from django.utils import timezone
+
+from language_tests.bitsets import count_bitset
+from language_tests.ingestion import TestAttemptRow
+from language_tests.models import TestAttempt, UserTestStats
+from test_your_language.settings import LEADERBOARDS_URL
+
+
+ALL_TIME = 'all'
+WEEK = 'week'
+PERIODS = (ALL_TIME, WEEK,)
+
+KEY_PREFIX = 'language_tests:leaderboard'
+REBUILD_SUFFIX = 'rebuild'
+WEEK_DAYS = 7
+# the weekly leaderboard is a union of the daily ones, which is cached for
+# a short time instead of being computed on every request
+WEEK_TIMEOUT = 60
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+
+
+class LeaderboardEntry(NamedTuple):
+    rank: int
+    user_id: int
+    score: int
+
+
+class Leaderboard:
+
+    def __init__(self, test_type_id: int, period: str = ALL_TIME):
+        self.test_type_id = test_type_id
+        self.period = period
+        self._key = None
+
+    def __getitem__(self, item: slice) -> List[LeaderboardEntry]:
+        start = item.start or 0
+        if item.stop is None or item.stop <= start:
+            return []
+        items = _get_client().zrevrange(
+            self.key,
+            start,
+            item.stop - 1,
+            withscores=True
+        )
+        return [
+            LeaderboardEntry(
+                rank=start + i + 1,
+                user_id=int(user_id),
+                score=int(score)
+            )
+            for i, (user_id, score) in enumerate(items)
+        ]
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            if self.period == WEEK:
+                self._key = _get_week_key(self.test_type_id)
+            else:
+                self._key = _get_key(self.test_type_id, ALL_TIME)
+        return self._key
+
+    def count(self) -> int:
+        return _get_client().zcard(self.key)
+
+    def get_entry(self, user_id: int) -> Optional[LeaderboardEntry]:
+        pipeline = _get_client().pipeline(transaction=False)
+        pipeline.zrevrank(self.key, user_id)
+        pipeline.zscore(self.key, user_id)
+        rank, score = pipeline.execute()
+        if rank is None:
+            return None
+        return LeaderboardEntry(rank=rank + 1, user_id=user_id, score=int(score))
+
+
+def update_leaderboards(attempts: Iterable[TestAttemptRow]) -> None:
+    first_day = _get_first_day()
+    scores = defaultdict(int)
+    for user_id, test_type_id, solution_date, _, _, right_answers in attempts:
+        if test_type_id is None:
+            continue
+        scores[(test_type_id, user_id, solution_date.date())] += count_bitset(
+            bytes(right_answers)
+        )
+
+    try:
+        pipeline = _get_client().pipeline(transaction=False)
+        for (test_type_id, user_id, day), score in scores.items():
+            pipeline.zincrby(_get_key(test_type_id, ALL_TIME), score, user_id)
+            if day >= first_day:
+                key = _get_key(test_type_id, _get_day(day))
+                pipeline.zincrby(key, score, user_id)
+                pipeline.expireat(key, _get_expiration(day))
+        pipeline.execute()
+    except redis.RedisError:
+        # the leaderboards are restored by the rebuild_leaderboards command
+        logger.exception('Leaderboards are not updated')
+
+
+def rebuild_leaderboards(chunk_size: int = 10000) -> int:
+    client = _get_client()
+    first_day = _get_first_day()
+    keys = {}
+    pipeline = client.pipeline(transaction=False)
+
+    def add_score(key: str, user_id: int, score: int, day: date = None) -> None:
+        if key not in keys:
+            keys[key] = _get_expiration(day) if day else None
+            pipeline.delete(f'{key}:{REBUILD_SUFFIX}')
+        pipeline.zincrby(f'{key}:{REBUILD_SUFFIX}', score, user_id)
+        if len(pipeline) >= chunk_size:
+            pipeline.execute()
+
+    # the all time score is the number of right answers of the statistics
+    stats = UserTestStats.objects.order_by().values_list(
+        'test_type_id',
+        'user_id',
+        'number_right_answers'
+    )
+    for test_type_id, user_id, score in stats.iterator(chunk_size):
+        add_score(_get_key(test_type_id, ALL_TIME), user_id, score)
+
+    attempts = TestAttempt.objects.filter(
+        solution_date__gte=datetime.combine(first_day, time(), timezone.utc),
+        test_type__isnull=False
+    ).order_by().values_list(
+        'test_type_id',
+        'user_id',
+        'solution_date',
+        'right_answers'
+    )
+    for test_type_id, user_id, solution_date, right_answers in (
+            attempts.iterator(chunk_size)
+    ):
+        day = solution_date.date()
+        add_score(
+            _get_key(test_type_id, _get_day(day)),
+            user_id,
+            count_bitset(bytes(right_answers)),
+            day
+        )
+    pipeline.execute()
+
+    for key in client.scan_iter(f'{KEY_PREFIX}:*'):
+        key = key.decode()
+        if key not in keys and not key.endswith(f':{REBUILD_SUFFIX}'):
+            pipeline.delete(key)
+    for key, expiration in keys.items():
+        pipeline.rename(f'{key}:{REBUILD_SUFFIX}', key)
+        if expiration is not None:
+            pipeline.expireat(key, expiration)
+    pipeline.execute()
+
+    return len(keys)
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(LEADERBOARDS_URL)
+    return _client
+
+
+def _get_day(day: date) -> str:
+    return day.strftime('%Y%m%d')
+
+
+def _get_expiration(day: date) -> datetime:
+    return datetime.combine(
+        day + timedelta(days=WEEK_DAYS + 1),
+        time(),
+        timezone.utc
+    )
+
+
+def _get_first_day() -> date:
+    return timezone.now().date() - timedelta(days=WEEK_DAYS - 1)
+
+
+def _get_key(test_type_id: int, period: str) -> str:
+    return f'{KEY_PREFIX}:{test_type_id}:{period}'
+
+
+def _get_week_key(test_type_id: int) -> str:
+    client = _get_client()
+    key = _get_key(test_type_id, WEEK)
+    if not client.exists(key):
+        first_day = _get_first_day()
+        days = [_get_day(first_day + timedelta(days=i)) for i in range(WEEK_DAYS)]
+        pipeline = client.pipeline()
+        pipeline.zunionstore(key, [_get_key(test_type_id, day) for day in days])
+        pipeline.expire(key, WEEK_TIMEOUT)
+        pipeline.execute()
+    return key
@@ -0,0 +1,236 @@
+import math
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from language_tests.bitsets import add_to_bitset, add_to_offset_bitset
+from language_tests.caches import bump_bank_version, reset_answer_keys
+from language_tests.ingestion import TestAttemptRow, insert_test_attempts
+from language_tests.models import (
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer,
+    TestAttempt,
+    UsedQuestions
+)
+from language_tests.tasks import group_used_questions, rebuild_user_stats
+
+
+NUMBER_ANSWERS = 4
+# the exponent of the Zipf distribution of the users, test types and answers
+SKEW = 1.1
+
+
+class LoadData(NamedTuple):
+    test_type_ids: List[int]
+    # the question id with its answer ids, the right one is the first
+    questions: Dict[int, List[Tuple[int, List[int]]]]
+    user_ids: List[int]
+
+
+def get_question_text(prefix: str, test_type: int, number: int) -> str:
+    return f'{prefix} {test_type}-{number} ___ question'
+
+
+def generate_load_data(
+        seed: int = 0,
+        prefix: str = 'load',
+        number_test_types: int = 20,
+        number_questions: int = 1000,
+        number_answers: int = 2000,
+        number_users: int = 10000,
+        number_attempts: int = 100000,
+        number_test_questions: int = 10,
+        days: int = 365,
+        chunk_size: int = 10000
+) -> int:
+    rng = random.Random(seed)
+    with transaction.atomic():
+        data = _create_question_bank(
+            rng,
+            prefix,
+            number_test_types,
+            number_questions,
+            number_answers
+        )
+        data = data._replace(user_ids=_create_users(prefix, number_users))
+    # bulk_create doesn't send the signals which invalidate the caches
+    bump_bank_version()
+    reset_answer_keys()
+
+    now = timezone.now()
+    insert_test_attempts(
+        generate_test_attempts(
+            rng,
+            data,
+            number_attempts,
+            number_test_questions,
+            now - timedelta(days=days),
+            now
+        ),
+        chunk_size
+    )
+    for i in range(0, len(data.user_ids), chunk_size):
+        with transaction.atomic():
+            _create_user_stats(data.user_ids[i:i + chunk_size])
+    return number_attempts
+
+
+def generate_test_attempts(
+        rng: random.Random,
+        data: LoadData,
+        number_attempts: int,
+        number_test_questions: int,
+        start: datetime,
+        end: datetime
+) -> Iterator[TestAttemptRow]:
+    # a few users and test types get most of the attempts, as in production
+    users = list(data.user_ids)
+    rng.shuffle(users)
+    user_weights = _get_cum_weights(len(users))
+    skills = {user_id: rng.betavariate(5, 2) for user_id in users}
+    test_types = list(data.test_type_ids)
+    rng.shuffle(test_types)
+    test_type_weights = _get_cum_weights(len(test_types))
+    span = (end - start).total_seconds()
+
+    for i in range(number_attempts):
+        user_id = rng.choices(users, cum_weights=user_weights)[0]
+        test_type_id = rng.choices(test_types, cum_weights=test_type_weights)[0]
+        questions = data.questions[test_type_id]
+        skill = skills[user_id]
+        question_ids = []
+        answer_ids = []
+        right_answers = []
+        for index, (question_id, answers) in enumerate(
+                rng.sample(questions, min(number_test_questions, len(questions)))
+        ):
+            question_ids.append(question_id)
+            if rng.random() < skill:
+                answer_ids.append(answers[0])
+                right_answers.append(index)
+            else:
+                answer_ids.append(rng.choice(answers[1:]))
+        # the number of attempts grows with time, and the ids follow the
+        # solution dates like the ids of the saved attempts do
+        solution_date = start + timedelta(
+            seconds=span * math.sqrt((i + rng.random()) / number_attempts)
+        )
+        yield (
+            user_id,
+            test_type_id,
+            solution_date,
+            question_ids,
+            answer_ids,
+            add_to_bitset(b'', right_answers)
+        )
+
+
+def _create_question_bank(
+        rng: random.Random,
+        prefix: str,
+        number_test_types: int,
+        number_questions: int,
+        number_answers: int
+) -> LoadData:
+    test_types = LanguageTestType.objects.bulk_create(
+        [
+            LanguageTestType(name=f'{prefix} {i}')
+            for i in range(number_test_types)
+        ]
+    )
+    answers = Answer.objects.bulk_create(
+        [
+            Answer(answer=f'{prefix} answer {i}')
+            for i in range(number_answers)
+        ],
+        batch_size=10000
+    )
+    answer_ids = [answer.pk for answer in answers]
+    answer_weights = _get_cum_weights(len(answer_ids))
+
+    questions = []
+    question_answers = []
+    for test_type in test_types:
+        for i in range(number_questions):
+            question = Question(
+                question=get_question_text(prefix, test_type.pk, i),
+                test_type=test_type
+            )
+            ids = []
+            while len(ids) < NUMBER_ANSWERS:
+                answer_id = rng.choices(answer_ids, cum_weights=answer_weights)[0]
+                if answer_id not in ids:
+                    ids.append(answer_id)
+            questions.append(question)
+            question_answers.append(ids)
+    Question.objects.bulk_create(questions, batch_size=10000)
+
+    result = {test_type.pk: [] for test_type in test_types}
+    for question, ids in zip(questions, question_answers):
+        result[question.test_type_id].append((question.pk, ids))
+    QuestionAnswer.objects.bulk_create(
+        [
+            QuestionAnswer(
+                question=question,
+                answer_id=answer_id,
+                is_right_answer=(number == 0)
+            )
+            for question, ids in zip(questions, question_answers)
+            for number, answer_id in enumerate(ids)
+        ],
+        batch_size=10000
+    )
+    return LoadData(
+        test_type_ids=[test_type.pk for test_type in test_types],
+        questions=result,
+        user_ids=[]
+    )
+
+
+def _create_users(prefix: str, number_users: int) -> List[int]:
+    # hashing a password takes longer than inserting the user
+    password = make_password(prefix)
+    users = User.objects.bulk_create(
+        [
+            User(username=f'{prefix}_user_{i}', password=password)
+            for i in range(number_users)
+        ],
+        batch_size=10000
+    )
+    return [user.pk for user in users]
+
+
+def _create_user_stats(user_ids: Sequence[int]) -> None:
+    attempts = TestAttempt.objects.filter(
+        user_id__in=user_ids
+    ).order_by().values_list('user_id', 'test_type_id', 'questions')
+    used_questions = group_used_questions(
+        (user_id, test_type_id, question_id)
+        for user_id, test_type_id, questions in attempts.iterator()
+        for question_id in questions
+    )
+    items = []
+    for (user_id, test_type_id), question_ids in used_questions.items():
+        questions, offset = add_to_offset_bitset(b'', 0, question_ids)
+        items.append(
+            UsedQuestions(
+                user_id=user_id,
+                test_type_id=test_type_id,
+                questions=questions,
+                offset=offset
+            )
+        )
+    UsedQuestions.objects.bulk_create(items)
+    rebuild_user_stats(user_ids)
+
+
+def _get_cum_weights(number_items: int) -> List[float]:
+    return list(accumulate(1 / (i + 1) ** SKEW for i in range(number_items)))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from language_tests.models import TestAttempt
+from language_tests.tasks import group_used_questions, update_used_questions
+
+
+class Command(BaseCommand):
+    help = 'Builds the used questions bitsets from the existing test attempts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Number of test attempts processed in one transaction.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        number_attempts = 0
+
+        while True:
+            chunk = list(
+                TestAttempt.objects.filter(
+                    id__gt=last_id
+                ).order_by(
+                    'id'
+                ).values_list(
+                    'id',
+                    'user_id',
+                    'test_type_id',
+                    'questions'
+                )[:chunk_size]
+            )
+            if not chunk:
+                break
+
+            with transaction.atomic():
+                update_used_questions(
+                    group_used_questions(
+                        (user_id, test_type_id, question_id)
+                        for _, user_id, test_type_id, questions in chunk
+                        for question_id in questions
+                    )
+                )
+
+            last_id = chunk[-1][0]
+            number_attempts += len(chunk)
+            self.stdout.write(f'Processed {number_attempts} test attempts.')
+
+        self.stdout.write(self.style.SUCCESS('Used questions are up to date.'))
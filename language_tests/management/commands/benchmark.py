@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the benchmarks of the services and views for growing data in a '
+        'rolled back transaction and saves the results to a JSON file, or '
+        'compares two result files.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='benchmark.json',
+            help='File for the results.'
+        )
+        parser.add_argument(
+            '--quick',
+            action='store_true',
+            help='Runs the smaller scenarios only.'
+        )
+        parser.add_argument(
+            '--repeats',
+            type=int,
+            default=20,
+            help='Number of the measured calls of a case.'
+        )
+        parser.add_argument(
+            '--compare',
+            nargs=2,
+            metavar=('OLD', 'NEW'),
+            help='Compares two result files instead of running the suite.'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Allowed relative growth of the time, rows and memory.'
+        )
+
+    def handle(self, *args, **options):
+        # the suite configures Django on import like the other benchmarks
+        from benchmarks.suite import (
+            QUICK_SWEEPS,
+            SWEEPS,
+            compare,
+            get_scenarios,
+            load_results,
+            run_suite,
+            save_results
+        )
+
+        if options['compare']:
+            old, new = (load_results(path) for path in options['compare'])
+            regressions = compare(old, new, options['threshold'])
+            for item in regressions:
+                self.stdout.write(
+                    f'{item.scenario} {item.case} {item.metric}: '
+                    f'{item.old} -> {item.new}'
+                )
+            if regressions:
+                raise CommandError(f'Found {len(regressions)} regressions.')
+            self.stdout.write(self.style.SUCCESS('No regressions.'))
+            return
+
+        # the test client needs the test server host and the locmem email
+        setup_test_environment()
+        try:
+            results = run_suite(
+                get_scenarios(QUICK_SWEEPS if options['quick'] else SWEEPS),
+                options['repeats'],
+                self.stdout.write
+            )
+        finally:
+            teardown_test_environment()
+        save_results(results, options['output'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Results are saved to {options["output"]}.')
+        )
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from language_tests.ingestion import insert_test_attempts
+from language_tests.models import TestResult, TestResultBatch
+from language_tests.tasks import (
+    grade_test_attempts,
+    group_used_questions,
+    rebuild_user_stats,
+    update_used_questions
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Converts the test results to test attempts and rebuilds the used '
+        'questions and the statistics of their users. The test results are '
+        'kept, the converted users are remembered, so the command may be run '
+        'again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of users processed in one transaction.'
+        )
+        parser.add_argument(
+            '--attempt-gap',
+            type=int,
+            default=60,
+            help='Seconds between answers that start a new attempt.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Counts the test attempts in a rolled back transaction.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        attempt_gap = timedelta(seconds=options['attempt_gap'])
+        dry_run = options['dry_run']
+        last_user_id = 0
+        number_attempts = 0
+
+        while True:
+            user_ids = list(
+                TestResult.objects.filter(
+                    user_id__gt=last_user_id
+                ).order_by(
+                    'user_id'
+                ).values_list(
+                    'user_id',
+                    flat=True
+                ).distinct()[:chunk_size]
+            )
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            with transaction.atomic():
+                user_ids = self.mark_converted_users(user_ids)
+                if user_ids:
+                    attempts = grade_test_attempts(
+                        self.group_test_results(user_ids, attempt_gap)
+                    )
+                    number_attempts += insert_test_attempts(attempts)
+                    update_used_questions(
+                        group_used_questions(
+                            (attempt[0], attempt[1], question_id)
+                            for attempt in attempts
+                            for question_id in attempt[3]
+                        )
+                    )
+                    rebuild_user_stats(user_ids)
+                if dry_run:
+                    transaction.set_rollback(True)
+
+            self.stdout.write(f'Created {number_attempts} test attempts.')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('Nothing is saved, dry run.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Test results are converted.'))
+
+    @staticmethod
+    def mark_converted_users(user_ids):
+        # returns the users that were not converted by a previous run
+        batch_ids = {f'convert_test_results:{i}': i for i in user_ids}
+        converted = set(
+            TestResultBatch.objects.filter(
+                id__in=batch_ids
+            ).values_list(
+                'id',
+                flat=True
+            )
+        )
+        TestResultBatch.objects.bulk_create(
+            TestResultBatch(id=batch_id)
+            for batch_id in batch_ids
+            if batch_id not in converted
+        )
+        return [
+            user_id
+            for batch_id, user_id in batch_ids.items()
+            if batch_id not in converted
+        ]
+
+    @staticmethod
+    def group_test_results(user_ids, attempt_gap):
+        # the results of one attempt were saved together, but their solution
+        # dates may differ by the time of the insert
+        test_results = TestResult.objects.filter(
+            user_id__in=user_ids
+        ).order_by(
+            'user_id',
+            'id'
+        ).values_list(
+            'user_id',
+            'question__test_type_id',
+            'question_id',
+            'answer_id',
+            'solution_date'
+        )
+        attempt = None
+        last_date = None
+        for user_id, test_type_id, question_id, answer_id, solution_date in (
+                test_results.iterator()
+        ):
+            if (
+                    attempt is None
+                    or attempt[:2] != (user_id, test_type_id)
+                    or solution_date - last_date > attempt_gap
+                    or question_id in {item[0] for item in attempt[3]}
+            ):
+                if attempt is not None:
+                    yield attempt
+                attempt = (user_id, test_type_id, solution_date, [])
+            attempt[3].append((question_id, answer_id))
+            last_date = solution_date
+        if attempt is not None:
+            yield attempt
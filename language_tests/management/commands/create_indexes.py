@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from language_tests.indexes import create_indexes, INDEXES
+
+
+class Command(BaseCommand):
+    help = 'Creates the indexes of the hot queries without locking the tables.'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The indexes are supported only by PostgreSQL.')
+        if connection.in_atomic_block:
+            raise CommandError('The indexes can\'t be created in a transaction.')
+
+        names = create_indexes()
+        for name in names:
+            self.stdout.write(f'Index {name} is ready.')
+        for index in INDEXES:
+            if index.name not in names:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'Index {index.name} is skipped, the {index.extension} '
+                        f'extension isn\'t available.'
+                    )
+                )
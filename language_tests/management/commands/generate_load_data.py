@@ -0,0 +1,103 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from language_tests.load_data import (
+    generate_load_data,
+    get_question_text,
+    NUMBER_ANSWERS
+)
+from language_tests.models import Answer, LanguageTestType
+from language_tests.validators import validate_question
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates test types, questions, answers, users and test attempts '
+        'with a skewed distribution for load testing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--prefix',
+            default='load',
+            help=(
+                'Prefix of the generated names, which must be new. It is also '
+                'the password of the users.'
+            )
+        )
+        parser.add_argument('--test-types', type=int, default=20)
+        parser.add_argument(
+            '--questions',
+            type=int,
+            default=1000,
+            help='Number of questions of a test type.'
+        )
+        parser.add_argument('--answers', type=int, default=2000)
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--attempts', type=int, default=100000)
+        parser.add_argument(
+            '--test-questions',
+            type=int,
+            default=10,
+            help='Number of questions of an attempt.'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Number of days the solution dates are spread over.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Number of rows inserted at once.'
+        )
+
+    def handle(self, *args, **options):
+        for option in ('test_types', 'questions', 'users', 'test_questions'):
+            if options[option] < 1:
+                raise CommandError(
+                    f'--{option.replace("_", "-")} must be positive.'
+                )
+        # the answers of a question are distinct
+        if options['answers'] < NUMBER_ANSWERS:
+            raise CommandError(f'--answers must be at least {NUMBER_ANSWERS}.')
+        if options['attempts'] < 0:
+            raise CommandError('--attempts must not be negative.')
+
+        prefix = options['prefix']
+        try:
+            validate_question(get_question_text(prefix, 1, 1))
+        except ValidationError:
+            raise CommandError('The prefix makes the questions invalid.')
+        if (
+                LanguageTestType.objects.filter(
+                    name__startswith=f'{prefix} '
+                ).exists()
+                or Answer.objects.filter(
+                    answer__startswith=f'{prefix} '
+                ).exists()
+                or User.objects.filter(
+                    username__startswith=f'{prefix}_user_'
+                ).exists()
+        ):
+            raise CommandError(f'The data with the prefix "{prefix}" exists.')
+
+        number_attempts = generate_load_data(
+            seed=options['seed'],
+            prefix=prefix,
+            number_test_types=options['test_types'],
+            number_questions=options['questions'],
+            number_answers=options['answers'],
+            number_users=options['users'],
+            number_attempts=options['attempts'],
+            number_test_questions=options['test_questions'],
+            days=options['days'],
+            chunk_size=options['chunk_size']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Generated {number_attempts} test attempts.')
+        )
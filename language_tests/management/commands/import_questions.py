@@ -0,0 +1,78 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from language_tests.imports import import_questions, read_csv, read_jsonl
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports questions with their answers from a CSV or JSON Lines file. '
+        'The rows with errors are skipped and reported.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file.')
+        parser.add_argument(
+            '--format',
+            choices=list(READERS),
+            help='Format of the file, detected by its extension by default.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of questions inserted in one transaction.'
+        )
+        parser.add_argument(
+            '--report',
+            help='CSV file for the errors, which are printed by default.'
+        )
+
+    def handle(self, *args, **options):
+        file_format = options['format']
+        if file_format is None:
+            file_format = os.path.splitext(options['path'])[1][1:].lower()
+        if file_format not in READERS:
+            raise CommandError('Unknown file format, use --format.')
+
+        report_file = None
+        if options['report']:
+            report_file = open(options['report'], 'w', newline='')
+            report_writer = csv.writer(report_file)
+            report_writer.writerow(('line', 'error'))
+        number_errors = 0
+
+        def report(error):
+            nonlocal number_errors
+            number_errors += 1
+            if report_file is None:
+                self.stderr.write(f'Line {error.line}: {error.message}')
+            else:
+                report_writer.writerow(error)
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as file:
+                number_questions = import_questions(
+                    READERS[file_format](file),
+                    report,
+                    options['chunk_size']
+                )
+        finally:
+            if report_file is not None:
+                report_file.close()
+
+        if number_errors:
+            self.stdout.write(
+                self.style.WARNING(f'Skipped {number_errors} rows with errors.')
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Imported {number_questions} questions.')
+        )
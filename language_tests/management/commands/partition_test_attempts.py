@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from language_tests.partitions import (
+    create_partitions,
+    is_partitioned,
+    partition_test_attempts
+)
+from test_your_language.settings import TEST_RESULTS_PARTITIONS_AHEAD
+
+
+class Command(BaseCommand):
+    help = (
+        'Converts the test attempts table to a table partitioned by month '
+        'of the solution date.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning is supported only by PostgreSQL.')
+
+        if is_partitioned():
+            self.stdout.write('Test attempts are already partitioned.')
+        else:
+            partition_test_attempts()
+            self.stdout.write(self.style.SUCCESS('Test attempts are partitioned.'))
+
+        for name in create_partitions(TEST_RESULTS_PARTITIONS_AHEAD):
+            self.stdout.write(f'Created partition {name}.')
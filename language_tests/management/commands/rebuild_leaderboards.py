@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from language_tests.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the leaderboards from the user statistics and attempts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Number of rows fetched and written to Redis at once.'
+        )
+
+    def handle(self, *args, **options):
+        number_leaderboards = rebuild_leaderboards(options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {number_leaderboards} leaderboards.')
+        )
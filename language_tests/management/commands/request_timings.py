@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from language_tests.timings import get_view_timings, reset_view_timings
+
+
+class Command(BaseCommand):
+    help = (
+        'Shows the number of requests, the percentiles of the total time and '
+        'the mean database and template times of each view.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Deletes the recorded timings.'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_view_timings()
+            self.stdout.write(self.style.SUCCESS('Request timings are reset.'))
+            return
+
+        self.stdout.write(
+            f'{"view":<50} {"requests":>9} {"p50, ms":>8} {"p95, ms":>8} '
+            f'{"p99, ms":>8} {"queries":>8} {"db, ms":>8} {"tpl, ms":>8}'
+        )
+        for item in get_view_timings():
+            if not item.number_requests:
+                continue
+            self.stdout.write(
+                f'{item.view:<50} {item.number_requests:>9} '
+                f'{item.get_percentile(50):>8} {item.get_percentile(95):>8} '
+                f'{item.get_percentile(99):>8} '
+                f'{item.number_queries / item.number_requests:>8.1f} '
+                f'{item.db_time / item.number_requests:>8.1f} '
+                f'{item.template_time / item.number_requests:>8.1f}'
+            )
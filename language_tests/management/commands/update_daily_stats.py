@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from language_tests.rollups import update_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily statistics of test attempts for a date range.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('start', help='First date, YYYY-MM-DD.')
+        parser.add_argument('end', nargs='?', help='Last date, YYYY-MM-DD.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Number of test attempts fetched at once.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_date(options['start'])
+            end = parse_date(options['end'] or options['start'])
+        except ValueError:
+            start = end = None
+        if start is None or end is None or start > end:
+            raise CommandError('Invalid date range.')
+
+        number_days = update_daily_stats(start, end, options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Updated statistics of {number_days} days.')
+        )
@@ -0,0 +1,156 @@
+import glob
+import os
+import time
+from typing import Dict
+
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry
+)
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from language_tests.timings import RequestTimer
+from test_your_language.settings import METRICS_DIR
+
+
+ENQUEUED_AT_HEADER = 'enqueued_at'
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+request_duration = Histogram(
+    'http_request_duration_seconds',
+    'The total time of the requests',
+    ['view', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+responses = Counter(
+    'http_responses',
+    'The number of the responses',
+    ['view', 'method', 'status']
+)
+request_queries = Histogram(
+    'http_request_db_queries',
+    'The number of the database queries of the requests',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+request_db_duration = Histogram(
+    'http_request_db_duration_seconds',
+    'The time of the database queries of the requests',
+    ['view'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+cache_requests = Counter(
+    'cache_requests',
+    'The number of the requests of the caches in memory',
+    ['cache', 'result']
+)
+task_duration = Histogram(
+    'celery_task_duration_seconds',
+    'The run time of the tasks',
+    ['task', 'state'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+)
+task_queue_wait = Histogram(
+    'celery_task_queue_wait_seconds',
+    'The time of the tasks in the queue',
+    ['task'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+)
+task_retries = Counter(
+    'celery_task_retries',
+    'The number of the retries of the tasks',
+    ['task']
+)
+task_failures = Counter(
+    'celery_task_failures',
+    'The number of the failures of the tasks',
+    ['task', 'exception']
+)
+
+# the start times of the tasks run by the process by their ids
+_task_starts: Dict[str, float] = {}
+
+
+class _ServicesCollector(MultiProcessCollector):
+    # the pids of the containers repeat, so each service has its own
+    # subdirectory
+
+    def collect(self):
+        files = glob.glob(os.path.join(self._path, '*.db'))
+        files += glob.glob(os.path.join(self._path, '*', '*.db'))
+        return self.merge(files, accumulate=True)
+
+
+def observe_request(
+        view: str,
+        method: str,
+        status: int,
+        timer: RequestTimer
+) -> None:
+    request_duration.labels(view, method).observe(timer.total_time)
+    responses.labels(view, method, status).inc()
+    request_queries.labels(view).observe(timer.number_queries)
+    request_db_duration.labels(view).observe(timer.db_time)
+
+
+def observe_cache(cache: str, hit: bool) -> None:
+    cache_requests.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def get_metrics() -> bytes:
+    # the processes of gunicorn and of the celery worker write their metrics
+    # to the files of PROMETHEUS_MULTIPROC_DIR, a subdirectory of METRICS_DIR
+    # for each service
+    if not METRICS_DIR:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    _ServicesCollector(registry, METRICS_DIR)
+    return generate_latest(registry)
+
+
+@before_task_publish.connect
+def _set_enqueued_at(headers=None, **kwargs) -> None:
+    # the clocks of the containers are the clock of the host
+    if headers is not None:
+        headers[ENQUEUED_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def _start_task(task_id=None, task=None, **kwargs) -> None:
+    _task_starts[task_id] = time.perf_counter()
+    enqueued_at = getattr(task.request, ENQUEUED_AT_HEADER, None)
+    if enqueued_at is not None:
+        task_queue_wait.labels(task.name).observe(
+            max(time.time() - enqueued_at, 0)
+        )
+
+
+@task_postrun.connect
+def _stop_task(task_id=None, task=None, state=None, **kwargs) -> None:
+    start = _task_starts.pop(task_id, None)
+    if start is not None:
+        task_duration.labels(task.name, state or 'UNKNOWN').observe(
+            time.perf_counter() - start
+        )
+
+
+@task_retry.connect
+def _count_retry(sender=None, **kwargs) -> None:
+    task_retries.labels(sender.name).inc()
+
+
+@task_failure.connect
+def _count_failure(sender=None, exception=None, **kwargs) -> None:
+    task_failures.labels(sender.name, type(exception).__name__).inc()
+
@@ -0,0 +1,46 @@
+from contextlib import ExitStack
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from language_tests.metrics import observe_request
+from language_tests.timings import RequestTimer, UNRESOLVED_VIEW, record_request
+from test_your_language.settings import METRICS, REQUEST_TIMINGS
+
+
+class RequestTimingMiddleware:
+    # is the first middleware, so the total time includes the others
+
+    def __init__(self, get_response):
+        if not REQUEST_TIMINGS and not METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = RequestTimer(f'{request.method} {request.path}')
+        request.timer = timer
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        # the content of a streaming response is sent after this
+        timer.stop()
+
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED_VIEW
+        if REQUEST_TIMINGS:
+            record_request(view, timer)
+        if METRICS:
+            observe_request(view, request.method, response.status_code, timer)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            response['Server-Timing'] = timer.get_server_timing()
+        return response
+
+    def process_template_response(self, request, response):
+        # is called last, right before the response is rendered
+        request.timer.start_template()
+        response.add_post_render_callback(
+            lambda _: request.timer.stop_template()
+        )
+        return response
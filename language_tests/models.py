@@ -1,7 +1,11 @@
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
+from language_tests.bitsets import count_bitset, in_bitset
 from language_tests.validators import validate_question
 
 
@@ -118,7 +122,7 @@ class TestResult(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     answer = models.ForeignKey(Answer, on_delete=models.CASCADE)
-    solution_date = models.DateTimeField(auto_now_add=True)
+    solution_date = models.DateTimeField(default=timezone.now, editable=False)
 
     objects = models.Manager()
 
@@ -131,3 +135,270 @@ class TestResult(models.Model):
             f'Пользователь - "{self.user}"; Вопрос - "{self.question}"; '
             f'Ответ - "{self.answer}"'
         )
+
+
+class TestAttempt(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    test_type = models.ForeignKey(
+        LanguageTestType,
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name='Тип теста'
+    )
+    solution_date = models.DateTimeField(default=timezone.now, editable=False)
+    questions = ArrayField(models.PositiveIntegerField(), verbose_name='Вопросы')
+    answers = ArrayField(models.PositiveIntegerField(), verbose_name='Ответы')
+    # bit N is set when the answer with index N is right
+    right_answers = models.BinaryField(
+        default=bytes,
+        verbose_name='Правильные ответы'
+    )
+
+    objects = models.Manager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('user', 'test_type', '-solution_date',)),
+            # the attempts are appended in the order of the solution date
+            BrinIndex(fields=('solution_date',)),
+        )
+        ordering = ['-solution_date', ]
+        verbose_name = 'Попытка теста'
+        verbose_name_plural = 'Попытки тестов'
+
+    def __str__(self):
+        return (
+            f'Пользователь - "{self.user}"; Тип теста - "{self.test_type}"; '
+            f'Дата - "{self.solution_date}"'
+        )
+
+    @property
+    def number_answers(self) -> int:
+        return len(self.questions)
+
+    @property
+    def number_right_answers(self) -> int:
+        return count_bitset(bytes(self.right_answers))
+
+    def is_right_answer(self, index: int) -> bool:
+        return in_bitset(bytes(self.right_answers), index)
+
+
+class TestResultBatch(models.Model):
+    id = models.CharField(
+        max_length=64,
+        primary_key=True,
+        verbose_name='Пакет результатов'
+    )
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = 'Пакет результатов тестов'
+        verbose_name_plural = 'Пакеты результатов тестов'
+
+    def __str__(self):
+        return self.id
+
+
+class UsedQuestions(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    test_type = models.ForeignKey(
+        LanguageTestType,
+        on_delete=models.CASCADE,
+        verbose_name='Тип теста'
+    )
+    # bit N is set when the user has answered the question with id offset + N,
+    # so the bitset is sized by the question ids of the test type
+    questions = models.BinaryField(default=bytes, verbose_name='Вопросы')
+    offset = models.PositiveIntegerField(default=0, verbose_name='Смещение')
+
+    objects = models.Manager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'test_type',),
+                name='%(app_label)s_%(class)s_user_test_type_constraint'
+            ),
+        )
+        verbose_name = 'Использованные вопросы'
+        verbose_name_plural = 'Использованные вопросы'
+
+    def __str__(self):
+        return f'Пользователь - "{self.user}"; Тип теста - "{self.test_type}"'
+
+
+class UserTestStats(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    test_type = models.ForeignKey(
+        LanguageTestType,
+        on_delete=models.CASCADE,
+        verbose_name='Тип теста'
+    )
+    number_attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество попыток'
+    )
+    number_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество ответов'
+    )
+    number_right_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество правильных ответов'
+    )
+    last_attempt = models.DateTimeField(
+        null=True,
+        verbose_name='Последняя попытка'
+    )
+
+    objects = models.Manager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'test_type',),
+                name='%(app_label)s_%(class)s_user_test_type_constraint'
+            ),
+        )
+        ordering = ['test_type', ]
+        verbose_name = 'Статистика пользователя'
+        verbose_name_plural = 'Статистика пользователей'
+
+    def __str__(self):
+        return f'Пользователь - "{self.user}"; Тип теста - "{self.test_type}"'
+
+    @property
+    def right_answers_percentage(self) -> int:
+        if not self.number_answers:
+            return 0
+        return round(self.number_right_answers / self.number_answers * 100)
+
+
+class QuestionStats(models.Model):
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Вопрос'
+    )
+    number_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество ответов'
+    )
+    number_right_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество правильных ответов'
+    )
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = 'Статистика вопроса'
+        verbose_name_plural = 'Статистика вопросов'
+
+    def __str__(self):
+        return f'Вопрос - "{self.question}"'
+
+    @property
+    def right_answers_percentage(self) -> int:
+        if not self.number_answers:
+            return 0
+        return round(self.number_right_answers / self.number_answers * 100)
+
+
+class AnswerStats(models.Model):
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name='answer_stats',
+        verbose_name='Вопрос'
+    )
+    answer = models.ForeignKey(
+        Answer,
+        on_delete=models.CASCADE,
+        verbose_name='Ответ'
+    )
+    number_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество ответов'
+    )
+
+    objects = models.Manager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('question', 'answer',),
+                name='%(app_label)s_%(class)s_question_answer_constraint'
+            ),
+        )
+        verbose_name = 'Статистика ответа'
+        verbose_name_plural = 'Статистика ответов'
+
+    def __str__(self):
+        return f'Вопрос - "{self.question}"; Ответ - "{self.answer}"'
+
+
+class DailyStats(models.Model):
+    date = models.DateField(verbose_name='Дата')
+    test_type = models.ForeignKey(
+        LanguageTestType,
+        on_delete=models.CASCADE,
+        verbose_name='Тип теста'
+    )
+    number_attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество попыток'
+    )
+    number_users = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество пользователей'
+    )
+    number_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество ответов'
+    )
+    number_right_answers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество правильных ответов'
+    )
+
+    objects = models.Manager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('date', 'test_type',),
+                name='%(app_label)s_%(class)s_date_test_type_constraint'
+            ),
+        )
+        ordering = ['-date', 'test_type', ]
+        verbose_name = 'Статистика за день'
+        verbose_name_plural = 'Статистика по дням'
+
+    def __str__(self):
+        return f'Дата - "{self.date}"; Тип теста - "{self.test_type}"'
+
+
+class HighWaterMark(models.Model):
+    name = models.CharField(max_length=64, primary_key=True, verbose_name='Имя')
+    # the last processed id
+    value = models.BigIntegerField(default=0, verbose_name='Значение')
+    # the max id seen by the previous run, which is processed by the next one
+    pending_value = models.BigIntegerField(
+        default=0,
+        verbose_name='Ожидающее значение'
+    )
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = 'Отметка обработки'
+        verbose_name_plural = 'Отметки обработки'
+
+    def __str__(self):
+        return self.name
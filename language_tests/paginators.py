@@ -0,0 +1,166 @@
+import json
+from typing import Optional
+
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR, PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from test_your_language.settings import ADMIN_COUNT_ESTIMATE_THRESHOLD
+
+
+KEYSET_AFTER_VAR = 'after'
+KEYSET_BEFORE_VAR = 'before'
+
+
+class EstimatedCountPaginator(Paginator):
+
+    def __init__(
+            self,
+            *args,
+            threshold: int = ADMIN_COUNT_ESTIMATE_THRESHOLD,
+            **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+
+    @cached_property
+    def count(self) -> int:
+        if not self.is_estimated:
+            return super().count
+        if not self.object_list.query.where:
+            return self.table_count
+        # the planner estimates the number of rows of a filtered query
+        sql, params = self.object_list.order_by().query.sql_with_params()
+        with connections[self.object_list.db].cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    @cached_property
+    def is_estimated(self) -> bool:
+        return self.table_count >= self.threshold
+
+    @cached_property
+    def table_count(self) -> int:
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return 0
+        table = self.object_list.model._meta.db_table
+        # a partitioned table keeps its rows in the partitions
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0) FROM pg_class '
+                'WHERE oid = %s::regclass OR oid IN ('
+                '  SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass'
+                ')',
+                [table, table]
+            )
+            return int(cursor.fetchone()[0])
+
+
+class KeysetChangeList(ChangeList):
+
+    def __init__(self, request, *args, **kwargs):
+        self.keyset = False
+        self.keyset_after = _get_id(request.GET.get(KEYSET_AFTER_VAR))
+        self.keyset_before = _get_id(request.GET.get(KEYSET_BEFORE_VAR))
+        self.keyset_first_url = None
+        self.keyset_next_url = None
+        self.keyset_previous_url = None
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(KEYSET_AFTER_VAR, None)
+        lookup_params.pop(KEYSET_BEFORE_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(
+            request,
+            self.queryset,
+            self.list_per_page
+        )
+        # the pages are fetched by the primary key only, a list sorted by a
+        # column is paginated by OFFSET
+        if not getattr(paginator, 'is_estimated', False) or ORDER_VAR in self.params:
+            return super().get_results(request)
+
+        # deep OFFSET pages scan all the previous rows, so the pages of a big
+        # table are fetched by the primary key, newest first
+        size = self.list_per_page
+        if self.keyset_before is not None:
+            ids = list(
+                self.queryset.filter(
+                    pk__gt=self.keyset_before
+                ).order_by('pk').values_list('pk', flat=True)[:size + 1]
+            )
+            has_previous = len(ids) > size
+            has_next = True
+        else:
+            queryset = self.queryset
+            if self.keyset_after is not None:
+                queryset = queryset.filter(pk__lt=self.keyset_after)
+            ids = list(
+                queryset.order_by('-pk').values_list('pk', flat=True)[:size + 1]
+            )
+            has_previous = self.keyset_after is not None
+            has_next = len(ids) > size
+        ids = sorted(ids[:size], reverse=True)
+        # a queryset is kept for the formset of list_editable
+        result_list = self.queryset.filter(pk__in=ids).order_by('-pk')
+
+        remove = [KEYSET_AFTER_VAR, KEYSET_BEFORE_VAR, PAGE_VAR]
+        if has_previous:
+            self.keyset_first_url = self.get_query_string(remove=remove)
+            if ids:
+                self.keyset_previous_url = self.get_query_string(
+                    new_params={KEYSET_BEFORE_VAR: ids[0]},
+                    remove=remove
+                )
+        if has_next and ids:
+            self.keyset_next_url = self.get_query_string(
+                new_params={KEYSET_AFTER_VAR: ids[-1]},
+                remove=remove
+            )
+
+        self.keyset = True
+        self.result_count = paginator.count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = True
+        self.full_result_count = paginator.table_count
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = True
+        self.paginator = paginator
+
+
+class EstimatedCountAdminMixin:
+    count_estimate_threshold = ADMIN_COUNT_ESTIMATE_THRESHOLD
+    paginator = EstimatedCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_paginator(
+            self,
+            request,
+            queryset,
+            per_page,
+            orphans=0,
+            allow_empty_first_page=True
+    ):
+        return self.paginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            threshold=self.count_estimate_threshold
+        )
+
+
+def _get_id(value: Optional[str]) -> Optional[int]:
+    return int(value) if value and value.isdigit() else None
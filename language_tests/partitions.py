@@ -0,0 +1,187 @@
+from datetime import date, datetime
+from typing import List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from language_tests.models import TestAttempt
+
+
+DEFAULT_PARTITION_SUFFIX = 'default'
+
+
+def is_partitioned() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass',
+            [_get_table()]
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_test_attempts() -> None:
+    table = _get_table()
+    old_table = f'{table}_unpartitioned'
+    quote_name = connection.ops.quote_name
+    partition_key = quote_name(TestAttempt._meta.get_field('solution_date').column)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {quote_name(table)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            'SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT IN ('
+            '  SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = %s'
+            ')',
+            [table, table, 'p']
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+            'WHERE conrelid = %s::regclass AND contype = %s',
+            [table, 'f']
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            'SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = %s',
+            [table, 'p']
+        )
+        primary_key = cursor.fetchone()[0]
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [table, 'id'])
+        sequence = cursor.fetchone()[0]
+
+        cursor.execute(f'ALTER TABLE {quote_name(table)} RENAME TO {quote_name(old_table)}')
+        cursor.execute(
+            f'CREATE TABLE {quote_name(table)} '
+            f'(LIKE {quote_name(old_table)} INCLUDING DEFAULTS) '
+            f'PARTITION BY RANGE ({partition_key})'
+        )
+        cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {quote_name(table)}.id')
+
+        cursor.execute(
+            f'SELECT DISTINCT date_trunc(%s, {partition_key})::date '
+            f'FROM {quote_name(old_table)}',
+            ['month']
+        )
+        for (month,) in cursor.fetchall():
+            _create_partition(cursor, month)
+        cursor.execute(
+            f'CREATE TABLE {quote_name(_get_partition_name(DEFAULT_PARTITION_SUFFIX))} '
+            f'PARTITION OF {quote_name(table)} DEFAULT'
+        )
+
+        cursor.execute(
+            f'INSERT INTO {quote_name(table)} SELECT * FROM {quote_name(old_table)}'
+        )
+        cursor.execute(f'DROP TABLE {quote_name(old_table)}')
+
+        # a primary key of a partitioned table must contain the partition key
+        cursor.execute(
+            f'ALTER TABLE {quote_name(table)} ADD CONSTRAINT {quote_name(primary_key)} '
+            f'PRIMARY KEY (id, {partition_key})'
+        )
+        for index in indexes:
+            cursor.execute(index)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE {quote_name(table)} ADD CONSTRAINT {quote_name(name)} '
+                f'{definition}'
+            )
+
+    create_partitions(0)
+
+
+def create_partitions(months_ahead: int) -> List[str]:
+    current_month = timezone.now().date().replace(day=1)
+    existing_partitions = {name for name, _ in get_partitions()}
+    result = []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for i in range(months_ahead + 1):
+            month = _add_months(current_month, i)
+            name = _get_partition_name(month.strftime('p%Y_%m'))
+            if name not in existing_partitions:
+                _create_partition(cursor, month)
+                result.append(name)
+
+    return result
+
+
+def detach_expired_partitions(retention_months: int, drop: bool = False) -> List[str]:
+    quote_name = connection.ops.quote_name
+    current_month = timezone.now().date().replace(day=1)
+    expiration_month = _add_months(current_month, -retention_months)
+    result = []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name, month in get_partitions():
+            if month >= expiration_month:
+                continue
+            cursor.execute(
+                f'ALTER TABLE {quote_name(_get_table())} '
+                f'DETACH PARTITION {quote_name(name)}'
+            )
+            if drop:
+                cursor.execute(f'DROP TABLE {quote_name(name)}')
+            result.append(name)
+
+    return result
+
+
+def get_partitions() -> List[Tuple[str, date]]:
+    prefix = _get_partition_name('p')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [_get_table()]
+        )
+        names = sorted(row[0] for row in cursor.fetchall())
+
+    return [
+        (name, datetime.strptime(name[len(prefix):], '%Y_%m').date())
+        for name in names
+        if name.startswith(prefix)
+    ]
+
+
+def _add_months(month: date, number_months: int) -> date:
+    index = month.year * 12 + month.month - 1 + number_months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partition(cursor, month: date) -> None:
+    quote_name = connection.ops.quote_name
+    table = quote_name(_get_table())
+    partition = quote_name(_get_partition_name(month.strftime('p%Y_%m')))
+    default_partition = quote_name(_get_partition_name(DEFAULT_PARTITION_SUFFIX))
+    partition_key = quote_name(TestAttempt._meta.get_field('solution_date').column)
+    bounds = [f'{month.isoformat()} 00:00:00+00', f'{_add_months(month, 1).isoformat()} 00:00:00+00']
+
+    # rows of the month may already be in the default partition, so they are
+    # moved before the new partition is attached
+    cursor.execute(f'CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS)')
+    cursor.execute(
+        'SELECT 1 FROM pg_class WHERE relname = %s',
+        [_get_partition_name(DEFAULT_PARTITION_SUFFIX)]
+    )
+    if cursor.fetchone() is not None:
+        cursor.execute(
+            f'WITH rows AS ('
+            f'  DELETE FROM {default_partition} '
+            f'  WHERE {partition_key} >= %s AND {partition_key} < %s RETURNING *'
+            f') INSERT INTO {partition} SELECT * FROM rows',
+            bounds
+        )
+    cursor.execute(
+        f'ALTER TABLE {table} ATTACH PARTITION {partition} '
+        f'FOR VALUES FROM (%s) TO (%s)',
+        bounds
+    )
+
+
+def _get_partition_name(suffix: str) -> str:
+    return f'{_get_table()}_{suffix}'
+
+
+def _get_table() -> str:
+    return TestAttempt._meta.db_table
@@ -0,0 +1,173 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from language_tests.bitsets import count_bitset, in_bitset
+from language_tests.models import (
+    Answer,
+    AnswerStats,
+    DailyStats,
+    HighWaterMark,
+    Question,
+    QuestionStats,
+    TestAttempt
+)
+
+
+QUESTION_STATS = 'question_stats'
+
+
+def update_question_stats(chunk_size: int = 10000) -> int:
+    # ids are taken from a sequence before a transaction commits, so an id
+    # becomes visible only after the bigger ones sometimes. The attempts are
+    # processed up to the max id seen by the previous run, which transactions
+    # of that time have committed by now
+    number_attempts = 0
+    while True:
+        with transaction.atomic():
+            mark, _ = HighWaterMark.objects.select_for_update().get_or_create(
+                name=QUESTION_STATS
+            )
+            attempts = list(
+                TestAttempt.objects.filter(
+                    id__gt=mark.value,
+                    id__lte=mark.pending_value
+                ).order_by(
+                    'id'
+                ).values_list(
+                    'id',
+                    'questions',
+                    'answers',
+                    'right_answers'
+                )[:chunk_size]
+            )
+            if not attempts:
+                mark.value = mark.pending_value
+                mark.pending_value = max(
+                    TestAttempt.objects.aggregate(Max('id'))['id__max'] or 0,
+                    mark.value
+                )
+                mark.save()
+                return number_attempts
+
+            question_stats = Counter()
+            right_answers = Counter()
+            answer_stats = Counter()
+            for _, questions, answers, right_answers_bitset in attempts:
+                right_answers_bitset = bytes(right_answers_bitset)
+                for index, (question_id, answer_id) in enumerate(
+                        zip(questions, answers)
+                ):
+                    question_stats[question_id] += 1
+                    if in_bitset(right_answers_bitset, index):
+                        right_answers[question_id] += 1
+                    answer_stats[(question_id, answer_id)] += 1
+
+            _add_question_stats(question_stats, right_answers)
+            _add_answer_stats(answer_stats)
+            mark.value = attempts[-1][0]
+            mark.save(update_fields=['value', ])
+            number_attempts += len(attempts)
+
+
+def update_daily_stats(start: date, end: date, chunk_size: int = 10000) -> int:
+    # the stats of a day are replaced, so a range can be recomputed any time
+    number_days = 0
+    day = start
+    while day <= end:
+        with transaction.atomic():
+            DailyStats.objects.filter(date=day).delete()
+            DailyStats.objects.bulk_create(_get_daily_stats(day, chunk_size))
+        day += timedelta(days=1)
+        number_days += 1
+    return number_days
+
+
+def _get_daily_stats(day: date, chunk_size: int) -> List[DailyStats]:
+    attempts = TestAttempt.objects.filter(
+        solution_date__gte=datetime.combine(day, time(), timezone.utc),
+        solution_date__lt=datetime.combine(
+            day + timedelta(days=1),
+            time(),
+            timezone.utc
+        ),
+        test_type__isnull=False
+    ).order_by().values_list(
+        'test_type_id',
+        'user_id',
+        'questions',
+        'right_answers'
+    )
+    result = {}
+    users = defaultdict(set)
+    for test_type_id, user_id, questions, right_answers in (
+            attempts.iterator(chunk_size)
+    ):
+        item = result.get(test_type_id)
+        if item is None:
+            item = result[test_type_id] = DailyStats(
+                date=day,
+                test_type_id=test_type_id
+            )
+        item.number_attempts += 1
+        item.number_answers += len(questions)
+        item.number_right_answers += count_bitset(bytes(right_answers))
+        users[test_type_id].add(user_id)
+
+    for test_type_id, item in result.items():
+        item.number_users = len(users[test_type_id])
+    return list(result.values())
+
+
+def _add_answer_stats(answer_stats: Dict[Tuple[int, int], int]) -> None:
+    table, questions, answers = (
+        connection.ops.quote_name(model._meta.db_table)
+        for model in (AnswerStats, Question, Answer)
+    )
+    # the stats of deleted questions and answers are skipped
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} AS stats (question_id, answer_id, number_answers) '
+            f'SELECT * FROM unnest(%s::integer[], %s::integer[], %s::integer[]) '
+            f'AS new_stats (question_id, answer_id, number_answers) '
+            f'WHERE question_id IN (SELECT id FROM {questions}) '
+            f'AND answer_id IN (SELECT id FROM {answers}) '
+            f'ON CONFLICT (question_id, answer_id) DO UPDATE '
+            f'SET number_answers = stats.number_answers + EXCLUDED.number_answers',
+            [
+                [question_id for question_id, _ in answer_stats],
+                [answer_id for _, answer_id in answer_stats],
+                list(answer_stats.values()),
+            ]
+        )
+
+
+def _add_question_stats(
+        question_stats: Dict[int, int],
+        right_answers: Dict[int, int]
+) -> None:
+    table, questions = (
+        connection.ops.quote_name(model._meta.db_table)
+        for model in (QuestionStats, Question)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} AS stats '
+            f'(question_id, number_answers, number_right_answers) '
+            f'SELECT * FROM unnest(%s::integer[], %s::integer[], %s::integer[]) '
+            f'AS new_stats (question_id, number_answers, number_right_answers) '
+            f'WHERE question_id IN (SELECT id FROM {questions}) '
+            f'ON CONFLICT (question_id) DO UPDATE '
+            f'SET number_answers = stats.number_answers + EXCLUDED.number_answers, '
+            f'number_right_answers = '
+            f'stats.number_right_answers + EXCLUDED.number_right_answers',
+            [
+                list(question_stats),
+                list(question_stats.values()),
+                [right_answers[question_id] for question_id in question_stats],
+            ]
+        )
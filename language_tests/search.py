@@ -0,0 +1,42 @@
+from django.contrib.admin.utils import lookup_needs_distinct
+from django.db.models import Q
+from django.utils.text import smart_split, unescape_string_literal
+
+
+class RelatedSearchAdminMixin:
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        # the lookups with prefixes and the many to many relations are left
+        # to the default search
+        if not search_term or not search_fields or any(
+                field[0] in '^=@' or lookup_needs_distinct(self.opts, field)
+                for field in search_fields
+        ):
+            return super().get_search_results(request, queryset, search_term)
+
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            conditions = Q()
+            for field in search_fields:
+                conditions |= _get_search_condition(queryset.model, field, bit)
+            queryset = queryset.filter(conditions)
+        return queryset, False
+
+
+def _get_search_condition(model, field_path: str, term: str) -> Q:
+    # a condition on a related table is a subquery, which is filtered by the
+    # trigram index of that table instead of filtering the joined rows
+    name, _, rest = field_path.partition('__')
+    if not rest:
+        return Q(**{f'{name}__icontains': term})
+    field = model._meta.get_field(name)
+    related_model = field.related_model
+    return Q(
+        **{
+            f'{name}__in': related_model.objects.filter(
+                _get_search_condition(related_model, rest, term)
+            ).order_by().values('pk')
+        }
+    )
@@ -1,16 +1,19 @@
-from typing import Dict, List, NamedTuple, Optional, Union
+from typing import Dict, List, Optional
 
 from django.db import transaction
-from django.db.models import QuerySet
 
-from language_tests.models import QuestionAnswer, Question, TestResult
+from language_tests.bitsets import in_offset_bitset
+from language_tests.buffers import buffer_user_answers
+from language_tests.caches import (
+    answer_key_index,
+    LanguageQuestion,
+    question_bank,
+    question_pool
+)
+from language_tests.models import UsedQuestions
+from language_tests.sessions import close_test_session, get_test_session
 from language_tests.tasks import save_user_answers
-
-
-class LanguageQuestion(NamedTuple):
-    question_id: int
-    question: List[str]
-    answers: Dict[int, str]
+from test_your_language.settings import TEST_RESULTS_BUFFER
 
 
 def generate_questions_list(
@@ -18,103 +21,87 @@ def generate_questions_list(
         user_id: Optional[int],
         number_questions: int = 10
 ) -> List[LanguageQuestion]:
-    questions = Question.objects.prefetch_related(
-        'answers'
-    ).filter(
-        test_type_id=test_type_id,
-        is_published=True
-    ).only(
-        'id',
-        'question'
-    )
+    if not user_id:
+        return _get_random_questions(test_type_id, number_questions)
 
-    prev_used_questions = TestResult.objects.values(
-        'question'
-    ).filter(
+    # the pair is unique, so the row is fetched without the sort of first()
+    used_questions = UsedQuestions.objects.filter(
         user_id=user_id,
-        question__in=questions
-    ).distinct()
+        test_type_id=test_type_id
+    ).values_list(
+        'questions',
+        'offset'
+    )
+    used_questions, offset = next(iter(used_questions), (b'', 0))
+    used_questions = bytes(used_questions)
 
-    # order_by('?') queries may be expensive and slow, depending on the database backend you’re using.
-    # https://books.agiliq.com/projects/django-orm-cookbook/en/latest/random.html
-    if not user_id:
-        return _get_questions(
-            questions.order_by('?'),
-            [],
-            number_questions
-        )
-
-    if questions.count() - prev_used_questions.count() >= number_questions:
-        return _get_questions(
-            questions,
-            prev_used_questions,
-            number_questions
-        )
+    question_ids = []
+    for question_id in question_pool.get(test_type_id):
+        if not in_offset_bitset(used_questions, offset, question_id):
+            question_ids.append(question_id)
+            if len(question_ids) == number_questions:
+                return _get_questions(test_type_id, question_ids)
 
-    return _get_questions(
-        questions.order_by('?'),
-        [],
-        number_questions
-    )
+    return _get_random_questions(test_type_id, number_questions)
 
 
 def get_right_answers(
         answers: Dict[str, str],
-        user_id: Optional[int]
+        user_id: Optional[int],
+        token: Optional[str] = None
 ) -> Dict[int, int]:
     _answers = {}
     for key, value in answers.items():
         value = int(value) if value else 0
         _answers[int(key)] = value
 
-    questions = QuestionAnswer.objects.values(
-        'question_id',
-        'answer_id',
-        'is_right_answer'
-    ).filter(
-        question_id__in=[i for i in _answers.keys()]
-    )
+    test_session = get_test_session(token, user_id)
+    if test_session is None:
+        answer_keys = answer_key_index.get(_answers.keys())
+    else:
+        answer_keys = test_session.answers
 
     result = {}
     valid_answers = []
-    for item in questions:
-        if user_id and _answers[item['question_id']] == item['answer_id']:
+    for question_id, answer_key in answer_keys.items():
+        if user_id and _answers.get(question_id) in answer_key.answer_ids:
             valid_answers.append(
                 {
                     'user_id': user_id,
-                    'question_id': item['question_id'],
-                    'answer_id': item['answer_id']
+                    'question_id': question_id,
+                    'answer_id': _answers[question_id]
                 }
             )
-        if item['is_right_answer']:
-            result[item['question_id']] = item['answer_id']
+        if answer_key.right_answer_id is not None:
+            result[question_id] = answer_key.right_answer_id
 
-    if user_id:
-        transaction.on_commit(lambda: save_user_answers.delay(valid_answers))
+    if user_id and (test_session is None or close_test_session(token)):
+        transaction.on_commit(lambda: _save_user_answers(valid_answers))
 
     return result
 
 
+def _save_user_answers(answers: List[Dict]) -> None:
+    if TEST_RESULTS_BUFFER:
+        buffer_user_answers(answers)
+    else:
+        save_user_answers.delay(answers)
+
+
 def _get_questions(
-        all_questions: QuerySet,
-        prev_used_questions: Union[List, QuerySet],
-        limit: int
+        test_type_id: int,
+        question_ids: List[int]
 ) -> List[LanguageQuestion]:
-    questions = all_questions.exclude(id__in=prev_used_questions)[:limit]
-
-    result = []
-
-    for question in questions:
-        answers = {
-            answer.pk: answer.answer
-            for answer in question.answers.all()
-        }
-        result.append(
-            LanguageQuestion(
-                question_id=question.pk,
-                question=[i for i in question.question.strip().split()],
-                answers=answers
-            )
-        )
+    return question_bank.get_questions(test_type_id, question_ids)
 
-    return result
+
+def _get_random_questions(
+        test_type_id: int,
+        limit: int
+) -> List[LanguageQuestion]:
+    # the ids are sampled in memory instead of `order_by('?')`, which sorts
+    # the whole test type on every request
+    return _get_questions(
+        test_type_id,
+        question_pool.sample(test_type_id, limit)
+    )
@@ -0,0 +1,56 @@
+import uuid
+from typing import Dict, List, NamedTuple, Optional
+
+from django.core.cache import cache
+
+from language_tests.caches import AnswerKey, LanguageQuestion
+from test_your_language.settings import TEST_SESSION_LIFETIME
+
+
+class TestSession(NamedTuple):
+    user_id: Optional[int]
+    answers: Dict[int, AnswerKey]
+
+
+def create_test_session(
+        questions: List[LanguageQuestion],
+        user_id: Optional[int]
+) -> str:
+    token = uuid.uuid4().hex
+    test_session = TestSession(
+        user_id=user_id,
+        answers={
+            question.question_id: AnswerKey(
+                right_answer_id=question.right_answer_id,
+                answer_ids=frozenset(question.answers.keys())
+            )
+            for question in questions
+        }
+    )
+    cache.set(_get_key(token), test_session, timeout=TEST_SESSION_LIFETIME)
+    return token
+
+
+def get_test_session(
+        token: Optional[str],
+        user_id: Optional[int]
+) -> Optional[TestSession]:
+    if not token:
+        return None
+    test_session = cache.get(_get_key(token))
+    if test_session is None or test_session.user_id != user_id:
+        return None
+    return test_session
+
+
+def close_test_session(token: str) -> bool:
+    # only the first submit of a session may save the user answers
+    return cache.add(
+        f'{_get_key(token)}:closed',
+        True,
+        timeout=TEST_SESSION_LIFETIME
+    )
+
+
+def _get_key(token: str) -> str:
+    return f'language_tests:test_session:{token}'
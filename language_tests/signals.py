@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from language_tests.caches import bump_bank_version, record_answer_key_change
+from language_tests.models import (
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer
+)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_save, sender=LanguageTestType)
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=QuestionAnswer)
+@receiver(post_delete, sender=Answer)
+@receiver(post_delete, sender=LanguageTestType)
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=QuestionAnswer)
+def invalidate_question_bank(**kwargs) -> None:
+    # the second bump drops the caches that other workers loaded before the commit
+    bump_bank_version()
+    transaction.on_commit(bump_bank_version)
+
+
+@receiver(post_save, sender=QuestionAnswer)
+@receiver(post_delete, sender=QuestionAnswer)
+def invalidate_answer_key(instance: QuestionAnswer, **kwargs) -> None:
+    question_id = instance.question_id
+    record_answer_key_change(question_id)
+    transaction.on_commit(lambda: record_answer_key_change(question_id))
@@ -1,17 +1,297 @@
-from typing import Dict, List
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from language_tests.models import TestResult
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import DateTimeField, F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from language_tests.bitsets import (
+    add_to_bitset,
+    add_to_offset_bitset,
+    count_bitset
+)
+from language_tests.buffers import (
+    ack_batch,
+    Batch,
+    get_buffered_batch,
+    get_spooled_batches
+)
+from language_tests.caches import answer_key_index
+from language_tests.ingestion import insert_test_attempts, TestAttemptRow
+from language_tests.leaderboards import update_leaderboards
+from language_tests.models import (
+    Question,
+    TestAttempt,
+    TestResultBatch,
+    UsedQuestions,
+    UserTestStats
+)
+from language_tests.partitions import (
+    create_partitions,
+    detach_expired_partitions,
+    is_partitioned
+)
+from language_tests.rollups import (
+    update_daily_stats as _update_daily_stats,
+    update_question_stats as _update_question_stats
+)
 from test_your_language.celery import app
+from test_your_language.settings import (
+    DAILY_STATS_DAYS,
+    LEADERBOARDS,
+    QUESTION_STATS_CHUNK_SIZE,
+    TEST_RESULTS_BATCH_RETENTION,
+    TEST_RESULTS_DROP_EXPIRED,
+    TEST_RESULTS_FLUSH_SIZE,
+    TEST_RESULTS_PARTITIONS_AHEAD,
+    TEST_RESULTS_RETENTION
+)
 
 
 @app.task
 def save_user_answers(answers: List[Dict]) -> None:
-    _answers = [
-        TestResult(
-            user_id=answer['user_id'],
-            question_id=answer['question_id'],
-            answer_id=answer['answer_id']
-        )
-        for answer in answers
-    ]
-    TestResult.objects.bulk_create(_answers)
+    with transaction.atomic():
+        _save_user_answers(answers)
+
+
+@app.task
+def flush_user_answers() -> None:
+    for batch in get_spooled_batches():
+        _save_batch(batch)
+
+    while True:
+        batch = get_buffered_batch(TEST_RESULTS_FLUSH_SIZE)
+        if batch is None:
+            break
+        _save_batch(batch)
+        if len(batch.answers) < TEST_RESULTS_FLUSH_SIZE:
+            break
+
+    # a batch is replayed only until it is acknowledged, so the ids of old
+    # batches are not needed anymore, the marks of the converted users are
+    # kept for the next runs of convert_test_results
+    TestResultBatch.objects.filter(
+        created__lt=timezone.now() - timedelta(days=TEST_RESULTS_BATCH_RETENTION)
+    ).exclude(
+        id__startswith='convert_test_results:'
+    ).delete()
+
+
+@app.task
+def manage_test_attempt_partitions() -> None:
+    if not is_partitioned():
+        return
+    create_partitions(TEST_RESULTS_PARTITIONS_AHEAD)
+    if TEST_RESULTS_RETENTION:
+        detach_expired_partitions(
+            TEST_RESULTS_RETENTION,
+            drop=TEST_RESULTS_DROP_EXPIRED
+        )
+
+
+@app.task
+def update_question_stats() -> None:
+    _update_question_stats(QUESTION_STATS_CHUNK_SIZE)
+
+
+@app.task
+def update_daily_stats(
+        start: Optional[str] = None,
+        end: Optional[str] = None
+) -> None:
+    # the previous days are recomputed for the answers buffered at midnight
+    today = timezone.now().date()
+    _update_daily_stats(
+        parse_date(start) if start else today - timedelta(days=DAILY_STATS_DAYS),
+        parse_date(end) if end else today - timedelta(days=1)
+    )
+
+
+def group_used_questions(
+        answers: Iterable[Tuple[int, int, int]]
+) -> Dict[Tuple[int, int], Set[int]]:
+    result = defaultdict(set)
+    for user_id, test_type_id, question_id in answers:
+        if test_type_id is not None:
+            result[(user_id, test_type_id)].add(question_id)
+    return result
+
+
+def update_used_questions(
+        used_questions: Dict[Tuple[int, int], Set[int]]
+) -> None:
+    # must be called inside a transaction, the rows stay locked until commit
+    for (user_id, test_type_id), question_ids in sorted(used_questions.items()):
+        item, _ = UsedQuestions.objects.select_for_update().get_or_create(
+            user_id=user_id,
+            test_type_id=test_type_id
+        )
+        item.questions, item.offset = add_to_offset_bitset(
+            item.questions,
+            item.offset,
+            question_ids
+        )
+        item.save(update_fields=['questions', 'offset', ])
+
+
+def _save_batch(batch: Batch) -> None:
+    with transaction.atomic():
+        # a replayed batch is already saved if its id is known
+        _, created = TestResultBatch.objects.get_or_create(id=batch.id)
+        if created:
+            _save_user_answers(batch.answers)
+    ack_batch(batch)
+
+
+def _save_user_answers(answers: List[Dict]) -> None:
+    # buffered answers may outlive their questions or users
+    test_types = dict(
+        Question.objects.filter(
+            id__in={answer['question_id'] for answer in answers}
+        ).order_by().values_list('id', 'test_type_id')
+    )
+    users = set(
+        User.objects.filter(
+            id__in={answer['user_id'] for answer in answers}
+        ).order_by().values_list('id', flat=True)
+    )
+    now = timezone.now()
+
+    # the answers of one attempt share the solution date
+    attempts = defaultdict(list)
+    for answer in answers:
+        if answer['question_id'] not in test_types or answer['user_id'] not in users:
+            continue
+        solution_date = (
+            parse_datetime(answer['solution_date'])
+            if 'solution_date' in answer else now
+        )
+        key = (
+            answer['user_id'],
+            test_types[answer['question_id']],
+            solution_date
+        )
+        attempts[key].append((answer['question_id'], answer['answer_id']))
+    attempts = grade_test_attempts(
+        (user_id, test_type_id, solution_date, attempt_answers)
+        for (user_id, test_type_id, solution_date), attempt_answers
+        in attempts.items()
+    )
+
+    insert_test_attempts(attempts)
+    update_used_questions(
+        group_used_questions(
+            (attempt[0], attempt[1], question_id)
+            for attempt in attempts
+            for question_id in attempt[3]
+        )
+    )
+    update_user_stats(attempts)
+    if LEADERBOARDS:
+        transaction.on_commit(lambda: update_leaderboards(attempts))
+
+
+def grade_test_attempts(
+        attempts: Iterable[
+            Tuple[int, Optional[int], datetime, List[Tuple[int, int]]]
+        ]
+) -> List[TestAttemptRow]:
+    attempts = list(attempts)
+    answer_keys = answer_key_index.get(
+        {
+            question_id
+            for *_, attempt_answers in attempts
+            for question_id, _ in attempt_answers
+        }
+    )
+    result = []
+    for user_id, test_type_id, solution_date, attempt_answers in attempts:
+        right_answers = [
+            index
+            for index, (question_id, answer_id) in enumerate(attempt_answers)
+            if question_id in answer_keys
+            and answer_keys[question_id].right_answer_id == answer_id
+        ]
+        result.append(
+            (
+                user_id,
+                test_type_id,
+                solution_date,
+                [question_id for question_id, _ in attempt_answers],
+                [answer_id for _, answer_id in attempt_answers],
+                add_to_bitset(b'', right_answers)
+            )
+        )
+    return result
+
+
+def update_user_stats(attempts: List[TestAttemptRow]) -> None:
+    stats = _group_user_stats(attempts)
+
+    # the used questions rows of these users are already locked, so the
+    # statistics rows can't be created twice
+    for (user_id, test_type_id), item in sorted(stats.items()):
+        updated = UserTestStats.objects.filter(
+            user_id=user_id,
+            test_type_id=test_type_id
+        ).update(
+            number_attempts=F('number_attempts') + item.number_attempts,
+            number_answers=F('number_answers') + item.number_answers,
+            number_right_answers=(
+                F('number_right_answers') + item.number_right_answers
+            ),
+            last_attempt=Greatest(
+                Coalesce(
+                    'last_attempt',
+                    Value(item.last_attempt, DateTimeField())
+                ),
+                Value(item.last_attempt, DateTimeField())
+            )
+        )
+        if not updated:
+            item.save()
+
+
+def rebuild_user_stats(user_ids: Iterable[int]) -> None:
+    # must be called inside a transaction
+    user_ids = list(user_ids)
+    list(UsedQuestions.objects.select_for_update().filter(user_id__in=user_ids))
+    attempts = TestAttempt.objects.filter(
+        user_id__in=user_ids
+    ).order_by().values_list(
+        'user_id',
+        'test_type_id',
+        'solution_date',
+        'questions',
+        'answers',
+        'right_answers'
+    )
+    UserTestStats.objects.filter(user_id__in=user_ids).delete()
+    UserTestStats.objects.bulk_create(
+        _group_user_stats(attempts.iterator()).values()
+    )
+
+
+def _group_user_stats(
+        attempts: Iterable[TestAttemptRow]
+) -> Dict[Tuple[int, int], UserTestStats]:
+    result = {}
+    for user_id, test_type_id, solution_date, questions, _, right_answers in attempts:
+        if test_type_id is None:
+            continue
+        item = result.get((user_id, test_type_id))
+        if item is None:
+            item = result[(user_id, test_type_id)] = UserTestStats(
+                user_id=user_id,
+                test_type_id=test_type_id,
+                last_attempt=solution_date
+            )
+        item.number_attempts += 1
+        item.number_answers += len(questions)
+        item.number_right_answers += count_bitset(bytes(right_answers))
+        item.last_attempt = max(item.last_attempt, solution_date)
+    return result
@@ -0,0 +1,167 @@
+import json
+import os
+from difflib import unified_diff
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import connection
+
+from language_tests.models import (
+    Answer,
+    Question,
+    QuestionAnswer,
+    TestAttempt,
+    TestResult,
+    UsedQuestions,
+    UserTestStats
+)
+
+
+SNAPSHOTS_DIR = os.path.join(os.path.dirname(__file__), 'snapshots')
+# the snapshots are written instead of compared, the diff is reviewed
+UPDATE_SNAPSHOTS = os.environ.get('UPDATE_QUERY_PLANS') == '1'
+# the tables which grow with the users and the question bank
+LARGE_TABLES = tuple(
+    model._meta.db_table
+    for model in (
+        Answer,
+        Question,
+        QuestionAnswer,
+        TestAttempt,
+        TestResult,
+        UsedQuestions,
+        User,
+        UserTestStats,
+    )
+)
+
+
+def capture_queries(func: Callable) -> List[Tuple[str, Tuple]]:
+    # the queries log is reset by every request of the test client
+    queries = []
+
+    def execute_wrapper(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            queries.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(execute_wrapper):
+        func()
+    return queries
+
+
+def explain(sql: str, params: Optional[Iterable] = None) -> Dict:
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def iter_nodes(plan: Dict) -> Iterator[Dict]:
+    yield plan
+    for item in plan.get('Plans', []):
+        yield from iter_nodes(item)
+
+
+def get_plan_shape(plan: Dict, depth: int = 0) -> List[str]:
+    # the costs and the estimates are left out, they change with the data
+    line = plan['Node Type']
+    if 'Index Name' in plan:
+        line += f' using {plan["Index Name"]}'
+    if 'Relation Name' in plan:
+        line += f' on {plan["Relation Name"]}'
+    result = ['  ' * depth + line]
+    for item in plan.get('Plans', []):
+        result.extend(get_plan_shape(item, depth + 1))
+    return result
+
+
+def get_tables(plan: Dict) -> List[str]:
+    return [
+        node['Relation Name'] for node in iter_nodes(plan)
+        if 'Relation Name' in node
+    ]
+
+
+class QueryPlanTestMixin:
+    # the data of a test case has to be large enough and analyzed for the
+    # planner to prefer the indexes
+
+    def assertQueryPlans(
+            self,
+            name: str,
+            func: Callable,
+            max_rows: int,
+            seq_scan_tables: Iterable[str] = (),
+            sort_tables: Iterable[str] = ()
+    ) -> None:
+        # the tables of the queries which read or sort them whole on purpose,
+        # like the loads of the caches, are allowed explicitly
+        queries = capture_queries(func)
+        self.assertTrue(queries, 'No queries were captured')
+        snapshot = []
+        for sql, params in queries:
+            plan = explain(sql, params)
+            self.assertLessEqual(
+                plan['Plan Rows'],
+                max_rows,
+                f'The query returns too many rows:\n{sql}'
+            )
+            for node in iter_nodes(plan):
+                tables = set(get_tables(node)) & set(LARGE_TABLES)
+                # the catalogs and the small tables are read whole anyway
+                if not tables:
+                    continue
+                if node['Node Type'] == 'Seq Scan':
+                    self.assertTrue(
+                        tables <= set(seq_scan_tables),
+                        f'Sequential scan on {", ".join(tables)}:\n{sql}'
+                    )
+                # a sort of a page of rows is cheap, a sort of a table isn't
+                if node['Node Type'] in ('Sort', 'Incremental Sort'):
+                    self.assertFalse(
+                        node['Plan Rows'] > max_rows
+                        and not tables <= set(sort_tables),
+                        f'Sort of {", ".join(sorted(tables))}:\n{sql}'
+                    )
+            # the plans of the small tables change with the rest of the suite
+            if set(get_tables(plan)) & set(LARGE_TABLES):
+                snapshot.append({'sql': sql, 'plan': get_plan_shape(plan)})
+        self.assertSnapshot(name, snapshot)
+
+    def assertSnapshot(self, name: str, snapshot: List[Dict]) -> None:
+        # the planners of the major versions build different plans
+        directory = os.path.join(
+            SNAPSHOTS_DIR,
+            f'postgresql-{connection.pg_version // 10000}'
+        )
+        path = os.path.join(directory, f'{name}.json')
+        text = json.dumps(snapshot, indent=2) + '\n'
+        if UPDATE_SNAPSHOTS:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(text)
+            return
+        if not os.path.exists(path):
+            self.fail(
+                f'The query plans of {name} have no snapshot in {directory}, '
+                f'review them and run the tests with UPDATE_QUERY_PLANS=1:\n'
+                f'{text}'
+            )
+        with open(path) as file:
+            expected = file.read()
+        if text != expected:
+            diff = ''.join(
+                unified_diff(
+                    expected.splitlines(keepends=True),
+                    text.splitlines(keepends=True),
+                    path,
+                    'actual'
+                )
+            )
+            self.fail(
+                f'The query plans of {name} have changed, review them and '
+                f'run the tests with UPDATE_QUERY_PLANS=1:\n{diff}'
+            )
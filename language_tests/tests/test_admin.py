@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from language_tests.forms import NEW_ANSWER_PREFIX
+from language_tests.models import Answer, DailyStats, QuestionAnswer
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class QuestionAnswerInlineTest(LanguageTestMixin, TestCase):
+    path = '/admin/language_tests/question/1/change/'
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+
+    def create_data(self, answers):
+        data = {
+            'question': 'question ___ 1',
+            'test_type': '1',
+            'is_published': 'on',
+            'questionanswer_set-TOTAL_FORMS': '4',
+            'questionanswer_set-INITIAL_FORMS': '4',
+            'questionanswer_set-MIN_NUM_FORMS': '4',
+            'questionanswer_set-MAX_NUM_FORMS': '4',
+        }
+        for i, answer in enumerate(answers):
+            data.update(
+                {
+                    f'questionanswer_set-{i}-id': str(i + 1),
+                    f'questionanswer_set-{i}-question': '1',
+                    f'questionanswer_set-{i}-answer': answer,
+                }
+            )
+        data['questionanswer_set-0-is_right_answer'] = 'on'
+        return data
+
+    def test_only_selected_answers_are_rendered(self):
+        response = self.client.get(self.path)
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertContains(response, 'admin_answer_autocomplete.js')
+        self.assertContains(response, f'data-new-option-prefix="{NEW_ANSWER_PREFIX}"')
+        for i in range(1, 5):
+            self.assertContains(
+                response,
+                f'<option value="{i}" selected>answer_{i}</option>',
+                html=True
+            )
+        self.assertNotContains(response, '>answer_5<')
+
+    def test_answer_autocomplete(self):
+        self.create_answer('answer one')
+        response = self.client.get(
+            '/admin/language_tests/answer/autocomplete/',
+            {'term': ' answer o'}
+        )
+        self.assertEqual(
+            [item['text'] for item in response.json()['results']],
+            ['answer one']
+        )
+
+    def test_answer_changelist_search(self):
+        self.create_answer('the answer one')
+        response = self.client.get(
+            '/admin/language_tests/answer/',
+            {'q': 'answer o'}
+        )
+        self.assertContains(response, 'the answer one')
+
+    def test_create_missing_answer(self):
+        response = self.client.post(
+            self.path,
+            self.create_data(
+                ['1', '2', '3', f'{NEW_ANSWER_PREFIX} new answer ']
+            )
+        )
+        self.assertEqual(response.status_code, 302)
+        answer = Answer.objects.get(answer='new answer')
+        self.assertEqual(QuestionAnswer.objects.get(pk=4).answer, answer)
+
+    def test_typed_existing_answer(self):
+        number_answers = Answer.objects.count()
+        response = self.client.post(
+            self.path,
+            self.create_data(['1', '2', '3', f'{NEW_ANSWER_PREFIX}answer_5'])
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Answer.objects.count(), number_answers)
+        self.assertEqual(QuestionAnswer.objects.get(pk=4).answer_id, 5)
+
+    def test_too_long_answer(self):
+        response = self.client.post(
+            self.path,
+            self.create_data(['1', '2', '3', NEW_ANSWER_PREFIX + 'a' * 65])
+        )
+        self.assertContains(response, f'value="{NEW_ANSWER_PREFIX}{"a" * 65}"')
+        self.assertFalse(Answer.objects.filter(answer='a' * 65).exists())
+
+    def test_invalid_form_creates_no_answer(self):
+        data = self.create_data(['1', '2', '3', f'{NEW_ANSWER_PREFIX}new answer'])
+        data['questionanswer_set-1-is_right_answer'] = 'on'
+        response = self.client.post(self.path, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Answer.objects.filter(answer='new answer').exists())
+
+    def test_duplicate_typed_answers(self):
+        response = self.client.post(
+            self.path,
+            self.create_data(
+                [
+                    '1',
+                    '2',
+                    f'{NEW_ANSWER_PREFIX}new answer',
+                    f'{NEW_ANSWER_PREFIX}new answer',
+                ]
+            )
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Answer.objects.filter(answer='new answer').exists())
+
+
+class DailyStatsAdminTest(LanguageTestMixin, TestCase):
+    path = '/admin/language_tests/dailystats/'
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        for test_type_id in (1, 2):
+            DailyStats.objects.create(
+                date=timezone.now().date() - timedelta(days=1),
+                test_type_id=test_type_id,
+                number_attempts=11,
+                number_users=7
+            )
+
+    def test_users_of_all_test_types_are_not_summed(self):
+        response = self.client.get(self.path)
+        self.assertContains(response, '<td>22</td>', html=True)
+        self.assertNotContains(response, '<th>Пользователи</th>', html=True)
+        self.assertNotContains(response, '<td>14</td>', html=True)
+
+    def test_users_of_test_type(self):
+        response = self.client.get(self.path, {'test_type': '1'})
+        self.assertContains(response, '<td>11</td>', html=True)
+        self.assertContains(response, '<th>Пользователи</th>', html=True)
+        self.assertContains(response, '<td>7</td>', html=True)
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from benchmarks.suite import (
+    METRICS,
+    Regression,
+    Scenario,
+    compare,
+    get_scenarios,
+    run_suite
+)
+from language_tests.models import LanguageTestType
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class BenchmarkSuiteTest(LanguageTestMixin, TestCase):
+
+    @staticmethod
+    def get_results(**metrics):
+        return {
+            'results': [
+                {
+                    'scenario': 'bank=1',
+                    'case': 'case',
+                    'time_ms': 10.0,
+                    'queries': 2,
+                    'rows_read': 100,
+                    'peak_memory_kb': None,
+                    **metrics,
+                },
+            ],
+        }
+
+    def test_run_suite(self):
+        results = run_suite([Scenario(20, 3, 2)], repeats=1, log=lambda _: None)
+        self.assertEqual(results['meta']['database'], 'postgresql')
+        self.assertEqual(len(results['results']), 5)
+        for item in results['results']:
+            self.assertEqual(item['scenario'], 'bank=20,users=3,history=2')
+            for metric in METRICS:
+                self.assertIsNotNone(item[metric])
+        queries = {item['case']: item['queries'] for item in results['results']}
+        self.assertEqual(queries['_get_questions'], 0)
+        self.assertGreater(queries['language_test_view'], 0)
+        # the data of the scenarios is rolled back
+        self.assertFalse(
+            LanguageTestType.objects.filter(name__startswith='benchmark ').exists()
+        )
+
+    def test_get_scenarios(self):
+        scenarios = get_scenarios({'bank_size': (100, 1000), 'history': (0, 10)})
+        self.assertEqual(
+            [i.name for i in scenarios],
+            [
+                'bank=100,users=100,history=10',
+                'bank=1000,users=100,history=10',
+                'bank=1000,users=100,history=0',
+            ]
+        )
+
+    def test_compare(self):
+        old = self.get_results()
+        self.assertEqual(
+            compare(old, self.get_results(time_ms=11.9, rows_read=90), 0.2),
+            []
+        )
+        self.assertEqual(
+            compare(
+                old,
+                self.get_results(time_ms=12.1, queries=3, peak_memory_kb=1),
+                0.2
+            ),
+            [
+                Regression('bank=1', 'case', 'time_ms', 10.0, 12.1),
+                Regression('bank=1', 'case', 'queries', 2, 3),
+            ]
+        )
+
+    def test_compare_command(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = []
+        for i, results in enumerate(
+                (self.get_results(), self.get_results(queries=4))
+        ):
+            paths.append(os.path.join(directory.name, f'{i}.json'))
+            with open(paths[-1], 'w') as file:
+                json.dump(results, file)
+
+        stdout = StringIO()
+        call_command('benchmark', compare=paths[:1] * 2, stdout=stdout)
+        self.assertIn('No regressions.', stdout.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('benchmark', compare=paths, stdout=stdout)
+        self.assertIn('bank=1 case queries: 2 -> 4', stdout.getvalue())
@@ -0,0 +1,170 @@
+from django.test import TestCase
+
+from language_tests.caches import (
+    answer_key_index,
+    get_bank_version,
+    question_bank,
+    question_pool,
+    reset_answer_keys
+)
+from language_tests.models import (
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer
+)
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class QuestionPoolTest(LanguageTestMixin, TestCase):
+
+    @staticmethod
+    def get_published_questions(test_type_id: int) -> set:
+        return set(
+            Question.objects.filter(
+                test_type_id=test_type_id,
+                is_published=True
+            ).values_list('id', flat=True)
+        )
+
+    def test_pool(self):
+        for test_type_id in range(1, self.number_all_test_types + 1):
+            self.assertEqual(
+                set(question_pool.get(test_type_id)),
+                self.get_published_questions(test_type_id)
+            )
+
+    def test_pool_of_unknown_test_type(self):
+        self.assertEqual(len(question_pool.get(self.number_all_test_types + 1)), 0)
+        self.assertEqual(question_pool.sample(self.number_all_test_types + 1, 10), [])
+
+    def test_sample(self):
+        pool = set(question_pool.get(1))
+        for _ in range(10):
+            question_ids = question_pool.sample(1, self.default_number_test_questions)
+            self.assertEqual(len(question_ids), self.default_number_test_questions)
+            self.assertEqual(len(set(question_ids)), len(question_ids))
+            self.assertTrue(set(question_ids) <= pool)
+
+    def test_sample_larger_than_pool(self):
+        question_ids = question_pool.sample(1, self.default_number_questions * 2)
+        self.assertEqual(set(question_ids), self.get_published_questions(1))
+
+    def test_pool_after_is_published_change(self):
+        question = Question.objects.get(id=1)
+        self.assertIn(question.pk, question_pool.get(1))
+        question.is_published = False
+        question.save()
+        self.assertNotIn(question.pk, question_pool.get(1))
+
+    def test_pool_after_test_type_change(self):
+        question = Question.objects.get(id=1)
+        self.assertNotIn(question.pk, question_pool.get(2))
+        question.test_type_id = 2
+        question.save()
+        self.assertNotIn(question.pk, question_pool.get(1))
+        self.assertIn(question.pk, question_pool.get(2))
+
+    def test_pool_after_question_deletion(self):
+        question = Question.objects.get(id=1)
+        question.delete()
+        self.assertNotIn(1, question_pool.get(1))
+
+
+class QuestionBankTest(LanguageTestMixin, TestCase):
+
+    def test_bank(self):
+        questions = question_bank.get(1)
+        published_questions = Question.objects.prefetch_related(
+            'answers'
+        ).filter(
+            test_type_id=1,
+            is_published=True
+        )
+        self.assertEqual(len(questions), len(published_questions))
+        for question in published_questions:
+            language_question = questions[question.pk]
+            self.assertEqual(language_question.question_id, question.pk)
+            self.assertEqual(
+                language_question.question,
+                question.question.strip().split()
+            )
+            self.assertEqual(
+                list(language_question.answers.items()),
+                [(answer.pk, answer.answer) for answer in question.answers.all()]
+            )
+
+    def test_get_questions(self):
+        questions = question_bank.get_questions(1, [3, 1, 2, 21])
+        self.assertEqual([i.question_id for i in questions], [3, 1, 2])
+
+    def test_get_questions_without_queries(self):
+        question_bank.get_questions(1, [1])
+        with self.assertNumQueries(0):
+            question_bank.get_questions(1, [1, 2])
+
+    def test_bank_after_answer_change(self):
+        answer = Answer.objects.get(id=1)
+        answer.answer = 'answer_new'
+        answer.save()
+        question = question_bank.get_questions(1, [1])[0]
+        self.assertEqual(question.answers[1], 'answer_new')
+
+    def test_bank_after_question_answer_change(self):
+        question_answer = QuestionAnswer.objects.filter(question_id=1).first()
+        question_answer.delete()
+        question = question_bank.get_questions(1, [1])[0]
+        self.assertNotIn(question_answer.answer_id, question.answers)
+
+    def test_bank_version_after_test_type_change(self):
+        version = get_bank_version()
+        test_type = LanguageTestType.objects.get(id=1)
+        test_type.is_published = False
+        test_type.save()
+        self.assertNotEqual(get_bank_version(), version)
+
+
+class AnswerKeyIndexTest(LanguageTestMixin, TestCase):
+
+    def test_index(self):
+        answer_keys = answer_key_index.get(range(1, self.number_questions + 1))
+        self.assertEqual(len(answer_keys), self.number_questions)
+        for question_answer in QuestionAnswer.objects.all():
+            answer_key = answer_keys[question_answer.question_id]
+            self.assertIn(question_answer.answer_id, answer_key.answer_ids)
+            self.assertEqual(
+                answer_key.right_answer_id == question_answer.answer_id,
+                question_answer.is_right_answer
+            )
+
+    def test_unknown_question(self):
+        self.assertEqual(answer_key_index.get([self.number_questions + 1]), {})
+
+    def test_index_without_queries(self):
+        answer_key_index.get([1])
+        with self.assertNumQueries(0):
+            answer_key_index.get([1, 2])
+
+    def test_incremental_refresh(self):
+        answer_key_index.get([1])
+        QuestionAnswer.objects.filter(question_id=1).update(is_right_answer=False)
+        question_answer = QuestionAnswer.objects.filter(question_id=1).last()
+        question_answer.is_right_answer = True
+        with self.assertNumQueries(1):
+            question_answer.save()
+        with self.assertNumQueries(1):
+            answer_key = answer_key_index.get([1])[1]
+        self.assertEqual(answer_key.right_answer_id, question_answer.answer_id)
+
+    def test_refresh_after_deletion(self):
+        answer_key_index.get([1])
+        QuestionAnswer.objects.get(question_id=1, answer_id=1).delete()
+        self.assertNotIn(1, answer_key_index.get([1])[1].answer_ids)
+        Question.objects.get(id=1).delete()
+        self.assertEqual(answer_key_index.get([1]), {})
+
+    def test_reset_answer_keys(self):
+        answer_key_index.get([1])
+        QuestionAnswer.objects.filter(question_id=1).delete()
+        reset_answer_keys()
+        self.assertEqual(answer_key_index.get([1]), {})
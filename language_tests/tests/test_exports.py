@@ -0,0 +1,118 @@
+import csv
+import json
+from datetime import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from pytz import utc
+
+from language_tests.exports import EXPORT_FIELDS, export_test_attempts
+from language_tests.ingestion import insert_test_attempts
+from language_tests.models import TestAttempt
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class ExportTestAttemptsTest(LanguageTestMixin, TestCase):
+    path = '/tests/export/'
+
+    def setUp(self):
+        super().setUp()
+        insert_test_attempts(
+            [
+                (1, 1, datetime(2021, 2, 1, 12, tzinfo=utc), [1, 2], [1, 6], b'\x01'),
+                (2, 2, datetime(2021, 2, 2, 12, tzinfo=utc), [21], [81], b'\x01'),
+                (1, None, datetime(2021, 2, 3, 12, tzinfo=utc), [3], [9], b''),
+            ]
+        )
+        self.staff = User.objects.create_user(
+            'staff',
+            password='password',
+            is_staff=True
+        )
+        self.staff.user_permissions.add(
+            *self.staff.user_permissions.model.objects.filter(
+                codename='view_testattempt'
+            )
+        )
+        self.client.login(username='staff', password='password')
+
+    @staticmethod
+    def read(response):
+        return ''.join(i.decode() for i in response.streaming_content)
+
+    def test_export_csv(self):
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('test_attempts.csv', response['Content-Disposition'])
+        rows = list(csv.reader(StringIO(self.read(response))))
+        self.assertEqual(rows[0], list(EXPORT_FIELDS))
+        self.assertEqual(len(rows), 5)
+        attempt_id = TestAttempt.objects.order_by('id').first().pk
+        self.assertEqual(
+            rows[1],
+            [
+                str(attempt_id),
+                'test_user_1',
+                'test_type_1',
+                '2021-02-01T12:00:00+00:00',
+                'question ___ 1',
+                'answer_1',
+                'True',
+            ]
+        )
+        self.assertEqual(rows[2][4:], ['question ___ 2', 'answer_6', 'False'])
+        self.assertEqual(rows[4][2], '')
+
+    def test_export_jsonl_with_filters(self):
+        response = self.client.get(
+            self.path,
+            {'format': 'jsonl', 'test_type': 2, 'start': '2021-02-02'}
+        )
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(i) for i in self.read(response).splitlines()]
+        self.assertEqual(
+            [(i['username'], i['question'], i['is_right_answer']) for i in rows],
+            [('test_user_2', 'question ___ 21', True)]
+        )
+
+        response = self.client.get(
+            self.path,
+            {'format': 'jsonl', 'start': '2021-02-01', 'end': '2021-02-02'}
+        )
+        self.assertEqual(len(self.read(response).splitlines()), 3)
+
+    def test_invalid_filters(self):
+        response = self.client.get(
+            self.path,
+            {'start': '2021-02-02', 'end': '2021-02-01'}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.path, {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_staff_only(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.path).status_code, 302)
+        self.client.login(
+            username='test_user_1',
+            password=self.default_test_users_password
+        )
+        self.assertEqual(self.client.get(self.path).status_code, 403)
+
+    def test_admin_action(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        attempt_id = TestAttempt.objects.filter(user_id=2).get().pk
+        response = self.client.post(
+            '/admin/language_tests/testattempt/',
+            {'action': 'export_jsonl', '_selected_action': [attempt_id]}
+        )
+        rows = [json.loads(i) for i in self.read(response).splitlines()]
+        self.assertEqual([i['attempt_id'] for i in rows], [attempt_id])
+
+    def test_chunks(self):
+        lines = list(export_test_attempts(TestAttempt.objects.all(), 'csv', 1))
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[1].count('\n'), 2)
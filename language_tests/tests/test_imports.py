@@ -0,0 +1,130 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from language_tests.imports import RowError, import_questions, read_csv, read_jsonl
+from language_tests.models import Answer, Question, QuestionAnswer
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class ImportQuestionsTest(LanguageTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def assertQuestion(self, question: str, answers, right_answer: str):
+        question = Question.objects.get(question=question)
+        question_answers = QuestionAnswer.objects.filter(
+            question=question
+        ).select_related('answer').order_by('answer__answer')
+        self.assertEqual(
+            [(i.answer.answer, i.is_right_answer) for i in question_answers],
+            [(answer, answer == right_answer) for answer in sorted(answers)]
+        )
+
+    def test_import_csv(self):
+        path = self.write(
+            'questions.csv',
+            'question,test_type,answer_1,answer_2,answer_3,answer_4,right_answer\n'
+            'imported ___ 1,test_type_1,answer_1,new a,new b,new c,new a\n'
+            '"imported ___ 2, comma",test_type_2,new a,new b,new c,new d,new d\n'
+        )
+        stdout = StringIO()
+        call_command('import_questions', path, chunk_size=1, stdout=stdout)
+        self.assertIn('Imported 2 questions.', stdout.getvalue())
+        self.assertQuestion(
+            'imported ___ 1',
+            ['answer_1', 'new a', 'new b', 'new c'],
+            'new a'
+        )
+        self.assertQuestion(
+            'imported ___ 2, comma',
+            ['new a', 'new b', 'new c', 'new d'],
+            'new d'
+        )
+        self.assertEqual(Answer.objects.count(), self.number_answers + 4)
+
+    def test_import_jsonl(self):
+        rows = [
+            {
+                'question': 'imported ___ 1',
+                'test_type': 'test_type_1',
+                'answers': ['a', 'b', 'c', 'd'],
+                'right_answer': 'b',
+                'is_published': False,
+            },
+        ]
+        path = self.write(
+            'questions.txt',
+            '\n'.join(json.dumps(row) for row in rows) + '\n'
+        )
+        call_command(
+            'import_questions',
+            path,
+            format='jsonl',
+            stdout=StringIO()
+        )
+        self.assertQuestion('imported ___ 1', ['a', 'b', 'c', 'd'], 'b')
+        self.assertFalse(
+            Question.objects.get(question='imported ___ 1').is_published
+        )
+
+    def test_error_report(self):
+        path = self.write(
+            'questions.jsonl',
+            '\n'.join(
+                [
+                    '{"question": "valid ___ question", "test_type": "test_type_1", '
+                    '"answers": ["a", "b", "c", "d"], "right_answer": "a"}',
+                    '{"question": "valid ___ question", "test_type": "test_type_1", '
+                    '"answers": ["a", "b", "c", "d"], "right_answer": "a"}',
+                    '{"question": "question ___ 1", "test_type": "test_type_1", '
+                    '"answers": ["a", "b", "c", "d"], "right_answer": "a"}',
+                    '{"question": "no separator", "test_type": "unknown", '
+                    '"answers": ["a", "a", "c", "d"], "right_answer": "e"}',
+                    '{"question": "valid ___ 2", "answers": []}',
+                    '{"question"',
+                ]
+            )
+        )
+        report = os.path.join(self.directory.name, 'report.csv')
+        stdout = StringIO()
+        call_command('import_questions', path, report=report, stdout=stdout)
+        self.assertIn('Skipped 5 rows with errors.', stdout.getvalue())
+        self.assertIn('Imported 1 questions.', stdout.getvalue())
+
+        with open(report, newline='') as file:
+            errors = list(csv.reader(file))
+        self.assertEqual(errors[0], ['line', 'error'])
+        self.assertEqual([line for line, _ in errors[1:]], ['2', '4', '5', '6', '3'])
+        self.assertIn('повторяется', errors[1][1])
+        for message in ('разделитель', 'Тип теста', 'не должны повторяться',
+                        'Правильный ответ'):
+            self.assertIn(message, errors[2][1])
+        self.assertIn('test_type', errors[3][1])
+        self.assertEqual(errors[4][1], 'Некорректный JSON.')
+        self.assertEqual(errors[5][1], 'Такой вопрос уже существует.')
+
+    def test_readers(self):
+        self.assertEqual(
+            list(read_csv(StringIO('question,test_type\nq,t\n'))),
+            [RowError(2, 'Отсутствует поле «right_answer».')]
+        )
+        self.assertEqual(
+            list(read_jsonl(StringIO('\n[]\n'))),
+            [RowError(2, 'Строка должна быть объектом JSON.')]
+        )
+        self.assertEqual(import_questions([], lambda error: None), 0)
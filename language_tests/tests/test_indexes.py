@@ -0,0 +1,138 @@
+from io import StringIO
+from typing import List
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from language_tests.caches import answer_key_index
+from language_tests.load_data import generate_load_data
+from language_tests.models import Answer, Question, QuestionAnswer, TestResult
+from language_tests.tests.query_plans import explain, iter_nodes
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class CreateIndexesTest(LanguageTestMixin, TransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        call_command('create_indexes', stdout=StringIO())
+        # the fixtures are too small for the planner to prefer an index, so
+        # the tables are filled up to the sizes where a lost index shows
+        generate_load_data(
+            prefix='index',
+            number_test_types=5000,
+            number_questions=1,
+            number_answers=5000,
+            number_users=10,
+            number_attempts=0
+        )
+        user_ids = list(
+            User.objects.filter(
+                username__startswith='index_user_'
+            ).values_list('id', flat=True)
+        )
+        question_ids = list(
+            Question.objects.filter(
+                question__startswith='index '
+            ).values_list('id', flat=True)[:1000]
+        )
+        self.user_id = user_ids[0]
+        self.question_ids = question_ids[:2]
+        answer_id = Answer.objects.values_list('id', flat=True).first()
+        TestResult.objects.bulk_create(
+            TestResult(
+                user_id=user_id,
+                question_id=question_id,
+                answer_id=answer_id
+            )
+            for user_id in user_ids
+            for question_id in question_ids
+        )
+        with connection.cursor() as cursor:
+            # the visibility map is filled by autovacuum in production
+            cursor.execute('VACUUM ANALYZE')
+
+    @staticmethod
+    def explain(sql: str) -> List[str]:
+        return [
+            node['Index Name'] for node in iter_nodes(explain(sql))
+            if 'Index Name' in node
+        ]
+
+    def test_answer_keys_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            answer_key_index._load({1, 2, 3})
+        self.assertEqual(
+            self.explain(queries[0]['sql']),
+            ['language_tests_questionanswer_question_covering_idx']
+        )
+
+    def test_user_test_results_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(
+                TestResult.objects.filter(
+                    user_id=self.user_id,
+                    question_id__in=self.question_ids
+                )
+            )
+        self.assertEqual(
+            self.explain(queries[0]['sql']),
+            ['language_tests_testresult_user_question_idx']
+        )
+
+    def test_answer_prefix_search_query(self):
+        # the prefix search is used by the autocomplete of the question editor
+        queryset, _ = admin.site._registry[Answer].get_search_results(
+            RequestFactory().get('/admin/language_tests/answer/autocomplete/'),
+            Answer.objects.all(),
+            'answer_1'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            list(queryset)
+        self.assertEqual(
+            self.explain(queries[0]['sql']),
+            ['language_tests_answer_answer_prefix_idx']
+        )
+
+    @staticmethod
+    def has_extension(name: str) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_extension WHERE extname = %s', [name])
+            return cursor.fetchone() is not None
+
+    def search(self, model, term: str) -> List[str]:
+        if not self.has_extension('pg_trgm'):
+            self.skipTest('pg_trgm is not available')
+        model_admin = admin.site._registry[model]
+        queryset, _ = model_admin.get_search_results(
+            RequestFactory().get('/'),
+            model.objects.all(),
+            term
+        )
+        with CaptureQueriesContext(connection) as queries:
+            list(queryset)
+        return sorted(set(self.explain(queries[0]['sql'])))
+
+    def test_question_search_query(self):
+        # the generated questions end with the word, so only the questions of
+        # the fixtures match the phrase
+        self.assertEqual(
+            self.search(Question, '"question ___ 1"'),
+            [
+                'language_tests_languagetesttype_name_trgm_idx',
+                'language_tests_question_question_trgm_idx',
+            ]
+        )
+
+    def test_question_answer_search_query(self):
+        self.assertEqual(
+            self.search(QuestionAnswer, 'answer_1'),
+            [
+                'language_tests_answer_answer_trgm_idx',
+                'language_tests_question_question_trgm_idx',
+            ]
+        )
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from django.test import TestCase
+from pytz import utc
+
+from language_tests.ingestion import _create_test_attempts, insert_test_attempts
+from language_tests.models import TestAttempt
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class InsertTestAttemptsTest(LanguageTestMixin, TestCase):
+    solution_date = datetime(2021, 2, 1, 12, tzinfo=utc)
+
+    def get_rows(self):
+        return [
+            (2, 1, self.solution_date, [1, 2, 3], [1, 2, 1], b'\x05'),
+            (2, None, self.solution_date, [4], [1], b''),
+        ]
+
+    def assertTestAttempts(self, rows):
+        test_attempts = TestAttempt.objects.filter(user_id=2).order_by('id')
+        self.assertEqual(
+            [
+                (
+                    i.user_id,
+                    i.test_type_id,
+                    i.solution_date,
+                    i.questions,
+                    i.answers,
+                    bytes(i.right_answers)
+                )
+                for i in test_attempts
+            ],
+            rows
+        )
+
+    def test_insert_test_attempts(self):
+        rows = self.get_rows()
+        self.assertEqual(insert_test_attempts(iter(rows), chunk_size=1), 2)
+        self.assertTestAttempts(rows)
+
+    def test_bulk_create_fallback(self):
+        rows = self.get_rows()
+        _create_test_attempts(rows)
+        self.assertTestAttempts(rows)
@@ -0,0 +1,151 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import fakeredis
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from language_tests import leaderboards
+from language_tests.leaderboards import (
+    Leaderboard,
+    LeaderboardEntry,
+    update_leaderboards,
+    WEEK
+)
+from language_tests.tasks import save_user_answers
+from language_tests.tests.utils import LanguageTestMixin
+from language_tests.views import LeaderboardView
+
+class LeaderboardTestMixin(LanguageTestMixin):
+
+    def setUp(self):
+        super().setUp()
+        patch = mock.patch.object(leaderboards, '_client', fakeredis.FakeRedis())
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    @staticmethod
+    def get_attempt(user_id: int, right_answers: bytes, days: int = 0):
+        solution_date = timezone.now() - timedelta(days=days)
+        return user_id, 1, solution_date, [1, 2, 3], [1, 1, 1], right_answers
+
+
+class LeaderboardTest(LeaderboardTestMixin, TestCase):
+
+    def test_update_leaderboards(self):
+        update_leaderboards(
+            [
+                self.get_attempt(1, b'\x01'),
+                self.get_attempt(2, b'\x07', days=10),
+                self.get_attempt(3, b'\x03'),
+                (4, None, timezone.now(), [1], [1], b'\x01'),
+            ]
+        )
+        leaderboard = Leaderboard(1)
+        self.assertEqual(leaderboard.count(), 3)
+        self.assertEqual(
+            leaderboard[0:2],
+            [LeaderboardEntry(1, 2, 3), LeaderboardEntry(2, 3, 2)]
+        )
+        self.assertEqual(leaderboard.get_entry(1), LeaderboardEntry(3, 1, 1))
+        self.assertIsNone(leaderboard.get_entry(4))
+
+        leaderboard = Leaderboard(1, WEEK)
+        self.assertEqual(
+            leaderboard[0:10],
+            [LeaderboardEntry(1, 3, 2), LeaderboardEntry(2, 1, 1)]
+        )
+        self.assertIsNone(leaderboard.get_entry(2))
+
+    def test_rebuild_leaderboards(self):
+        save_user_answers(
+            [
+                {'user_id': 1, 'question_id': 11, 'answer_id': 1},
+                {'user_id': 1, 'question_id': 12, 'answer_id': 1},
+                {'user_id': 2, 'question_id': 13, 'answer_id': 1},
+            ]
+        )
+        leaderboards._client.zadd('language_tests:leaderboard:9:all', {'1': 1})
+        call_command('rebuild_leaderboards', chunk_size=1, stdout=StringIO())
+
+        self.assertEqual(
+            Leaderboard(1)[0:10],
+            [LeaderboardEntry(1, 1, 2), LeaderboardEntry(2, 2, 1)]
+        )
+        self.assertEqual(
+            Leaderboard(1, WEEK)[0:10],
+            [LeaderboardEntry(1, 1, 2), LeaderboardEntry(2, 2, 1)]
+        )
+        self.assertEqual(Leaderboard(9).count(), 0)
+
+    def test_save_user_answers_updates_leaderboards(self):
+        with mock.patch('language_tests.tasks.LEADERBOARDS', True):
+            with mock.patch('language_tests.tasks.transaction.on_commit') as on_commit:
+                save_user_answers(
+                    [{'user_id': 1, 'question_id': 11, 'answer_id': 1}]
+                )
+        on_commit.call_args[0][0]()
+        self.assertEqual(Leaderboard(1).get_entry(1), LeaderboardEntry(1, 1, 1))
+
+
+class LeaderboardViewTest(LeaderboardTestMixin, TestCase):
+    path_name = 'leaderboard'
+
+    def setUp(self):
+        super().setUp()
+        patch = mock.patch('language_tests.views.LEADERBOARDS', True)
+        patch.start()
+        self.addCleanup(patch.stop)
+        update_leaderboards(
+            [self.get_attempt(1, b'\x01'), self.get_attempt(2, b'\x03')]
+        )
+
+    def test_view_url_exists_at_desired_location(self):
+        response = self.client.get('/tests/1/leaderboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(
+            response,
+            f'{self.app_name}/leaderboard.html'
+        )
+
+    def test_HTTP404_if_leaderboards_are_disabled(self):
+        with mock.patch('language_tests.views.LEADERBOARDS', False):
+            response = self.client.get(reverse(self.path_name, kwargs={'pk': 1}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_leaderboard(self):
+        self.client.login(
+            username='test_user_1',
+            password=self.default_test_users_password
+        )
+        response = self.client.get(
+            reverse(self.path_name, kwargs={'pk': 1}),
+            {'period': WEEK}
+        )
+        self.assertEqual(response.context_data['period'], WEEK)
+        self.assertEqual(
+            response.context_data['entries'],
+            [
+                (LeaderboardEntry(1, 2, 2), 'test_user_2'),
+                (LeaderboardEntry(2, 1, 1), 'test_user_1'),
+            ]
+        )
+        self.assertEqual(
+            response.context_data['user_entry'],
+            LeaderboardEntry(2, 1, 1)
+        )
+
+    def test_pagination(self):
+        with mock.patch.object(LeaderboardView, 'paginate_by', 1):
+            response = self.client.get(
+                reverse(self.path_name, kwargs={'pk': 1}),
+                {'page': 2}
+            )
+        self.assertEqual(
+            response.context_data['entries'],
+            [(LeaderboardEntry(2, 1, 1), 'test_user_1')]
+        )
+        self.assertNotIn('user_entry', response.context_data)
@@ -0,0 +1,151 @@
+import random
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+from django.test import TestCase
+from pytz import utc
+
+from language_tests.bitsets import count_bitset
+from language_tests.caches import answer_key_index
+from language_tests.load_data import LoadData, generate_test_attempts
+from language_tests.models import (
+    LanguageTestType,
+    Question,
+    QuestionAnswer,
+    TestAttempt,
+    UsedQuestions,
+    UserTestStats
+)
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class GenerateLoadDataTest(LanguageTestMixin, TestCase):
+    solution_date = datetime(2021, 2, 1, tzinfo=utc)
+    span = timedelta(days=30)
+
+    def generate(self, **options):
+        stdout = StringIO()
+        call_command(
+            'generate_load_data',
+            **{
+                'test_types': 3,
+                'questions': 20,
+                'answers': 30,
+                'users': 15,
+                'attempts': 200,
+                'test_questions': 5,
+                'chunk_size': 7,
+                **options,
+            },
+            stdout=stdout
+        )
+        return stdout.getvalue()
+
+    def test_generate_load_data(self):
+        self.assertIn('Generated 200 test attempts.', self.generate())
+        test_types = LanguageTestType.objects.filter(name__startswith='load ')
+        self.assertEqual(len(test_types), 3)
+        questions = Question.objects.filter(test_type__in=test_types)
+        self.assertEqual(len(questions), 60)
+        for question in questions:
+            question.full_clean()
+        self.assertEqual(
+            QuestionAnswer.objects.filter(question__in=questions).count(),
+            240
+        )
+        self.assertEqual(
+            QuestionAnswer.objects.filter(
+                question__in=questions,
+                is_right_answer=True
+            ).count(),
+            60
+        )
+
+        attempts = list(
+            TestAttempt.objects.filter(test_type__in=test_types).order_by('id')
+        )
+        self.assertEqual(len(attempts), 200)
+        self.assertEqual(
+            [i.pk for i in attempts],
+            [i.pk for i in sorted(attempts, key=lambda i: i.solution_date)]
+        )
+        # the generated grades agree with the answer keys
+        attempt = attempts[0]
+        answer_keys = answer_key_index.get(set(attempt.questions))
+        self.assertEqual(
+            sum(
+                answer_keys[question_id].right_answer_id == answer_id
+                for question_id, answer_id in zip(
+                    attempt.questions,
+                    attempt.answers
+                )
+            ),
+            attempt.number_right_answers
+        )
+
+        stats = UserTestStats.objects.filter(test_type__in=test_types).aggregate(
+            number_attempts=Sum('number_attempts'),
+            number_right_answers=Sum('number_right_answers')
+        )
+        self.assertEqual(stats['number_attempts'], 200)
+        self.assertEqual(
+            stats['number_right_answers'],
+            sum(count_bitset(bytes(i.right_answers)) for i in attempts)
+        )
+        self.assertTrue(
+            UsedQuestions.objects.filter(test_type__in=test_types).exists()
+        )
+
+        self.assertTrue(
+            self.client.login(username='load_user_0', password='load')
+        )
+
+    def test_existing_prefix(self):
+        self.generate()
+        with self.assertRaises(CommandError):
+            self.generate()
+        with self.assertRaises(CommandError):
+            self.generate(prefix='load__')
+
+    def test_invalid_numbers(self):
+        for options in (
+                {'answers': 3},
+                {'users': 0},
+                {'test_types': 0},
+                {'questions': 0},
+                {'test_questions': 0},
+                {'attempts': -1},
+        ):
+            with self.subTest(**options):
+                with self.assertRaises(CommandError):
+                    self.generate(**options)
+        self.assertFalse(
+            LanguageTestType.objects.filter(name__startswith='load ').exists()
+        )
+
+    def test_deterministic_attempts(self):
+        data = LoadData(
+            test_type_ids=[1, 2],
+            questions={
+                1: [(i, [1, 2, 3, 4]) for i in range(1, 21)],
+                2: [(i, [5, 6, 7, 8]) for i in range(21, 41)],
+            },
+            user_ids=[1, 2]
+        )
+        attempts = [
+            list(
+                generate_test_attempts(
+                    random.Random(1),
+                    data,
+                    50,
+                    10,
+                    self.solution_date,
+                    self.solution_date + self.span
+                )
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual(attempts[0], attempts[1])
+        self.assertEqual(len({len(i[3]) for i in attempts[0]}), 1)
@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from benchmarks.load_test import Config, Stats, run
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class StatsTest(SimpleTestCase):
+
+    def test_summary(self):
+        stats = Stats()
+        for i in range(1, 101):
+            stats.record('language_tests', i / 1000, ok=(i != 100))
+        other = Stats()
+        other.record('login', 0.5, ok=True)
+        stats.merge(other)
+        summary = stats.summary(duration=10)
+
+        item = summary['endpoints']['language_tests']
+        self.assertEqual(item['requests'], 100)
+        self.assertEqual(item['errors'], 1)
+        self.assertEqual(item['error_rate'], 0.01)
+        self.assertEqual(item['throughput'], 10)
+        self.assertEqual(item['p50_ms'], 50)
+        self.assertEqual(item['p95_ms'], 95)
+        self.assertEqual(item['p99_ms'], 99)
+        self.assertEqual(summary['total']['requests'], 101)
+        self.assertEqual(list(summary['endpoints']), ['language_tests', 'login'])
+
+    def test_empty_summary(self):
+        summary = Stats().summary(duration=10)
+        self.assertEqual(summary['endpoints'], {})
+        self.assertEqual(summary['total']['requests'], 0)
+        self.assertEqual(summary['total']['p99_ms'], 0)
+
+
+class LoadTestTest(LanguageTestMixin, LiveServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(2):
+            User.objects.create_user(f'load_user_{i}', password='load')
+
+    def test_run(self):
+        summary = run(
+            Config(
+                url=self.live_server_url,
+                concurrency=2,
+                duration=1,
+                warmup=0,
+                flows={'browse': 1, 'test': 1, 'profile': 1, 'login': 1},
+                number_users=2
+            ),
+            log=lambda message: None
+        )
+        self.assertGreater(summary['total']['requests'], 0)
+        self.assertEqual(summary['total']['errors'], 0)
+        self.assertTrue(
+            set(summary['endpoints']) <= {
+                'language_tests',
+                'language_test_preview',
+                'language_test',
+                'test_result',
+                'profile',
+                'login_form',
+                'login',
+            }
+        )
+        self.assertEqual(summary['meta']['concurrency'], 2)
+        self.assertNotIn('signup_form', summary['endpoints'])
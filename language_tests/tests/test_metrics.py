@@ -0,0 +1,190 @@
+import os
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from prometheus_client import REGISTRY
+
+from accounts.tasks import delete_deactivated_accounts
+from language_tests import metrics, middleware, views
+from language_tests.caches import question_pool
+from language_tests.models import LanguageTestType
+from language_tests.tests.utils import LanguageTestMixin
+
+
+def get_value(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(LanguageTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        patches = (
+            mock.patch.object(middleware, 'METRICS', True),
+            mock.patch.object(middleware, 'REQUEST_TIMINGS', False),
+            mock.patch.object(views, 'METRICS', True),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_requests(self):
+        labels = {'view': 'language_tests', 'method': 'GET'}
+        number_requests = get_value(
+            'http_request_duration_seconds_count',
+            **labels
+        )
+        number_responses = get_value(
+            'http_responses_total',
+            status='200',
+            **labels
+        )
+        number_queries = get_value(
+            'http_request_db_queries_sum',
+            view='language_tests'
+        )
+        self.client.get('/tests/')
+        self.client.get('/tests/')
+
+        self.assertEqual(
+            get_value('http_request_duration_seconds_count', **labels),
+            number_requests + 2
+        )
+        self.assertEqual(
+            get_value('http_responses_total', status='200', **labels),
+            number_responses + 2
+        )
+        self.assertGreater(
+            get_value('http_request_db_queries_sum', view='language_tests'),
+            number_queries
+        )
+
+    def test_cache_requests(self):
+        test_type_id = LanguageTestType.objects.first().pk
+        hits = get_value(
+            'cache_requests_total',
+            cache='question_pool',
+            result='hit'
+        )
+        misses = get_value(
+            'cache_requests_total',
+            cache='question_pool',
+            result='miss'
+        )
+        question_pool.get(test_type_id)
+        question_pool.get(test_type_id)
+        self.assertEqual(
+            get_value(
+                'cache_requests_total',
+                cache='question_pool',
+                result='miss'
+            ),
+            misses + 1
+        )
+        self.assertEqual(
+            get_value(
+                'cache_requests_total',
+                cache='question_pool',
+                result='hit'
+            ),
+            hits + 1
+        )
+
+    def test_tasks(self):
+        task = delete_deactivated_accounts
+        number_tasks = get_value(
+            'celery_task_duration_seconds_count',
+            task=task.name,
+            state='SUCCESS'
+        )
+        failures = get_value(
+            'celery_task_failures_total',
+            task=task.name,
+            exception='ValueError'
+        )
+        task.apply()
+        with mock.patch(
+                'accounts.tasks._delete_deactivated_accounts',
+                side_effect=ValueError
+        ):
+            task.apply()
+
+        self.assertEqual(
+            get_value(
+                'celery_task_duration_seconds_count',
+                task=task.name,
+                state='SUCCESS'
+            ),
+            number_tasks + 1
+        )
+        self.assertEqual(
+            get_value(
+                'celery_task_failures_total',
+                task=task.name,
+                exception='ValueError'
+            ),
+            failures + 1
+        )
+
+    def test_task_queue_wait(self):
+        headers = {}
+        metrics._set_enqueued_at(headers=headers)
+        task = SimpleNamespace(
+            name='task',
+            request=SimpleNamespace(
+                enqueued_at=headers['enqueued_at'] - 5
+            )
+        )
+        wait = get_value('celery_task_queue_wait_seconds_sum', task='task')
+        metrics._start_task(task_id='id', task=task)
+        metrics._stop_task(task_id='id', task=task, state='SUCCESS')
+        self.assertGreaterEqual(
+            get_value('celery_task_queue_wait_seconds_sum', task='task'),
+            wait + 5
+        )
+
+    def test_metrics_view(self):
+        self.client.get('/tests/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        self.assertIn(
+            b'http_request_duration_seconds_bucket{le="0.005",method="GET",'
+            b'view="language_tests"}',
+            response.content
+        )
+
+    def test_metrics_view_disabled(self):
+        with mock.patch.object(views, 'METRICS', False):
+            response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 404)
+
+
+class MultiProcessMetricsTest(SimpleTestCase):
+    script = (
+        'from prometheus_client import Counter; '
+        'Counter("cache_requests", "", ["cache", "result"])'
+        '.labels("question_pool", "hit").inc(3)'
+    )
+
+    def test_services(self):
+        # the metrics of the processes of all the services are summed
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            for service in ('web', 'web', 'celery_worker'):
+                path = os.path.join(metrics_dir, service)
+                os.makedirs(path, exist_ok=True)
+                subprocess.run(
+                    [sys.executable, '-c', self.script],
+                    env={**os.environ, 'PROMETHEUS_MULTIPROC_DIR': path},
+                    check=True
+                )
+            with mock.patch.object(metrics, 'METRICS_DIR', metrics_dir):
+                content = metrics.get_metrics().decode()
+        self.assertIn(
+            'cache_requests_total{cache="question_pool",result="hit"} 9.0',
+            content
+        )
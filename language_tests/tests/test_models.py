@@ -8,7 +8,10 @@ from language_tests.models import (
     LanguageTestType,
     Question,
     QuestionAnswer,
-    TestResult
+    TestAttempt,
+    TestResult,
+    UsedQuestions,
+    UserTestStats
 )
 from language_tests.validators import validate_question
 from language_tests.tests.utils import LanguageTestMixin
@@ -253,3 +256,72 @@ class TestResultTest(LanguageTestMixin, TestCase):
             str(test_result),
             'Пользователь - "test_user_1"; Вопрос - "question ___ 1"; Ответ - "answer_1"'
         )
+
+
+class TestAttemptTest(LanguageTestMixin, TestCase):
+
+    def test_answers(self):
+        test_attempt = TestAttempt.objects.create(
+            user_id=1,
+            test_type_id=1,
+            questions=[1, 2, 3],
+            answers=[1, 2, 1],
+            right_answers=b'\x05'
+        )
+        test_attempt.refresh_from_db()
+        self.assertIsInstance(test_attempt.solution_date, datetime)
+        self.assertEqual(test_attempt.number_answers, 3)
+        self.assertEqual(test_attempt.number_right_answers, 2)
+        self.assertTrue(test_attempt.is_right_answer(0))
+        self.assertFalse(test_attempt.is_right_answer(1))
+        self.assertTrue(test_attempt.is_right_answer(2))
+
+    def test_meta(self):
+        self.assertEqual(len(TestAttempt._meta.indexes), 2)
+        self.assertEqual(TestAttempt._meta.verbose_name, 'Попытка теста')
+        self.assertEqual(
+            TestAttempt._meta.verbose_name_plural,
+            'Попытки тестов'
+        )
+
+
+class UsedQuestionsTest(LanguageTestMixin, TestCase):
+
+    def test_objects_creation(self):
+        self.assertEqual(UsedQuestions.objects.count(), 1)
+
+    def test_questions(self):
+        used_questions = UsedQuestions.objects.get(id=1)
+        default = used_questions._meta.get_field('questions').default
+        self.assertEqual(default(), b'')
+        self.assertEqual(bytes(used_questions.questions), b'\xfe\x07')
+
+    def test_meta(self):
+        self.assertEqual(len(UsedQuestions._meta.constraints), 1)
+        self.assertEqual(
+            UsedQuestions._meta.verbose_name,
+            'Использованные вопросы'
+        )
+
+    def test_str_method(self):
+        used_questions = UsedQuestions.objects.get(id=1)
+        self.assertEqual(
+            str(used_questions),
+            'Пользователь - "test_user_1"; Тип теста - "test_type_1"'
+        )
+
+
+class UserTestStatsTest(LanguageTestMixin, TestCase):
+
+    def test_right_answers_percentage(self):
+        stats = UserTestStats(number_answers=0, number_right_answers=0)
+        self.assertEqual(stats.right_answers_percentage, 0)
+        stats = UserTestStats(number_answers=3, number_right_answers=2)
+        self.assertEqual(stats.right_answers_percentage, 67)
+
+    def test_meta(self):
+        self.assertEqual(len(UserTestStats._meta.constraints), 1)
+        self.assertEqual(
+            UserTestStats._meta.verbose_name,
+            'Статистика пользователя'
+        )
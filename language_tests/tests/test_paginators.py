@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from language_tests.admin import TestResultAdmin
+from language_tests.models import TestResult
+from language_tests.paginators import EstimatedCountPaginator
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class EstimatedCountPaginatorTest(LanguageTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {TestResult._meta.db_table}')
+
+    def test_exact_count_below_threshold(self):
+        paginator = EstimatedCountPaginator(
+            TestResult.objects.order_by('id'),
+            3,
+            threshold=11
+        )
+        self.assertFalse(paginator.is_estimated)
+        self.assertEqual(paginator.count, 10)
+
+    def test_estimated_count(self):
+        paginator = EstimatedCountPaginator(
+            TestResult.objects.order_by('id'),
+            3,
+            threshold=10
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 10)
+        self.assertTrue(paginator.is_estimated)
+
+        paginator = EstimatedCountPaginator(
+            TestResult.objects.filter(question_id=1).order_by('id'),
+            3,
+            threshold=10
+        )
+        self.assertTrue(paginator.is_estimated)
+        self.assertEqual(paginator.count, 1)
+
+
+class KeysetChangeListTest(LanguageTestMixin, TestCase):
+    path = '/admin/language_tests/testresult/'
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        patches = (
+            mock.patch.object(TestResultAdmin, 'count_estimate_threshold', 0),
+            mock.patch.object(TestResultAdmin, 'list_per_page', 4),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def get_ids(self, params=None):
+        response = self.client.get(self.path, params)
+        self.assertEqual(response.status_code, 200)
+        cl = response.context['cl']
+        return [i.pk for i in cl.result_list], cl
+
+    def test_keyset_pages(self):
+        ids, cl = self.get_ids()
+        self.assertTrue(cl.keyset)
+        self.assertEqual(ids, [10, 9, 8, 7])
+        self.assertIsNone(cl.keyset_previous_url)
+        self.assertEqual(cl.keyset_next_url, '?after=7')
+
+        ids, cl = self.get_ids({'after': 7})
+        self.assertEqual(ids, [6, 5, 4, 3])
+        self.assertEqual(cl.keyset_previous_url, '?before=6')
+
+        ids, cl = self.get_ids({'after': 3})
+        self.assertEqual(ids, [2, 1])
+        self.assertIsNone(cl.keyset_next_url)
+
+        ids, cl = self.get_ids({'before': 6})
+        self.assertEqual(ids, [10, 9, 8, 7])
+        self.assertIsNone(cl.keyset_previous_url)
+        self.assertEqual(cl.keyset_next_url, '?after=7')
+
+    def test_sorted_changelist(self):
+        ids, cl = self.get_ids({'o': '4'})
+        self.assertFalse(cl.keyset)
+        self.assertEqual(
+            ids,
+            list(
+                TestResult.objects.order_by(
+                    'solution_date',
+                    '-pk'
+                ).values_list('pk', flat=True)[:4]
+            )
+        )
+        ids, _ = self.get_ids({'o': '-4', 'p': '1'})
+        self.assertEqual(
+            ids,
+            list(
+                TestResult.objects.order_by(
+                    '-solution_date',
+                    '-pk'
+                ).values_list('pk', flat=True)[4:8]
+            )
+        )
+
+    def test_user_autocomplete_filter(self):
+        ids, cl = self.get_ids({'user': 1, 'after': 9})
+        self.assertEqual(ids, [8, 7, 6, 5])
+        self.assertEqual(cl.keyset_next_url, '?after=5&user=1')
+        ids, _ = self.get_ids({'user': 2})
+        self.assertEqual(ids, [])
+
+        response = self.client.get(self.path, {'user': 1})
+        self.assertContains(response, 'admin-autocomplete-filter')
+        self.assertContains(
+            response,
+            '<option value="1" selected>test_user_1</option>',
+            html=True
+        )
+        self.assertContains(response, 'admin_autocomplete_filter.js')
@@ -0,0 +1,109 @@
+from datetime import date, datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from pytz import utc
+
+from language_tests.ingestion import insert_test_attempts
+from language_tests.models import TestAttempt
+from language_tests.partitions import (
+    create_partitions,
+    detach_expired_partitions,
+    get_partitions,
+    is_partitioned
+)
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class PartitionTestAttemptsTest(LanguageTestMixin, TestCase):
+    solution_date = datetime(2021, 1, 15, tzinfo=utc)
+
+    def setUp(self):
+        super().setUp()
+        insert_test_attempts(
+            (1, 1, self.solution_date, [i], [1], b'\x01')
+            for i in range(1, 11)
+        )
+        # fire the deferred foreign key checks so that the table can be dropped
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        call_command('partition_test_attempts', stdout=StringIO())
+
+    @staticmethod
+    def get_partition_rows(name: str) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {connection.ops.quote_name(name)}')
+            return cursor.fetchone()[0]
+
+    def test_partition_test_attempts(self):
+        self.assertTrue(is_partitioned())
+        self.assertEqual(TestAttempt.objects.count(), 10)
+        partitions = dict(get_partitions())
+        self.assertEqual(
+            self.get_partition_rows('language_tests_testattempt_p2021_01'),
+            10
+        )
+        self.assertIn('language_tests_testattempt_p2021_01', partitions)
+        current_month = timezone.now().date().replace(day=1)
+        self.assertIn(current_month, partitions.values())
+
+    def test_command_is_idempotent(self):
+        stdout = StringIO()
+        call_command('partition_test_attempts', stdout=stdout)
+        self.assertIn('already partitioned', stdout.getvalue())
+        self.assertEqual(TestAttempt.objects.count(), 10)
+
+    def test_queries_after_partitioning(self):
+        test_attempt = TestAttempt.objects.create(
+            user_id=2,
+            test_type_id=1,
+            questions=[1],
+            answers=[1]
+        )
+        self.assertEqual(TestAttempt.objects.get(id=test_attempt.pk), test_attempt)
+        insert_test_attempts([(2, 1, timezone.now(), [2], [1], b'')])
+        self.assertEqual(TestAttempt.objects.filter(user_id=2).count(), 2)
+        TestAttempt.objects.filter(user_id=2).delete()
+        self.assertEqual(TestAttempt.objects.count(), 10)
+
+    def test_rows_are_moved_from_default_partition(self):
+        TestAttempt.objects.create(
+            user_id=2,
+            test_type_id=1,
+            solution_date=datetime(2030, 1, 15, tzinfo=utc),
+            questions=[1],
+            answers=[1]
+        )
+        self.assertEqual(
+            self.get_partition_rows('language_tests_testattempt_default'),
+            1
+        )
+        month = date(2030, 1, 1)
+        number_months = (
+            (month.year - timezone.now().year) * 12
+            + month.month - timezone.now().month
+        )
+        self.assertIn(
+            'language_tests_testattempt_p2030_01',
+            create_partitions(number_months)
+        )
+        self.assertEqual(
+            self.get_partition_rows('language_tests_testattempt_default'),
+            0
+        )
+        self.assertEqual(
+            self.get_partition_rows('language_tests_testattempt_p2030_01'),
+            1
+        )
+
+    def test_detach_expired_partitions(self):
+        detached = detach_expired_partitions(1, drop=True)
+        self.assertIn('language_tests_testattempt_p2021_01', detached)
+        self.assertNotIn(
+            'language_tests_testattempt_p2021_01',
+            dict(get_partitions())
+        )
+        self.assertEqual(TestAttempt.objects.count(), 0)
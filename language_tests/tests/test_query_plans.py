@@ -0,0 +1,228 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from language_tests.caches import answer_key_index, question_bank, question_pool
+from language_tests.indexes import create_indexes
+from language_tests.load_data import NUMBER_ANSWERS, generate_load_data
+from language_tests.models import (
+    Answer,
+    LanguageTestType,
+    Question,
+    QuestionAnswer,
+    TestAttempt,
+    TestResult,
+    UserTestStats
+)
+from language_tests.paginators import EstimatedCountAdminMixin
+from language_tests.services import generate_questions_list, get_right_answers
+from language_tests.tests.query_plans import (
+    QueryPlanTestMixin,
+    capture_queries
+)
+
+
+class QueryPlansTest(QueryPlanTestMixin, TestCase):
+    # the test types share the tables like they do in production, and the
+    # tables are large enough for the planner to prefer the indexes on its own
+    number_test_types = 20
+    number_questions = 2000
+    number_test_questions = 10
+    # the queries of a request read a page of the admin and one more row at
+    # most
+    max_rows = 101
+
+    @classmethod
+    def setUpClass(cls):
+        # the indexes are created concurrently, outside of the transaction
+        # of the test case
+        create_indexes()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        # the rolled back rows are left in the tables and their indexes and
+        # would change the plans of the next test cases
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM FULL ANALYZE')
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_load_data(
+            seed=0,
+            prefix='plan',
+            number_test_types=cls.number_test_types,
+            number_questions=cls.number_questions,
+            number_answers=20000,
+            number_users=20000,
+            number_attempts=20000
+        )
+        # the archived test results are only read by the admin
+        TestResult.objects.bulk_create(
+            (
+                TestResult(
+                    user_id=test_attempt.user_id,
+                    question_id=question_id,
+                    answer_id=answer_id,
+                    solution_date=test_attempt.solution_date
+                )
+                for test_attempt in TestAttempt.objects.order_by('id')[:2000]
+                for question_id, answer_id in zip(
+                    test_attempt.questions,
+                    test_attempt.answers
+                )
+            ),
+            batch_size=5000
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.test_type = LanguageTestType.objects.order_by('id').first()
+        stats = UserTestStats.objects.filter(
+            test_type=cls.test_type
+        ).order_by('-number_attempts', 'user_id').first()
+        cls.user = User.objects.get(pk=stats.user_id)
+        cls.superuser = User.objects.create_superuser(
+            'admin',
+            'admin@example.com',
+            'password'
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # the caches are filled, their loads are planned by their own tests
+        question_ids = [
+            question.question_id
+            for question in generate_questions_list(
+                self.test_type.pk,
+                self.user.pk,
+                self.number_test_questions
+            )
+        ]
+        self.answers = {
+            str(question_id): str(answer_id)
+            for question_id, answer_id in QuestionAnswer.objects.filter(
+                question_id__in=question_ids,
+                is_right_answer=True
+            ).values_list('question_id', 'answer_id')
+        }
+        answer_key_index.get(question_ids)
+
+    def get(self, path: str) -> None:
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+
+    def test_question_pool_load(self):
+        # the pool keeps the default ordering of the questions, the estimate
+        # of a test type may exceed its size
+        self.assertQueryPlans(
+            'question_pool_load',
+            lambda: question_pool.load(self.test_type.pk),
+            max_rows=self.number_questions * 2,
+            sort_tables=(Question._meta.db_table,)
+        )
+
+    def test_question_bank_load(self):
+        # the answers of a test type are read at once, joined by hashes and
+        # sorted for the page of the test, the bank is cached until it changes
+        self.assertQueryPlans(
+            'question_bank_load',
+            lambda: question_bank.load(self.test_type.pk),
+            max_rows=self.number_questions * NUMBER_ANSWERS * 2,
+            seq_scan_tables=(
+                Answer._meta.db_table,
+                QuestionAnswer._meta.db_table,
+            ),
+            sort_tables=(
+                Answer._meta.db_table,
+                Question._meta.db_table,
+                QuestionAnswer._meta.db_table,
+            )
+        )
+
+    def test_answer_key_index_load(self):
+        self.assertQueryPlans(
+            'answer_key_index_load',
+            lambda: answer_key_index._load(),
+            max_rows=self.number_test_types * self.number_questions
+            * NUMBER_ANSWERS,
+            seq_scan_tables=(QuestionAnswer._meta.db_table,)
+        )
+        question_ids = {int(i) for i in self.answers}
+        self.assertQueryPlans(
+            'answer_key_index_changes_load',
+            lambda: answer_key_index._load(question_ids),
+            max_rows=self.max_rows
+        )
+
+    def test_generate_questions_list(self):
+        self.assertQueryPlans(
+            'generate_questions_list',
+            lambda: generate_questions_list(
+                self.test_type.pk,
+                self.user.pk,
+                self.number_test_questions
+            ),
+            max_rows=self.max_rows
+        )
+
+    def test_get_right_answers(self):
+        # the answer keys are read from the index in memory
+        self.assertEqual(
+            capture_queries(
+                lambda: get_right_answers(self.answers, self.user.pk)
+            ),
+            []
+        )
+
+    def test_views(self):
+        self.client.force_login(self.user)
+        paths = {
+            'language_tests_view': '/tests/',
+            'language_test_preview_view': f'/tests/{self.test_type.pk}/',
+            'language_test_view': f'/tests/{self.test_type.pk}/test/',
+            'profile_view': f'/accounts/profile/{self.user.username}/',
+        }
+        for name, path in paths.items():
+            with self.subTest(name=name):
+                self.assertQueryPlans(
+                    name,
+                    lambda: self.get(path),
+                    max_rows=self.max_rows
+                )
+
+    def test_test_result_view(self):
+        self.client.force_login(self.user)
+        self.assertQueryPlans(
+            'test_result_view',
+            lambda: self.client.post(
+                '/tests/result/',
+                json.dumps(self.answers),
+                content_type='application/json'
+            ),
+            max_rows=self.max_rows
+        )
+
+    @mock.patch.object(EstimatedCountAdminMixin, 'count_estimate_threshold', 1000)
+    def test_admin_changelists(self):
+        # the counts of the large tables are estimated in production
+        self.client.force_login(self.superuser)
+        for model in (
+                'answer',
+                'question',
+                'questionanswer',
+                'testattempt',
+                'testresult',
+                'languagetesttype',
+        ):
+            with self.subTest(model=model):
+                self.assertQueryPlans(
+                    f'admin_{model}_changelist',
+                    lambda: self.get(f'/admin/language_tests/{model}/'),
+                    max_rows=self.max_rows
+                )
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from language_tests.ingestion import insert_test_attempts
+from language_tests.models import (
+    AnswerStats,
+    DailyStats,
+    HighWaterMark,
+    QuestionStats
+)
+from language_tests.rollups import QUESTION_STATS, update_question_stats
+from language_tests.tasks import (
+    save_user_answers,
+    update_daily_stats as update_daily_stats_task
+)
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class UpdateQuestionStatsTest(LanguageTestMixin, TestCase):
+
+    @staticmethod
+    def save_user_answers(answer_ids):
+        save_user_answers(
+            [
+                {'user_id': 1, 'question_id': 11 + i, 'answer_id': answer_id}
+                for i, answer_id in enumerate(answer_ids)
+            ]
+        )
+
+    def get_answer_stats(self, question_id: int):
+        return dict(
+            AnswerStats.objects.filter(
+                question_id=question_id
+            ).values_list('answer_id', 'number_answers')
+        )
+
+    def test_attempts_are_processed_after_next_run(self):
+        self.save_user_answers([1, 1])
+        self.assertEqual(update_question_stats(), 0)
+        self.assertFalse(QuestionStats.objects.exists())
+        mark = HighWaterMark.objects.get(name=QUESTION_STATS)
+        self.assertEqual(mark.value, 0)
+        self.assertGreater(mark.pending_value, 0)
+
+        self.save_user_answers([2])
+        self.assertEqual(update_question_stats(chunk_size=1), 1)
+        self.assertEqual(QuestionStats.objects.count(), 2)
+        self.assertEqual(update_question_stats(), 1)
+
+        stats = QuestionStats.objects.get(question_id=11)
+        self.assertEqual(stats.number_answers, 2)
+        self.assertEqual(stats.number_right_answers, 1)
+        self.assertEqual(stats.right_answers_percentage, 50)
+        self.assertEqual(self.get_answer_stats(11), {1: 1, 2: 1})
+        self.assertEqual(self.get_answer_stats(12), {1: 1})
+        self.assertEqual(update_question_stats(), 0)
+        self.assertEqual(
+            QuestionStats.objects.get(question_id=11).number_answers,
+            2
+        )
+
+
+class UpdateDailyStatsTest(LanguageTestMixin, TestCase):
+
+    def test_update_daily_stats(self):
+        day = timezone.now().date()
+        insert_test_attempts(
+            [
+                (1, 1, timezone.now(), [1, 2], [1, 2], b'\x01'),
+                (1, 1, timezone.now(), [3], [1], b'\x01'),
+                (2, 1, timezone.now(), [4], [2], b''),
+                (2, 2, timezone.now(), [21], [5], b'\x01'),
+                (2, None, timezone.now(), [1], [1], b'\x01'),
+                (2, 1, timezone.now() - timedelta(days=1), [1], [1], b'\x01'),
+            ]
+        )
+        DailyStats.objects.create(date=day, test_type_id=3, number_attempts=1)
+
+        for _ in range(2):
+            call_command(
+                'update_daily_stats',
+                day.isoformat(),
+                chunk_size=2,
+                stdout=StringIO()
+            )
+            stats = DailyStats.objects.order_by('test_type_id')
+            self.assertEqual(
+                [
+                    (
+                        i.date,
+                        i.test_type_id,
+                        i.number_attempts,
+                        i.number_users,
+                        i.number_answers,
+                        i.number_right_answers
+                    )
+                    for i in stats
+                ],
+                [(day, 1, 3, 2, 4, 2), (day, 2, 1, 1, 1, 1)]
+            )
+
+    def test_update_daily_stats_task(self):
+        insert_test_attempts(
+            [(1, 1, timezone.now() - timedelta(days=1), [1], [1], b'\x01')]
+        )
+        update_daily_stats_task()
+        self.assertEqual(DailyStats.objects.get().number_attempts, 1)
@@ -0,0 +1,270 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import redis
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from language_tests import buffers
+from language_tests.bitsets import (
+    add_to_bitset,
+    add_to_offset_bitset,
+    in_bitset,
+    in_offset_bitset
+)
+from language_tests.models import (
+    TestAttempt,
+    TestResult,
+    TestResultBatch,
+    UsedQuestions,
+    UserTestStats
+)
+from language_tests.services import generate_questions_list
+from language_tests.tasks import flush_user_answers, save_user_answers
+from language_tests.tests.utils import LanguageTestMixin
+
+
+class BitsetTest(LanguageTestMixin, TestCase):
+
+    def test_add_to_bitset(self):
+        bitset = add_to_bitset(b'', (1, 9, 200))
+        self.assertEqual(len(bitset), 200 // 8 + 1)
+        for value in range(256):
+            self.assertEqual(in_bitset(bitset, value), value in (1, 9, 200))
+        self.assertEqual(add_to_bitset(bitset, (9,)), bitset)
+        self.assertEqual(add_to_bitset(bitset, ()), bitset)
+
+    def test_add_to_offset_bitset(self):
+        bitset, offset = add_to_offset_bitset(b'', 0, (2000001, 2000009))
+        self.assertEqual((len(bitset), offset), (2, 2000000))
+        bitset, offset = add_to_offset_bitset(bitset, offset, (1999990,))
+        self.assertEqual((len(bitset), offset), (4, 1999984))
+        for value in range(1999980, 2000020):
+            self.assertEqual(
+                in_offset_bitset(bitset, offset, value),
+                value in (1999990, 2000001, 2000009)
+            )
+        # the leading empty bytes of an old bitset are dropped
+        self.assertEqual(
+            add_to_offset_bitset(add_to_bitset(b'', (200,)), 0, (201,)),
+            (b'\x03', 200)
+        )
+
+
+class SaveUserAnswersTest(LanguageTestMixin, TestCase):
+
+    @staticmethod
+    def get_used_questions(user_id: int, test_type_id: int):
+        used_questions = UsedQuestions.objects.get(
+            user_id=user_id,
+            test_type_id=test_type_id
+        )
+        return bytes(used_questions.questions), used_questions.offset
+
+    def test_save_user_answers(self):
+        number_results = TestResult.objects.count()
+        save_user_answers(
+            [
+                {'user_id': 1, 'question_id': 11, 'answer_id': 1},
+                {'user_id': 1, 'question_id': 12, 'answer_id': 2},
+                {'user_id': 1, 'question_id': 21, 'answer_id': 1},
+            ]
+        )
+        self.assertEqual(TestResult.objects.count(), number_results)
+        test_attempt = TestAttempt.objects.get(user_id=1, test_type_id=1)
+        self.assertEqual(test_attempt.questions, [11, 12])
+        self.assertEqual(test_attempt.answers, [1, 2])
+        self.assertTrue(test_attempt.is_right_answer(0))
+        self.assertFalse(test_attempt.is_right_answer(1))
+        test_attempt = TestAttempt.objects.get(user_id=1, test_type_id=2)
+        self.assertEqual(test_attempt.questions, [21])
+        self.assertEqual(test_attempt.number_right_answers, 0)
+        used_questions, offset = self.get_used_questions(1, 1)
+        for question_id in range(1, 13):
+            self.assertTrue(in_offset_bitset(used_questions, offset, question_id))
+        self.assertFalse(in_offset_bitset(used_questions, offset, 13))
+        # the bitset of a new row starts at its smallest question id
+        used_questions, offset = self.get_used_questions(1, 2)
+        self.assertEqual((used_questions, offset), (b'\x20', 16))
+        self.assertTrue(in_offset_bitset(used_questions, offset, 21))
+        self.assertFalse(in_offset_bitset(used_questions, offset, 11))
+
+    def test_generate_questions_list_after_save_user_answers(self):
+        save_user_answers(
+            [
+                {'user_id': 1, 'question_id': i, 'answer_id': 1}
+                for i in range(11, 16)
+            ]
+        )
+        questions = generate_questions_list(1, 1, 5)
+        self.assertEqual(
+            [i.question_id for i in questions],
+            [i for i in range(16, 21)]
+        )
+
+    def test_save_user_answers_updates_user_stats(self):
+        save_user_answers(
+            [
+                {'user_id': 1, 'question_id': 11, 'answer_id': 1},
+                {'user_id': 1, 'question_id': 12, 'answer_id': 2},
+                {'user_id': 1, 'question_id': 21, 'answer_id': 5},
+            ]
+        )
+        save_user_answers(
+            [{'user_id': 1, 'question_id': 13, 'answer_id': 1}]
+        )
+        stats = UserTestStats.objects.get(user_id=1, test_type_id=1)
+        self.assertEqual(stats.number_attempts, 2)
+        self.assertEqual(stats.number_answers, 3)
+        self.assertEqual(stats.number_right_answers, 2)
+        self.assertIsNotNone(stats.last_attempt)
+        stats = UserTestStats.objects.get(user_id=1, test_type_id=2)
+        self.assertEqual(stats.number_attempts, 1)
+        self.assertEqual(stats.number_answers, 1)
+        self.assertEqual(stats.number_right_answers, 1)
+
+
+class BackfillUsedQuestionsTest(LanguageTestMixin, TestCase):
+
+    def test_backfill_used_questions(self):
+        call_command('convert_test_results', stdout=StringIO())
+        UsedQuestions.objects.all().delete()
+        call_command('backfill_used_questions', chunk_size=3, stdout=StringIO())
+        used_questions = UsedQuestions.objects.get(user_id=1, test_type_id=1)
+        self.assertEqual(
+            bytes(used_questions.questions),
+            add_to_bitset(b'', range(1, 11))
+        )
+        self.assertEqual(UsedQuestions.objects.count(), 1)
+
+
+class ConvertTestResultsTest(LanguageTestMixin, TestCase):
+
+    def test_convert_test_results(self):
+        for i in range(11, 14):
+            test_result = self.create_test_result(
+                user='test_user_1',
+                question=f'question ___ {i}',
+                answer='answer_2'
+            )
+        test_result.solution_date = test_result.solution_date + timedelta(hours=1)
+        test_result.save()
+        number_test_results = TestResult.objects.count()
+        call_command('convert_test_results', dry_run=True, stdout=StringIO())
+        self.assertFalse(TestAttempt.objects.exists())
+        call_command('convert_test_results', chunk_size=1, stdout=StringIO())
+        call_command('convert_test_results', stdout=StringIO())
+
+        self.assertEqual(TestResult.objects.count(), number_test_results)
+        test_attempts = list(TestAttempt.objects.filter(user_id=1).order_by('id'))
+        self.assertEqual(
+            [i.questions for i in test_attempts],
+            [list(range(1, 11)), [11, 12], [13]]
+        )
+        self.assertEqual(test_attempts[0].number_right_answers, 10)
+        self.assertEqual(test_attempts[1].answers, [2, 2])
+        self.assertEqual(test_attempts[1].number_right_answers, 0)
+
+        used_questions = UsedQuestions.objects.get(user_id=1, test_type_id=1)
+        for question_id in range(1, 14):
+            self.assertTrue(
+                in_offset_bitset(
+                    bytes(used_questions.questions),
+                    used_questions.offset,
+                    question_id
+                )
+            )
+
+        stats = UserTestStats.objects.get(user_id=1, test_type_id=1)
+        self.assertEqual(stats.number_attempts, 3)
+        self.assertEqual(stats.number_answers, 13)
+        self.assertEqual(stats.number_right_answers, 10)
+        self.assertEqual(stats.last_attempt, test_attempts[2].solution_date)
+
+
+class FlushUserAnswersTest(LanguageTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        self.spool_dir = Path(spool_dir.name)
+        patches = (
+            mock.patch.object(buffers, 'TEST_RESULTS_SPOOL_DIR', self.spool_dir),
+            # nothing listens on the port, so the answers go to the spool
+            mock.patch.object(buffers, '_client', redis.Redis(port=1)),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def buffer_user_answers(self, question_ids: range) -> None:
+        buffers.buffer_user_answers(
+            [
+                {'user_id': 2, 'question_id': i, 'answer_id': 1}
+                for i in question_ids
+            ]
+        )
+
+    def flush_user_answers(self, minutes: int = 1) -> None:
+        minute = buffers._get_minute() + minutes
+        with mock.patch.object(buffers, '_get_minute', return_value=minute):
+            with mock.patch('language_tests.tasks.get_buffered_batch', return_value=None):
+                flush_user_answers()
+
+    def test_spool_when_redis_is_unavailable(self):
+        self.buffer_user_answers(range(1, 6))
+        self.assertEqual(len(list(self.spool_dir.glob('*.jsonl'))), 1)
+        self.assertFalse(TestAttempt.objects.filter(user_id=2).exists())
+
+    def test_flush_spooled_answers(self):
+        self.buffer_user_answers(range(1, 6))
+        self.flush_user_answers(minutes=0)
+        self.assertFalse(TestAttempt.objects.filter(user_id=2).exists())
+        self.flush_user_answers()
+        self.assertEqual(
+            TestAttempt.objects.get(user_id=2).questions,
+            [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(TestResultBatch.objects.count(), 1)
+        self.assertEqual(list(self.spool_dir.glob('*.jsonl')), [])
+        self.assertTrue(
+            in_bitset(bytes(UsedQuestions.objects.get(user_id=2).questions), 5)
+        )
+
+    def test_replayed_batch_is_saved_once(self):
+        self.buffer_user_answers(range(1, 6))
+        path = next(self.spool_dir.glob('*.jsonl'))
+        content = path.read_text()
+        self.flush_user_answers()
+        path.write_text(content)
+        self.flush_user_answers()
+        self.assertEqual(
+            TestAttempt.objects.get(user_id=2).questions,
+            [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(list(self.spool_dir.glob('*.jsonl')), [])
+
+    def test_old_batches_are_pruned(self):
+        TestResultBatch.objects.bulk_create(
+            TestResultBatch(id=i)
+            for i in ('old', 'new', 'convert_test_results:1')
+        )
+        TestResultBatch.objects.exclude(id='new').update(
+            created=timezone.now() - timedelta(days=30)
+        )
+        self.flush_user_answers()
+        self.assertEqual(
+            set(TestResultBatch.objects.values_list('id', flat=True)),
+            {'new', 'convert_test_results:1'}
+        )
+
+    def test_ack_removed_spooled_batch(self):
+        # an overlapping flush has already saved and removed the file
+        path = self.spool_dir / 'removed.jsonl'
+        buffers.ack_batch(buffers.Batch(id='removed', answers=[], path=path))
+        self.assertFalse(path.exists())
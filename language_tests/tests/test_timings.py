@@ -0,0 +1,107 @@
+from io import StringIO
+from unittest import mock
+
+import fakeredis
+import redis
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from language_tests import middleware, timings
+from language_tests.tests.utils import LanguageTestMixin
+from language_tests.timings import (
+    BUCKETS,
+    ViewTimings,
+    get_view_timings,
+    reset_view_timings
+)
+
+class ViewTimingsTest(TestCase):
+
+    def test_get_percentile(self):
+        buckets = [0] * (len(BUCKETS) + 1)
+        buckets[BUCKETS.index(10)] = 50
+        buckets[BUCKETS.index(100)] = 45
+        buckets[-1] = 5
+        view_timings = ViewTimings('view', 100, 0, 0, 0, 0, buckets)
+        self.assertEqual(view_timings.get_percentile(50), 10)
+        self.assertEqual(view_timings.get_percentile(95), 100)
+        self.assertEqual(view_timings.get_percentile(99), float('inf'))
+
+
+class RequestTimingMiddlewareTest(LanguageTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        patches = (
+            mock.patch.object(timings, '_client', fakeredis.FakeRedis()),
+            mock.patch.object(middleware, 'REQUEST_TIMINGS', True),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def get_timings(self):
+        return {item.view: item for item in get_view_timings()}
+
+    def test_record_request(self):
+        response = self.client.get('/tests/')
+        self.assertNotIn('Server-Timing', response)
+        self.client.get('/tests/')
+        self.client.get('/tests/1/')
+        self.client.get('/missing/')
+
+        view_timings = self.get_timings()
+        self.assertEqual(
+            set(view_timings),
+            {'language_tests', 'language_test_preview', 'unresolved'}
+        )
+        item = view_timings['language_tests']
+        self.assertEqual(item.number_requests, 2)
+        self.assertEqual(sum(item.buckets), 2)
+        self.assertGreater(item.number_queries, 0)
+        self.assertGreater(item.db_time, 0)
+        self.assertGreater(item.template_time, 0)
+        self.assertGreaterEqual(item.total_time, item.template_time)
+
+        reset_view_timings()
+        self.assertEqual(get_view_timings(), [])
+
+    def test_server_timing_for_staff(self):
+        User.objects.create_user('staff', password='password', is_staff=True)
+        self.client.login(username='staff', password='password')
+        response = self.client.get('/tests/')
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;desc="\d+ queries";dur=[\d.]+, tpl;dur=[\d.]+, '
+            r'total;dur=[\d.]+$'
+        )
+
+    def test_slow_query_log(self):
+        with mock.patch.object(timings, 'SLOW_QUERY_THRESHOLD', 0):
+            with self.assertLogs('language_tests.timings', 'WARNING') as logs:
+                self.client.get('/tests/')
+        self.assertIn('Slow query of GET /tests/', logs.output[0])
+        self.assertIn('language_tests_languagetesttype', logs.output[0])
+        self.assertIn('test_timings.py', logs.output[0])
+
+    def test_redis_error(self):
+        client = mock.Mock()
+        client.pipeline.return_value.execute.side_effect = redis.RedisError
+        with mock.patch.object(timings, '_client', client):
+            with self.assertLogs('language_tests.timings', 'ERROR'):
+                response = self.client.get('/tests/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_disabled(self):
+        with mock.patch.object(middleware, 'REQUEST_TIMINGS', False):
+            self.client.get('/tests/')
+        self.assertEqual(get_view_timings(), [])
+
+    def test_command(self):
+        self.client.get('/tests/')
+        stdout = StringIO()
+        call_command('request_timings', stdout=stdout)
+        self.assertIn('language_tests', stdout.getvalue())
+        call_command('request_timings', reset=True, stdout=StringIO())
+        self.assertEqual(get_view_timings(), [])
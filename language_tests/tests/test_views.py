@@ -1,9 +1,10 @@
 from typing import Dict, Tuple
+from unittest import mock
 
 from django.test import TestCase
 from django.urls import reverse
 
-from language_tests.models import TestResult
+from language_tests.models import TestAttempt
 from language_tests.tests.utils import LanguageTestMixin
 
 
@@ -180,13 +181,14 @@ class LanguageTestResultViewTest(LanguageTestMixin, TestCase):
 
     @staticmethod
     def get_user_answers(user: str) -> Dict[str, int]:
-        test_result = TestResult.objects.filter(user__username=user).values(
-            'question_id',
-            'answer_id'
+        test_attempts = TestAttempt.objects.filter(user__username=user).values(
+            'questions',
+            'answers'
         )
         return {
-            str(item['question_id']): item['answer_id']
-            for item in test_result
+            str(question_id): answer_id
+            for item in test_attempts
+            for question_id, answer_id in zip(item['questions'], item['answers'])
         }
 
     def test_HTTP404_for_GET_request(self):
@@ -232,3 +234,67 @@ class LanguageTestResultViewTest(LanguageTestMixin, TestCase):
         self.assertTrue(login)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['data'], correct_answers)
+
+    def start_test(self, test_type_id: int = 1) -> Tuple[str, Dict]:
+        response = self.client.get(
+            reverse('language_test', kwargs={'pk': test_type_id})
+        )
+        correct_answers = {
+            str(question.question_id): question.right_answer_id
+            for question in response.context_data['questions']
+        }
+        return response.context_data['test_session'], correct_answers
+
+    def test_correct_answers_with_test_session(self):
+        token, correct_answers = self.start_test()
+        response = self.client.post(
+            reverse(self.path_name),
+            {},
+            content_type='application/json',
+            HTTP_X_TEST_SESSION=token
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], correct_answers)
+
+    def test_test_session_without_queries(self):
+        token, correct_answers = self.start_test()
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                reverse(self.path_name),
+                correct_answers,
+                content_type='application/json',
+                HTTP_X_TEST_SESSION=token
+            )
+        self.assertEqual(response.json()['data'], correct_answers)
+
+    def test_duplicate_submit_of_test_session(self):
+        self.client.login(
+            username='test_user_2',
+            password=self.default_test_users_password
+        )
+        token, correct_answers = self.start_test()
+        with mock.patch('language_tests.services.transaction.on_commit') as on_commit:
+            for _ in range(2):
+                response = self.client.post(
+                    reverse(self.path_name),
+                    correct_answers,
+                    content_type='application/json',
+                    HTTP_X_TEST_SESSION=token
+                )
+                self.assertEqual(response.json()['data'], correct_answers)
+        self.assertEqual(on_commit.call_count, 1)
+
+    def test_test_session_of_another_user(self):
+        token, _ = self.start_test()
+        self.client.login(
+            username='test_user_2',
+            password=self.default_test_users_password
+        )
+        user_answers, correct_answers = self.get_answers('wrong')
+        response = self.client.post(
+            reverse(self.path_name),
+            user_answers,
+            content_type='application/json',
+            HTTP_X_TEST_SESSION=token
+        )
+        self.assertEqual(response.json()['data'], correct_answers)
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from language_tests.models import (
     Answer,
@@ -29,8 +30,13 @@ class LanguageTestMixin:
         'question_answers',
         'users',
         'test_results',
+        'used_questions',
     ]
 
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
     @staticmethod
     def create_answer(answer: str) -> Answer:
         return Answer.objects.create(answer=answer)
@@ -0,0 +1,176 @@
+import logging
+import time
+import traceback
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional
+
+import redis
+
+from test_your_language.settings import (
+    BASE_DIR,
+    REQUEST_TIMINGS_URL,
+    SLOW_QUERY_THRESHOLD
+)
+
+
+KEY_PREFIX = 'language_tests:timings'
+VIEWS_KEY = f'{KEY_PREFIX}:views'
+# the upper bounds of the buckets of the total time in ms, the last bucket
+# has no bound
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNRESOLVED_VIEW = 'unresolved'
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+
+
+class RequestTimer:
+    # is installed as the execute_wrapper of the connections for a request
+
+    def __init__(self, request_name: str = ''):
+        self.request_name = request_name
+        self.start = time.perf_counter()
+        self.total_time = 0.0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.number_queries = 0
+        self._template_start = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.number_queries += 1
+            if duration >= SLOW_QUERY_THRESHOLD:
+                _log_slow_query(self.request_name, sql, params, duration)
+
+    def start_template(self) -> None:
+        self._template_start = time.perf_counter()
+
+    def stop_template(self) -> None:
+        if self._template_start is not None:
+            self.template_time += time.perf_counter() - self._template_start
+            self._template_start = None
+
+    def stop(self) -> None:
+        self.total_time = time.perf_counter() - self.start
+
+    def get_server_timing(self) -> str:
+        return ', '.join(
+            (
+                f'db;desc="{self.number_queries} queries";'
+                f'dur={self.db_time * 1000:.1f}',
+                f'tpl;dur={self.template_time * 1000:.1f}',
+                f'total;dur={self.total_time * 1000:.1f}',
+            )
+        )
+
+
+class ViewTimings(NamedTuple):
+    view: str
+    number_requests: int
+    number_queries: int
+    # the sums of the times in ms
+    total_time: float
+    db_time: float
+    template_time: float
+    # the number of requests in each bucket of BUCKETS and in the last one
+    buckets: List[int]
+
+    def get_percentile(self, percentile: float) -> float:
+        # the upper bound of the bucket with the percentile
+        rank = self.number_requests * percentile / 100
+        number_requests = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            number_requests += count
+            if number_requests >= rank:
+                return bound
+        return float('inf')
+
+
+def record_request(view: str, timer: RequestTimer) -> None:
+    total_time = timer.total_time * 1000
+    key = _get_key(view)
+    try:
+        pipeline = _get_client().pipeline(transaction=False)
+        pipeline.sadd(VIEWS_KEY, view)
+        pipeline.hincrby(key, 'number_requests', 1)
+        pipeline.hincrby(key, 'number_queries', timer.number_queries)
+        pipeline.hincrbyfloat(key, 'total_time', total_time)
+        pipeline.hincrbyfloat(key, 'db_time', timer.db_time * 1000)
+        pipeline.hincrbyfloat(key, 'template_time', timer.template_time * 1000)
+        pipeline.hincrby(key, f'bucket:{bisect_left(BUCKETS, total_time)}', 1)
+        pipeline.execute()
+    except redis.RedisError:
+        # the timings are statistics, the request is served without them
+        logger.exception('Request timings are not recorded')
+
+
+def get_view_timings() -> List[ViewTimings]:
+    client = _get_client()
+    views = sorted(view.decode() for view in client.smembers(VIEWS_KEY))
+    pipeline = client.pipeline(transaction=False)
+    for view in views:
+        pipeline.hgetall(_get_key(view))
+    result = []
+    for view, values in zip(views, pipeline.execute()):
+        values = {key.decode(): value for key, value in values.items()}
+        result.append(
+            ViewTimings(
+                view=view,
+                number_requests=int(values.get('number_requests', 0)),
+                number_queries=int(values.get('number_queries', 0)),
+                total_time=float(values.get('total_time', 0)),
+                db_time=float(values.get('db_time', 0)),
+                template_time=float(values.get('template_time', 0)),
+                buckets=[
+                    int(values.get(f'bucket:{i}', 0))
+                    for i in range(len(BUCKETS) + 1)
+                ]
+            )
+        )
+    return result
+
+
+def reset_view_timings() -> None:
+    client = _get_client()
+    views = [view.decode() for view in client.smembers(VIEWS_KEY)]
+    client.delete(VIEWS_KEY, *(_get_key(view) for view in views))
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(REQUEST_TIMINGS_URL)
+    return _client
+
+
+def _get_key(view: str) -> str:
+    return f'{KEY_PREFIX}:{view}'
+
+
+def _log_slow_query(
+        request_name: str,
+        sql: str,
+        params,
+        duration: float
+) -> None:
+    # only the frames of the project are logged, a query of a template is
+    # found by the request
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(str(BASE_DIR))
+        and 'site-packages' not in frame.filename
+    ]
+    logger.warning(
+        'Slow query of %s (%.1f ms): %s; params: %r\n%s',
+        request_name,
+        duration * 1000,
+        sql,
+        params,
+        ''.join(traceback.format_list(frames))
+    )
@@ -7,5 +7,11 @@ urlpatterns = [
     path('', views.language_tests, name='language_tests'),
     path('<int:pk>/', views.language_test_preview, name='language_test_preview'),
     path('<int:pk>/test/', views.language_test, name='language_test'),
+    path('<int:pk>/leaderboard/', views.leaderboard, name='leaderboard'),
     path('result/', views.test_result, name='test_result'),
+    path(
+        'export/',
+        views.export_test_attempts,
+        name='export_test_attempts'
+    ),
 ]
@@ -3,22 +3,26 @@ import re
 from django.core.exceptions import ValidationError
 
 
-def validate_question(question: str) -> None:
-    underscore_pattern = r'^(?:[^_]+)?(?:___){1}(?:[^_]+)?$'
-    content_pattern = r'^(?:[^a-z]*[a-z]+[^a-z]*)+$'
+UNDERSCORE_PATTERN = re.compile(
+    r'^(?:[^_]+)?(?:___){1}(?:[^_]+)?$',
+    re.IGNORECASE
+)
+CONTENT_PATTERN = re.compile(r'^(?:[^a-z]*[a-z]+[^a-z]*)+$', re.IGNORECASE)
+
 
+def validate_question(question: str) -> None:
     if len(question) <= 8:
         raise ValidationError(
             'Длина вопроса должна быть больше 8 символов.',
             code='invalid_question_length'
         )
-    if not re.search(underscore_pattern, question, re.IGNORECASE):
+    if not UNDERSCORE_PATTERN.search(question):
         raise ValidationError(
             'Вопрос должен содержать 1 разделитель, состоящий из 3 нижних '
             'подчёркиваний (другое количество подчёркиваний не допускается).',
             code='invalid_question_underscore'
         )
-    if not re.search(content_pattern, question, re.IGNORECASE):
+    if not CONTENT_PATTERN.search(question):
         raise ValidationError(
             'Вопрос не должен состоять только из нижних подчёркиваний, пробелов '
             'или знаков препинания.',
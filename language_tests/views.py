@@ -1,12 +1,20 @@
 import json
 from typing import Dict
 
-from django.http import Http404, HttpRequest, JsonResponse
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.auth.models import User
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.generic import DetailView, ListView, View
 
+from language_tests.exports import get_export_response, get_test_attempts
+from language_tests.forms import ExportTestAttemptsForm
+from language_tests.leaderboards import ALL_TIME, Leaderboard, PERIODS, WEEK
+from language_tests.metrics import CONTENT_TYPE, get_metrics
 from language_tests.models import LanguageTestType
 from language_tests.services import generate_questions_list, get_right_answers
+from language_tests.sessions import create_test_session
+from test_your_language.settings import LEADERBOARDS, METRICS
 
 
 class LanguageTestMixin:
@@ -26,6 +34,11 @@ class LanguageTestDetailView(LanguageTestMixin, DetailView):
     context_object_name = 'language_test'
     template_name = 'language_tests/language_test_preview.html'
 
+    def get_context_data(self, **kwargs) -> Dict:
+        context = super().get_context_data(**kwargs)
+        context['leaderboards'] = LEADERBOARDS
+        return context
+
 
 class LanguageTestView(LanguageTestMixin, ListView):
     object_list = None
@@ -46,6 +59,10 @@ class LanguageTestView(LanguageTestMixin, ListView):
             test_type_id=kwargs['test_type_id'],
             user_id=kwargs['user_id']
         )
+        context['test_session'] = create_test_session(
+            questions=context['questions'],
+            user_id=kwargs['user_id']
+        )
         context['language_test'] = self.model.objects.get(
             id=kwargs['test_type_id']
         )
@@ -53,6 +70,46 @@ class LanguageTestView(LanguageTestMixin, ListView):
         return context
 
 
+class LeaderboardView(LanguageTestMixin, ListView):
+    context_object_name = 'leaderboard'
+    paginate_by = 50
+    template_name = 'language_tests/leaderboard.html'
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        if not LEADERBOARDS:
+            raise Http404
+        self.language_test = get_object_or_404(self.queryset, pk=kwargs['pk'])
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self) -> Leaderboard:
+        period = self.request.GET.get('period')
+        return Leaderboard(
+            self.language_test.pk,
+            period if period in PERIODS else ALL_TIME
+        )
+
+    def get_context_data(self, *, object_list=None, **kwargs) -> Dict:
+        context = super().get_context_data(**kwargs)
+        usernames = dict(
+            User.objects.filter(
+                id__in=[entry.user_id for entry in context['leaderboard']]
+            ).values_list('id', 'username')
+        )
+        context['entries'] = [
+            (entry, usernames.get(entry.user_id))
+            for entry in context['leaderboard']
+        ]
+        context['language_test'] = self.language_test
+        context['period'] = self.object_list.period
+        context['periods'] = ((ALL_TIME, 'За всё время'), (WEEK, 'За неделю'),)
+        if self.request.user.is_authenticated:
+            context['user_entry'] = self.object_list.get_entry(
+                self.request.user.id
+            )
+
+        return context
+
+
 class LanguageTestResultView(View):
 
     def get(self,  *args, **kwargs):
@@ -64,12 +121,49 @@ class LanguageTestResultView(View):
         except Exception:
             right_answers = {}
         else:
-            right_answers = get_right_answers(answers, request.user.id)
+            right_answers = get_right_answers(
+                answers,
+                request.user.id,
+                request.headers.get('X-Test-Session')
+            )
         finally:
             return JsonResponse({'data': right_answers})
 
 
+class ExportTestAttemptsView(UserPassesTestMixin, View):
+
+    def test_func(self) -> bool:
+        user = self.request.user
+        return user.is_staff and user.has_perm('language_tests.view_testattempt')
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        form = ExportTestAttemptsForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        test_type = form.cleaned_data['test_type']
+        return get_export_response(
+            get_test_attempts(
+                test_type.pk if test_type else None,
+                form.cleaned_data['start'],
+                form.cleaned_data['end']
+            ),
+            form.cleaned_data['format'] or 'csv'
+        )
+
+
+class MetricsView(View):
+    # is scraped inside the network of the services, nginx doesn't proxy it
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not METRICS:
+            raise Http404
+        return HttpResponse(get_metrics(), content_type=CONTENT_TYPE)
+
+
 language_tests = LanguageTestListView.as_view()
 language_test_preview = LanguageTestDetailView.as_view()
 language_test = LanguageTestView.as_view()
+leaderboard = LeaderboardView.as_view()
 test_result = LanguageTestResultView.as_view()
+export_test_attempts = ExportTestAttemptsView.as_view()
+metrics = MetricsView.as_view()
@@ -0,0 +1,14 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    // the typed answers are marked, so an answer like "1" isn't taken for an id
+    $.fn.select2.defaults.set('createTag', function (params) {
+        const term = $.trim(params.term);
+        if (term === '') {
+            return null;
+        }
+        const prefix = this.$element.attr('data-new-option-prefix') || '';
+        return {id: prefix + term, text: term};
+    });
+}
@@ -0,0 +1,12 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    $(document).on('change', '.admin-autocomplete-filter', function () {
+        const params = new URLSearchParams(this.dataset.queryString);
+        if (this.value) {
+            params.set(this.dataset.parameterName, this.value);
+        }
+        window.location.search = params.toString();
+    });
+}
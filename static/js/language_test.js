@@ -32,7 +32,8 @@ async function getTestResult(url) {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json;charset=utf-8',
-            'X-CSRFToken': getCookie('csrftoken')
+            'X-CSRFToken': getCookie('csrftoken'),
+            'X-Test-Session': document.getElementById('languageTest').getAttribute('data-session')
         },
         body: JSON.stringify(testAnswers)
     });
@@ -1,8 +1,14 @@
 import os
 
 from celery import Celery
+from celery.schedules import crontab
 
-from test_your_language.settings import ACTIVATION_LINK_LIFETIME
+from test_your_language.settings import (
+    ACTIVATION_LINK_LIFETIME,
+    QUESTION_STATS_INTERVAL,
+    TEST_RESULTS_BUFFER,
+    TEST_RESULTS_FLUSH_INTERVAL
+)
 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_your_language.settings')
@@ -16,5 +22,23 @@ app.conf.beat_schedule = {
     'delete-deactivated-accounts': {
         'task': 'accounts.tasks.delete_deactivated_accounts',
         'schedule': ACTIVATION_LINK_LIFETIME // 2,
-    }
+    },
+    'manage-test-attempt-partitions': {
+        'task': 'language_tests.tasks.manage_test_attempt_partitions',
+        'schedule': 60 * 60 * 24,  # 24 h.
+    },
+    'update-question-stats': {
+        'task': 'language_tests.tasks.update_question_stats',
+        'schedule': QUESTION_STATS_INTERVAL,
+    },
+    'update-daily-stats': {
+        'task': 'language_tests.tasks.update_daily_stats',
+        'schedule': crontab(hour=0, minute=30),
+    },
 }
+
+if TEST_RESULTS_BUFFER:
+    app.conf.beat_schedule['flush-user-answers'] = {
+        'task': 'language_tests.tasks.flush_user_answers',
+        'schedule': TEST_RESULTS_FLUSH_INTERVAL,
+    }
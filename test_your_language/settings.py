@@ -36,6 +36,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'language_tests.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +79,10 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 LOGIN_REDIRECT_URL = '/'
 
 AUTHENTICATION_BACKENDS = (
@@ -141,3 +146,71 @@ ACTIVATION_LINK_LIFETIME = env.int(
     'ACTIVATION_LINK_LIFETIME',
     default=(60 * 60 * 24)  # 24 h.
 )
+
+TEST_SESSION_LIFETIME = env.int(
+    'TEST_SESSION_LIFETIME',
+    default=(60 * 60 * 3)  # 3 h.
+)
+
+
+TEST_RESULTS_BUFFER = env.bool('TEST_RESULTS_BUFFER', default=False)
+TEST_RESULTS_BUFFER_URL = env.str(
+    'TEST_RESULTS_BUFFER_URL',
+    default=CELERY_BROKER_URL
+)
+TEST_RESULTS_FLUSH_INTERVAL = env.int(
+    'TEST_RESULTS_FLUSH_INTERVAL',
+    default=10  # 10 s.
+)
+TEST_RESULTS_FLUSH_SIZE = env.int('TEST_RESULTS_FLUSH_SIZE', default=10000)
+TEST_RESULTS_BATCH_RETENTION = env.int(
+    'TEST_RESULTS_BATCH_RETENTION',
+    default=7  # days
+)
+TEST_RESULTS_SPOOL_DIR = Path(
+    env.str('TEST_RESULTS_SPOOL_DIR', default=str(BASE_DIR / 'spool'))
+)
+TEST_RESULTS_PARTITIONS_AHEAD = env.int(
+    'TEST_RESULTS_PARTITIONS_AHEAD',
+    default=3  # months
+)
+TEST_RESULTS_RETENTION = env.int(
+    'TEST_RESULTS_RETENTION',
+    default=0  # months, 0 - partitions are never detached
+)
+TEST_RESULTS_DROP_EXPIRED = env.bool('TEST_RESULTS_DROP_EXPIRED', default=False)
+
+
+LEADERBOARDS = env.bool('LEADERBOARDS', default=False)
+LEADERBOARDS_URL = env.str('LEADERBOARDS_URL', default=CELERY_BROKER_URL)
+
+
+REQUEST_TIMINGS = env.bool('REQUEST_TIMINGS', default=False)
+REQUEST_TIMINGS_URL = env.str(
+    'REQUEST_TIMINGS_URL',
+    default=CELERY_BROKER_URL
+)
+SLOW_QUERY_THRESHOLD = env.float(
+    'SLOW_QUERY_THRESHOLD',
+    default=0.5  # 0.5 s.
+)
+
+
+METRICS = env.bool('METRICS', default=False)
+# the directory of the metrics of all the services, PROMETHEUS_MULTIPROC_DIR
+# of each service is its subdirectory
+METRICS_DIR = env.str('METRICS_DIR', default='')
+
+
+QUESTION_STATS_INTERVAL = env.int(
+    'QUESTION_STATS_INTERVAL',
+    default=60 * 5  # 5 min.
+)
+QUESTION_STATS_CHUNK_SIZE = env.int('QUESTION_STATS_CHUNK_SIZE', default=10000)
+DAILY_STATS_DAYS = env.int('DAILY_STATS_DAYS', default=2)
+
+
+ADMIN_COUNT_ESTIMATE_THRESHOLD = env.int(
+    'ADMIN_COUNT_ESTIMATE_THRESHOLD',
+    default=100000
+)
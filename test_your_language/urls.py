@@ -2,6 +2,8 @@ import debug_toolbar
 from django.contrib import admin
 from django.urls import include, path
 
+from language_tests.views import metrics
+
 
 urlpatterns = [
     path('__debug__/', include(debug_toolbar.urls)),
@@ -9,4 +11,5 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),
     path('', include('home.urls')),
     path('tests/', include('language_tests.urls')),
+    path('metrics', metrics, name='metrics'),
 ]
@@ -10,6 +10,14 @@ echo "Postgres is up"
 
 python manage.py makemigrations
 python manage.py migrate
+python manage.py partition_test_attempts
+python manage.py create_indexes
 python manage.py collectstatic --noinput
 
+# the metrics of the previous processes are not summed with the new ones
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 exec "$@"
\ No newline at end of file